@@ -7,7 +7,9 @@ from io import BytesIO
 import simplejson as json
 import streamlit as st
 
-from battinfoconverter_backend import __version__, json_convert
+from battinfoconverter_backend import __version__, batch, json_convert, output_formats, validation
+from battinfoconverter_backend.cache import workbook_digest
+from battinfoconverter_backend.excel_tools import ReadLimits, WorkbookLimitError
 
 st.set_page_config(
 page_title="BattINFO Converter",
@@ -47,31 +49,149 @@ If you find BattINFO converter useful, please cite our publication:
 
 image_url = 'https://raw.githubusercontent.com/EmpaEconversion/BattInfoConverter/refs/heads/main/battinfoconverter.png'
 
+# Size of the worker pool converting a multi-file upload, kept small so a batch does not hog a shared server
+BATCH_WORKERS = 4
+
+# Uploads are untrusted: a workbook too large or too slow to read is rejected early instead of tying up the server
+# (the native reader streams the sheets, so they are checked before anything is loaded into memory)
+UPLOAD_LIMITS = ReadLimits()
+
+# Preview entry grouping the top-level fields that are not branches (context, cell ID, creator, ...)
+HEADER_BRANCH = "Header"
+
+# The results are cached by workbook content, so a rerun (e.g. picking another preview branch) does not convert again.
+@st.cache_data(max_entries=32, show_spinner=False)
+def check_workbook(workbook: bytes) -> tuple[list[str], list[str]]:
+    issues = validation.validate_workbook(workbook, limits=UPLOAD_LIMITS)
+    return ([str(issue) for issue in issues if issue.severity == "error"],
+            [str(issue) for issue in issues if issue.severity == "warning"])
+
+@st.cache_data(max_entries=32, show_spinner="Converting...")
+def convert_workbook(workbook: bytes) -> dict:
+    # Parse the sheets concurrently from one in-memory copy to cut single-file latency
+    return json_convert.convert_excel_to_jsonld(workbook, debug_mode=False, parallel_sheets="thread", use_bundles=True,
+                                                excel_engine="native", limits=UPLOAD_LIMITS)
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def encode_workbook(workbook: bytes, encoding: str) -> bytes:
+    return output_formats.encode_jsonld(convert_workbook(workbook), encoding)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def preview_branches(workbook: bytes) -> list[str]:
+    jsonld_output = convert_workbook(workbook)
+    return [HEADER_BRANCH] + [key for key, value in jsonld_output.items() if isinstance(value, (dict, list)) and key.startswith("has")]
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def branch_json(workbook: bytes, branch: str) -> str:
+    jsonld_output = convert_workbook(workbook)
+    if branch == HEADER_BRANCH:
+        branches = set(preview_branches(workbook))
+        part = {key: value for key, value in jsonld_output.items() if key not in branches}
+    else:
+        part = {branch: jsonld_output[branch]}
+    return json.dumps(part, indent=4, use_decimal=True)
+
+def show_workbook(uploaded_file):
+    # Extract the base name of the file (without the extension)
+    base_name = os.path.splitext(uploaded_file.name)[0]
+
+    workbook = uploaded_file.getvalue()
+
+    # Report every problem of the workbook at once instead of failing on the first one
+    try:
+        errors, warnings = check_workbook(workbook)
+    except WorkbookLimitError as exc:
+        st.error(f"The workbook cannot be read: {exc}")
+        st.stop()
+    if errors:
+        st.error("The workbook cannot be converted:\n\n" + "\n".join(f"- {error}" for error in errors))
+        st.stop()
+    if warnings:
+        with st.expander(f"{len(warnings)} warning(s)"):
+            st.markdown("\n".join(f"- {warning}" for warning in warnings))
+
+    # Download button, pretty-printed JSON unless a compact encoding is chosen
+    encoding = st.selectbox("Download format", output_formats.OUTPUT_ENCODINGS)
+    try:
+        to_download = BytesIO(encode_workbook(workbook, encoding))
+    except ImportError as exc:
+        st.error(str(exc))
+    else:
+        output_file_name = f"BattINFO_converter_{base_name}{output_formats.ENCODING_EXTENSIONS[encoding]}"
+        st.download_button(label="Download JSON-LD",
+                        data=to_download,
+                        file_name=output_file_name,
+                        mime=output_formats.ENCODING_MIME_TYPES[encoding])
+
+    # Preview one top-level branch at a time; sending the whole document to the browser on every rerun is slow
+    st.markdown("__JSON-LD Output__")
+    preview_column, view_column = st.columns([3, 1])
+    branch = preview_column.selectbox("Branch", preview_branches(workbook))
+    view = view_column.radio("View", ("Tree", "Text"), horizontal=True)
+    if view == "Tree":
+        st.json(branch_json(workbook, branch), expanded=2)
+    else:
+        st.code(branch_json(workbook, branch), language="json")
+
+def show_batch(uploaded_files):
+    workbooks = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    batch_key = tuple((name, workbook_digest(content)) for name, content in workbooks)
+
+    # The results stay in the session, so a rerun (e.g. another download format) does not convert again
+    results = st.session_state.get("batch_results")
+    if results is None or results[0] != batch_key:
+        progress = st.progress(0.0, text=f"Converting {len(workbooks)} files...")
+        status_table = st.empty()
+        statuses = {name: "waiting" for name, _ in workbooks}
+        done = []
+        for result in batch.convert_workbooks(workbooks, workers=BATCH_WORKERS, use_bundles=True,
+                                              excel_engine="native", limits=UPLOAD_LIMITS):
+            done.append(result)
+            statuses[result.name] = "converted" if result.error is None else f"failed: {result.error}"
+            progress.progress(len(done) / len(workbooks), text=f"Converted {len(done)} of {len(workbooks)} files")
+            status_table.table([{"File": name, "Status": status} for name, status in statuses.items()])
+        progress.empty()
+        status_table.empty()
+        st.session_state["batch_results"] = results = (batch_key, done, {})
+    _, done, archives = results
+
+    order = {name: position for position, (name, _) in enumerate(workbooks)}
+    done = sorted(done, key=lambda result: order[result.name])
+    failed = [result for result in done if result.error is not None]
+    st.table([{"File": result.name, "Status": "converted" if result.error is None else f"failed: {result.error}"}
+              for result in done])
+    if failed:
+        st.error(f"{len(failed)} of {len(done)} files could not be converted; they are not in the ZIP.")
+    if len(failed) == len(done):
+        return
+
+    encoding = st.selectbox("Download format", output_formats.OUTPUT_ENCODINGS)
+    if encoding not in archives:
+        archive = BytesIO()
+        try:
+            batch.write_zip(done, archive, encoding)
+        except ImportError as exc:
+            st.error(str(exc))
+            return
+        archives[encoding] = archive.getvalue()
+    st.download_button(label=f"Download {len(done) - len(failed)} JSON-LD files (ZIP)",
+                       data=archives[encoding],
+                       file_name="BattINFO_converter_JSON-LD.zip",
+                       mime="application/zip",
+                       on_click="ignore")
+
 def main():
     st.image(image_url)
     
     st.markdown(f"__App Version: {__version__}__")
     
-    uploaded_file = st.file_uploader("__Upload your metadata Excel file here__", type=['xlsx', 'xlsm'])
+    uploaded_files = st.file_uploader("__Upload your metadata Excel files here__", type=['xlsx', 'xlsm'],
+                                      accept_multiple_files=True)
     
-    if uploaded_file is not None:
-        # Extract the base name of the file (without the extension)
-        base_name = os.path.splitext(uploaded_file.name)[0]
-        
-        # Convert the uploaded Excel file to JSON-LD
-        jsonld_output = json_convert.convert_excel_to_jsonld(uploaded_file)
-        jsonld_str = json.dumps(jsonld_output, indent=4, use_decimal=True)
-
-        # Download button
-        to_download = BytesIO(jsonld_str.encode())
-        output_file_name = f"BattINFO_converter_{base_name}.json"  
-        st.download_button(label="Download JSON-LD",
-                        data=to_download,
-                        file_name=output_file_name,
-                        mime="application/json")
-        
-        # Convert JSON-LD output to a string to display in text area (for preview)
-        st.text_area("JSON-LD Output", jsonld_str, height=1000)
+    if len(uploaded_files) == 1:
+        show_workbook(uploaded_files[0])
+    elif uploaded_files:
+        show_batch(uploaded_files)
     
     st.markdown(markdown_content, unsafe_allow_html=True)
     st.image('https://raw.githubusercontent.com/EmpaEconversion/BattInfoConverter/refs/heads/main/sponsor.png', width=700)
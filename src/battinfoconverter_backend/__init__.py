@@ -2,13 +2,48 @@
 
 from importlib.metadata import version
 
-from . import auxiliary, excel_tools, json_convert, json_template
+from . import (
+    auxiliary,
+    batch,
+    bundles,
+    cache,
+    context_export,
+    converter,
+    dataset,
+    excel_tools,
+    json_convert,
+    json_template,
+    output_formats,
+    rdf_export,
+    rewrite,
+    skeletons,
+    table_convert,
+    template_compiler,
+    templates,
+    validation,
+    watch,
+)
 
 __all__ = [
     "auxiliary",
+    "batch",
+    "bundles",
+    "cache",
+    "context_export",
+    "converter",
+    "dataset",
     "excel_tools",
     "json_convert",
     "json_template",
+    "output_formats",
+    "rdf_export",
+    "rewrite",
+    "skeletons",
+    "table_convert",
+    "template_compiler",
+    "templates",
+    "validation",
+    "watch",
 ]
 
 __version__ = version("battinfoconverter-backend")
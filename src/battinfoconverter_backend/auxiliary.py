@@ -1,19 +1,376 @@
 import inspect
 import re
 import traceback
+from dataclasses import dataclass
 from decimal import Decimal
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Any, Optional
 import pandas as pd
 
 DEBUG_STATUS = False
 
+
+class JsonLdNode:
+    """
+    Compact, mutable JSON-LD node used while a document is being built.
+
+    ``add_to_structure`` works on these nodes instead of plain dictionaries, so the node state
+    (typed, empty, reversed) is read from slots rather than re-derived from dictionary keys for
+    every row. ``to_dict`` materialises the finished tree into plain JSON-LD in one final pass.
+
+    Attributes:
+        types (list[str]): The ``@type`` values of the node, in insertion order.
+        props (dict[str, Any]): Property values keyed by predicate. Values are nested nodes, lists
+            of values or literals. The ``@type`` and ``@reverse`` keys only hold a ``None``
+            placeholder so the original key order is reproduced on materialisation.
+        reverse (JsonLdNode | None): The ``@reverse`` block of the node, if any.
+        type_list (bool): Whether ``@type`` is written as a list even if it holds a single value.
+    """
+
+    __slots__ = ("types", "props", "reverse", "type_list")
+
+    def __init__(self, *types: str) -> None:
+        self.types: list[str] = []
+        self.props: dict[str, Any] = {}
+        self.reverse: JsonLdNode | None = None
+        self.type_list = False
+        for new_type in types:
+            self.add_type(new_type)
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "JsonLdNode":
+        """Build a node tree from a plain JSON-LD dictionary.
+
+        Args:
+            payload (dict): The JSON-LD dictionary to convert. Nested dictionaries become nodes.
+
+        Returns:
+            JsonLdNode: The root node of the converted tree.
+        """
+
+        node = cls()
+        for key, value in payload.items():
+            if key == "@type":
+                node.props["@type"] = None
+                if isinstance(value, list):
+                    node.types = list(value)
+                    node.type_list = True
+                else:
+                    node.types = [value]
+            elif key == "@reverse" and isinstance(value, dict):
+                node.props["@reverse"] = None
+                node.reverse = cls.from_dict(value)
+            else:
+                node.props[key] = _to_node_value(value)
+        return node
+
+    @property
+    def is_empty(self) -> bool:
+        """bool: ``True`` if the node would materialise to ``{}``."""
+
+        return not self.props
+
+    @property
+    def is_bare(self) -> bool:
+        """bool: ``True`` if the node is empty or only carries ``@type``."""
+
+        return not self.props or (len(self.props) == 1 and "@type" in self.props)
+
+    def add_type(self, new_type: str) -> None:
+        """Ensure ``new_type`` is part of the node's ``@type``.
+
+        Args:
+            new_type (str): The type value to merge into the node.
+
+        Returns:
+            None: The node is updated in place.
+        """
+
+        self.props.setdefault("@type", None)
+        if new_type not in self.types:
+            self.types.append(new_type)
+
+    def reverse_node(self) -> "JsonLdNode":
+        """Return the ``@reverse`` block of the node, creating it if needed."""
+
+        if self.reverse is None:
+            self.props.setdefault("@reverse", None)
+            self.reverse = JsonLdNode()
+        return self.reverse
+
+    def to_dict(self) -> dict[str, Any]:
+        """Materialise the node and its children into plain JSON-LD dictionaries.
+
+        Returns:
+            dict[str, Any]: The JSON-LD representation of the node.
+        """
+
+        result: dict[str, Any] = {}
+        for key, value in self.props.items():
+            if key == "@type":
+                types = self.types
+                result[key] = list(types) if self.type_list or len(types) != 1 else types[0]
+            elif key == "@reverse" and self.reverse is not None:
+                result[key] = self.reverse.to_dict()
+            else:
+                result[key] = _from_node_value(value)
+        return result
+
+
+def _to_node_value(value: Any) -> Any:
+    """Convert nested dictionaries within ``value`` to ``JsonLdNode`` instances."""
+
+    if isinstance(value, dict):
+        return JsonLdNode.from_dict(value)
+    if isinstance(value, list):
+        return [_to_node_value(item) for item in value]
+    return value
+
+
+def _from_node_value(value: Any) -> Any:
+    """Convert ``JsonLdNode`` instances within ``value`` back to plain dictionaries."""
+
+    if isinstance(value, JsonLdNode):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_from_node_value(item) for item in value]
+    return value
+
+
+def _is_vacant(value: Any) -> bool:
+    """Return ``True`` if ``value`` is missing or an empty node."""
+
+    return value is None or (isinstance(value, JsonLdNode) and not value.props)
+
+
+def _update_in_place(target: Any, source: Any) -> Any:
+    """Make ``target`` equal to ``source``, keeping the dictionaries and lists ``target`` already holds.
+
+    Returns the value to store: ``target`` itself when it was updated in place, else ``source``.
+    """
+
+    if isinstance(target, dict) and isinstance(source, dict):
+        for key in [key for key in target if key not in source]:
+            del target[key]
+        for key, value in source.items():
+            target[key] = _update_in_place(target[key], value) if key in target else value
+        return target
+    if isinstance(target, list) and isinstance(source, list):
+        target[:] = [
+            _update_in_place(target[index], value) if index < len(target) else value
+            for index, value in enumerate(source)
+        ]
+        return target
+    return source
+
+
+@contextmanager
+def structure_builder(jsonld: dict, data_container: "json_convert.ExcelContainer") -> Iterator["JsonLdNode"]:
+    """Build a plain JSON-LD dictionary row by row with ``add_to_structure``.
+
+    The dictionary is converted into a node tree once on entry and written back once on exit, in place, so
+    dictionaries nested in it that the caller holds stay part of it. Inside the block, add the rows (and any
+    other changes, e.g. comments in ``root.props["rdfs:comment"]``) to the yielded node, not to the dictionary.
+
+    Args:
+        jsonld (dict): The JSON-LD dictionary to build on, e.g. from ``json_convert.create_jsonld_header``.
+        data_container (ExcelContainer): The container holding the connector registries; they are reset, as
+            the rows start a new document.
+
+    Yields:
+        JsonLdNode: The root node to pass to ``add_to_structure``.
+    """
+
+    data_container._last_nodes = {}
+    data_container._path_counts = {}
+    data_container._connector_registry = {}
+    root = JsonLdNode.from_dict(jsonld)
+    yield root
+    _update_in_place(jsonld, root.to_dict())
+
+
+MULTI_CONNECTOR_SUFFIX = re.compile(r"^(?P<base>.+?)(?P<suffix>[A-Z])$")
+
+
+def _is_simple_connector(segment: str) -> bool:
+    """Return True if ``segment`` looks like a standalone connector token."""
+
+    return ":" not in segment and "_" not in segment
+
+
+def _split_multi_connector(
+    part: str, multi_connector_candidates: set[str]
+) -> tuple[str, int | None]:
+    """Split multi-connector suffixes (e.g. ``hasSolventA`` -> ``hasSolvent``, 0).
+
+    Args:
+        part (str): The raw path segment.
+        multi_connector_candidates (set[str]): Connectors that may repeat within a parent.
+
+    Returns:
+        tuple[str, int | None]: The base connector and optional zero-based index.
+    """
+
+    match = MULTI_CONNECTOR_SUFFIX.match(part)
+    if match and _is_simple_connector(part):
+        base = match.group("base")
+        if base in multi_connector_candidates and part not in multi_connector_candidates:
+            return base, ord(match.group("suffix")) - ord("A")
+    return part, None
+
+
+def _is_empty_value(value: Any) -> bool:
+    """Return True for values that are skipped as empty (0 and 0.0 are valid)."""
+
+    return (
+        value is None
+        or (isinstance(value, str) and value.strip() == "")
+        or (isinstance(value, (int, float, Decimal)) and pd.isna(value))
+    )
+
+
+def _lookup_unique_id(unique_ids: dict[Any, Any], value: Any) -> Any:
+    """Return the unique ID of ``value`` like ``get_information_value`` (trailing spaces ignored), or None."""
+    if isinstance(value, str):
+        value = value.rstrip(" ")
+    return unique_ids.get(value)
+
+
+@dataclass
+class StructureContext:
+    """
+    Lookup tables derived once per conversion from the sheets of an ``ExcelContainer``.
+
+    Attributes:
+        unit_map (dict[str, dict]): Rows of the unit sheet keyed by their ``Item``.
+        connector_types (dict[str, Any]): Default ``@type`` (``Key``) of each connector, ``NaN`` if none.
+        connectors (set[str]): Connectors listed in the connector sheet.
+        multi_connector_candidates (set[str]): Connectors that may repeat within the same parent.
+        collapsible_multi_paths (set[tuple[str, ...]]): Suffixed connector paths without children.
+        unique_ids (dict[Any, Any]): ``ID`` of the first row of each ``Item`` in the unique ID sheet.
+    """
+
+    unit_map: dict[str, dict]
+    connector_types: dict[str, Any]
+    connectors: set[str]
+    multi_connector_candidates: set[str]
+    collapsible_multi_paths: set[tuple[str, ...]]
+    unique_ids: dict[Any, Any]
+
+
+def _get_structure_context(data_container: "json_convert.ExcelContainer") -> StructureContext:
+    """Return the ``StructureContext`` of ``data_container``, building it on first use.
+
+    Args:
+        data_container (ExcelContainer): The container holding the schema and lookup sheets.
+
+    Returns:
+        StructureContext: The cached lookup tables for the current conversion.
+    """
+
+    context = getattr(data_container, "_structure_context", None)
+    if context is not None:
+        return context
+
+    unit_map = data_container.data["unit_map"].set_index("Item").to_dict("index")
+    context_connector = data_container.data["context_connector"]
+    connectors = set(context_connector["Item"])
+    connector_types: dict[str, Any] = {}
+    for item, key in zip(context_connector["Item"], context_connector["Key"]):
+        connector_types.setdefault(item, key)
+    context_toplevel = data_container.data.get("context_toplevel")
+    top_level_connectors = (
+        set(context_toplevel["Item"]) if context_toplevel is not None else set()
+    )
+    multi_connector_candidates = connectors | top_level_connectors
+    collapsible_multi_paths = getattr(data_container, "_collapsible_multi_paths", None)
+    schema = data_container.data.get("schema")
+    if schema is not None and "Ontology link" in schema:
+        if collapsible_multi_paths is None:
+            collapsible_multi_paths = set()
+            multi_paths_with_children: set[tuple[str, ...]] = set()
+            multi_paths_seen: set[tuple[str, ...]] = set()
+            for link in schema["Ontology link"]:
+                if not isinstance(link, str):
+                    continue
+                if link in ("NotOntologize", "Comment"):
+                    continue
+                connectors_in_link: list[str] = []
+                for raw in link.split("-"):
+                    if raw.startswith("type|"):
+                        continue
+                    if "|" in raw:
+                        command, remainder = raw.split("|", 1)
+                        if command == "rev":
+                            raw = remainder
+                        else:
+                            continue
+                    connectors_in_link.append(raw)
+                normalized_path: list[str] = []
+                for idx, segment in enumerate(connectors_in_link):
+                    segment_base = segment
+                    match = MULTI_CONNECTOR_SUFFIX.match(segment)
+                    if match and _is_simple_connector(segment):
+                        base = match.group("base")
+                        if base.startswith("has"):
+                            segment_base = base
+                            path_key = tuple(normalized_path + [segment_base])
+                            multi_paths_seen.add(path_key)
+                            if idx < len(connectors_in_link) - 1:
+                                multi_paths_with_children.add(path_key)
+                    normalized_path.append(segment_base)
+            for path_key in multi_paths_seen:
+                if path_key not in multi_paths_with_children:
+                    collapsible_multi_paths.add(path_key)
+            data_container._collapsible_multi_paths = collapsible_multi_paths
+        for link in schema["Ontology link"]:
+            if not isinstance(link, str):
+                continue
+            if link in ("NotOntologize", "Comment"):
+                continue
+            for segment in link.split("-"):
+                if segment.startswith("type|"):
+                    continue
+                if "|" in segment:
+                    command, remainder = segment.split("|", 1)
+                    if command == "rev":
+                        segment = remainder
+                    else:
+                        continue
+                match = MULTI_CONNECTOR_SUFFIX.match(segment)
+                if match and _is_simple_connector(segment):
+                    base = match.group("base")
+                    if base.startswith("has"):
+                        multi_connector_candidates.add(base)
+
+    unique_id = data_container.data["unique_id"]
+    unique_ids: dict[Any, Any] = {}
+    for item, uid in zip(unique_id["Item"], unique_id["ID"]):
+        unique_ids.setdefault(item, uid)
+
+    context = StructureContext(
+        unit_map=unit_map,
+        connector_types=connector_types,
+        connectors=connectors,
+        multi_connector_candidates=multi_connector_candidates,
+        collapsible_multi_paths=collapsible_multi_paths or set(),
+        unique_ids=unique_ids,
+    )
+    data_container._structure_context = context
+    return context
+
+
 def add_to_structure(
-    jsonld: dict,
+    jsonld: "JsonLdNode",
     path: list[str],
     value: Any,
     unit: str,
     data_container: "json_convert.ExcelContainer",
     metadata: str | None = None,
+    *,
+    start_index: int = 0,
+    start_node: "JsonLdNode | list | None" = None,
 ) -> None:
     """
     Adds a value to a JSON-LD structure at a specified path, incorporating units and other contextual information.
@@ -23,57 +380,41 @@ def add_to_structure(
         to resolve unit mappings and context connectors.
 
         Args:
-            jsonld (dict): The JSON-LD structure to modify.
+            jsonld (JsonLdNode): The root node of the JSON-LD structure to modify. To build a plain
+                                 dictionary, take the node from ``structure_builder``.
             path (list[str]): A list of strings representing the hierarchical path in the JSON-LD where the value should be added.
             value (any): The value to be inserted at the specified path.
             unit (str): The unit associated with the value. If 'No Unit', the value is treated as unitless.
             data_container (ExcelContainer): An instance of the ExcelContainer dataclass (from son_convert module) containing supporting data
                                             for unit mappings, connectors, and unique identifiers.
             metadata (str | None): Optional metadata label from the schema sheet, used to align repeated connector entries.
+            start_index (int): Index in ``path`` at which the walk starts. The segments before it must be plain connectors
+                               (see ``add_rows_to_structure``). Defaults to 0.
+            start_node (JsonLdNode | list | None): The level already resolved for ``path[:start_index]``. Defaults to the root.
         Returns:
             None: This function modifies the JSON-LD structure in place.
 
         Raises:
             ValueError: If the value is invalid, a required unit is missing, or an error occurs during path processing.
             RuntimeError: If any unexpected error arises while processing the value and path.
+            TypeError: If ``jsonld`` is a plain dictionary rather than a node.
     """
-    from .json_convert import get_information_value
-
+    if not isinstance(jsonld, JsonLdNode):
+        raise TypeError(
+            "add_to_structure builds on a JsonLdNode; for a plain dictionary, add the rows to the node of "
+            "`with structure_builder(jsonld, data_container) as root:`"
+        )
     # ------------------------------------------------------------------ #
     # helper functions                                                   #
     # ------------------------------------------------------------------ #
-    MULTI_CONNECTOR_SUFFIX = re.compile(r"^(?P<base>.+?)(?P<suffix>[A-Z])$")
-
-    def _is_simple_connector(segment: str) -> bool:
-        """Return True if ``segment`` looks like a standalone connector token."""
-
-        return ":" not in segment and "_" not in segment
-
-    def _split_multi_connector(part: str) -> tuple[str, int | None]:
-        """Split multi-connector suffixes (e.g. ``hasSolventA`` -> ``hasSolvent``, 0).
-
-        Args:
-            part (str): The raw path segment.
-
-        Returns:
-            tuple[str, int | None]: The base connector and optional zero-based index.
-        """
-
-        match = MULTI_CONNECTOR_SUFFIX.match(part)
-        if match and _is_simple_connector(part):
-            base = match.group("base")
-            if base in multi_connector_candidates and part not in multi_connector_candidates:
-                return base, ord(match.group("suffix")) - ord("A")
-        return part, None
-
     def _ensure_indexed_connector_node(
-        parent: dict[str, Any],
+        parent: JsonLdNode,
         connector: str,
         parent_path: tuple[str, ...],
         index: int,
         metadata_label: str | None,
         value: Any,
-    ) -> dict[str, Any]:
+    ) -> JsonLdNode:
         """Return the connector node at ``index``, creating placeholders as needed."""
 
         entries_for_parent = _get_registry_entries(parent_path, parent)
@@ -82,10 +423,10 @@ def add_to_structure(
         ]
         while len(registry_entries) <= index:
             is_target = len(registry_entries) == index
-            holder = parent.get(connector)
+            holder = parent.props.get(connector)
             if (
-                isinstance(holder, dict)
-                and (not holder or list(holder.keys()) == ["@type"])
+                isinstance(holder, JsonLdNode)
+                and holder.is_bare
                 and not any(entry.get("node") is holder for entry in entries_for_parent)
                 and len(registry_entries) == 0
             ):
@@ -110,48 +451,27 @@ def add_to_structure(
 
     # NOTE: Multi connectors are inferred from suffixes or typed child segments.
 
-    def _merge_type(node: dict[str, Any], new_type: str) -> None:
-        """Ensure the ``@type`` entry on ``node`` includes ``new_type``.
-
-        Args:
-            node (dict[str, Any]): The JSON-LD node whose ``@type`` should be updated.
-            new_type (str): The type value to merge into the node.
-
-        Returns:
-            None: This helper mutates ``node`` in place.
-        """
-
-        if "@type" not in node:
-            node["@type"] = new_type
-        else:
-            existing_type = node["@type"]
-            if isinstance(existing_type, list):
-                if new_type not in existing_type:
-                    existing_type.append(new_type)
-            elif existing_type != new_type:
-                node["@type"] = [existing_type, new_type]
-
     def _add_or_extend_list(
-        node: dict[str, Any], key: str, entry: dict[str, Any]
+        node: JsonLdNode, key: str, entry: JsonLdNode
     ) -> None:
-        """Add ``entry`` to ``node[key]`` while normalizing the holder to a list.
+        """Add ``entry`` to ``node.props[key]`` while normalizing the holder to a list.
 
         Args:
-            node (dict[str, Any]): The parent node whose key should hold the entry.
+            node (JsonLdNode): The parent node whose key should hold the entry.
             key (str): The key on ``node`` where the entry should be inserted.
-            entry (dict[str, Any]): The dictionary representing the new list item.
+            entry (JsonLdNode): The node representing the new list item.
 
         Returns:
             None: This helper mutates ``node`` in place.
         """
 
-        current_value = node.get(key)
-        if current_value in (None, {}):
-            node[key] = entry
+        current_value = node.props.get(key)
+        if _is_vacant(current_value):
+            node.props[key] = entry
         elif isinstance(current_value, list):
             current_value.append(entry)
         else:
-            node[key] = [current_value, entry]
+            node.props[key] = [current_value, entry]
 
     def _extract_type(segment: str) -> str:
         """Return the type payload when ``segment`` contains the ``type|`` prefix.
@@ -165,34 +485,33 @@ def add_to_structure(
 
         return segment.split("|", 1)[1] if segment.startswith("type|") else segment
 
-    def _new_item(parent: dict[str, Any], key: str) -> dict[str, Any]:
-        """Create and return a new dictionary entry under ``parent[key]``.
+    def _new_item(parent: JsonLdNode, key: str) -> JsonLdNode:
+        """Create and return a new node under ``parent.props[key]``.
 
         Args:
-            parent (dict[str, Any]): The JSON-LD node that holds the collection.
-            key (str): The key that should receive a new dictionary entry.
+            parent (JsonLdNode): The JSON-LD node that holds the collection.
+            key (str): The key that should receive a new node.
 
         Returns:
-            dict[str, Any]: The freshly created dictionary stored at ``parent[key]``.
+            JsonLdNode: The freshly created node stored at ``parent.props[key]``.
         """
 
-        value = parent.get(key)
-        if value in (None, {}):
-            parent[key] = {}
-            return parent[key]
-        if isinstance(value, list):
-            fresh = {}
+        value = parent.props.get(key)
+        fresh = JsonLdNode()
+        if _is_vacant(value):
+            parent.props[key] = fresh
+        elif isinstance(value, list):
             value.append(fresh)
-            return fresh
-        parent[key] = [value, {}]
-        return parent[key][-1]
+        else:
+            parent.props[key] = [value, fresh]
+        return fresh
 
-    def _register_last(path_key: tuple[str, ...], node: dict[str, Any]) -> None:
+    def _register_last(path_key: tuple[str, ...], node: JsonLdNode) -> None:
         """Remember the most recent ``node`` encountered for ``path_key``.
 
         Args:
             path_key (tuple[str, ...]): The connector path associated with ``node``.
-            node (dict[str, Any]): The node that was most recently created or visited.
+            node (JsonLdNode): The node that was most recently created or visited.
 
         Returns:
             None: The registry is stored on ``data_container`` for later lookups.
@@ -206,14 +525,14 @@ def add_to_structure(
             setattr(data_container, "_last_nodes", history)
         history[path_key] = node
 
-    def _get_last(path_key: tuple[str, ...]) -> dict[str, Any] | None:
+    def _get_last(path_key: tuple[str, ...]) -> JsonLdNode | None:
         """Fetch the previously registered node for ``path_key`` if available.
 
         Args:
             path_key (tuple[str, ...]): The connector path used to track nodes.
 
         Returns:
-            dict[str, Any] | None: The remembered node if present; otherwise ``None``.
+            JsonLdNode | None: The remembered node if present; otherwise ``None``.
         """
 
         history = getattr(data_container, "_last_nodes", None)
@@ -277,17 +596,17 @@ def add_to_structure(
     def _register_connector_entry(
         parent_path: tuple[str, ...],
         connector: str,
-        node: dict[str, Any],
+        node: JsonLdNode,
         metadata_label: str | None,
         value: Any,
-        parent_node: dict[str, Any] | None = None,
+        parent_node: JsonLdNode | None = None,
     ) -> None:
         """Store a new connector entry with tokenized metadata and values.
 
         Args:
             parent_path (tuple[str, ...]): The parent connector path for the entry.
             connector (str): The connector key associated with the entry.
-            node (dict[str, Any]): The node corresponding to the connector occurrence.
+            node (JsonLdNode): The node corresponding to the connector occurrence.
             metadata_label (str | None): Optional metadata label to seed matching tokens.
             value (Any): The raw value that may provide additional matching tokens.
 
@@ -314,13 +633,13 @@ def add_to_structure(
         )
 
     def _update_entry_tokens(
-        parent_path: tuple[str, ...], node: dict[str, Any], *labels: str | None
+        parent_path: tuple[str, ...], node: JsonLdNode, *labels: str | None
     ) -> None:
         """Augment alias tokens for entries tied to ``parent_path`` and ``node``.
 
         Args:
             parent_path (tuple[str, ...]): The connector path used to look up entries.
-            node (dict[str, Any]): The specific connector node whose entry should be updated.
+            node (JsonLdNode): The specific connector node whose entry should be updated.
             *labels (str | None): Optional labels whose tokens help future lookups.
 
         Returns:
@@ -342,7 +661,7 @@ def add_to_structure(
                 break
 
     def _get_registry_entries(
-        parent_path: tuple[str, ...], parent_node: dict[str, Any] | None = None
+        parent_path: tuple[str, ...], parent_node: JsonLdNode | None = None
     ) -> list[dict[str, Any]]:
         """Return registry entries registered for ``parent_path``.
 
@@ -434,8 +753,7 @@ def add_to_structure(
             return entries[index]
 
         for entry in entries:
-            existing = entry["node"].get(part)
-            if existing in (None, {}):
+            if _is_vacant(entry["node"].props.get(part)):
                 return entry
 
         last_key_base = tuple(traversed[:-1])
@@ -450,115 +768,43 @@ def add_to_structure(
     # ------------------------------------------------------------------ #
     # main body                                                          #
     # ------------------------------------------------------------------ #
+    root = jsonld
     try:
-        current_level = jsonld
-        unit_map = (
-            data_container.data["unit_map"].set_index("Item").to_dict("index")
-        )
-        context_connector = data_container.data["context_connector"]
-        connectors = set(context_connector["Item"])
-        context_toplevel = data_container.data.get("context_toplevel")
-        top_level_connectors = (
-            set(context_toplevel["Item"]) if context_toplevel is not None else set()
-        )
-        multi_connector_candidates = connectors | top_level_connectors
-        collapsible_multi_paths = getattr(
-            data_container, "_collapsible_multi_paths", None
-        )
-        schema = data_container.data.get("schema")
-        if schema is not None and "Ontology link" in schema:
-            if collapsible_multi_paths is None:
-                collapsible_multi_paths = set()
-                multi_paths_with_children: set[tuple[str, ...]] = set()
-                multi_paths_seen: set[tuple[str, ...]] = set()
-                for link in schema["Ontology link"]:
-                    if not isinstance(link, str):
-                        continue
-                    if link in ("NotOntologize", "Comment"):
-                        continue
-                    connectors_in_link: list[str] = []
-                    for raw in link.split("-"):
-                        if raw.startswith("type|"):
-                            continue
-                        if "|" in raw:
-                            command, remainder = raw.split("|", 1)
-                            if command == "rev":
-                                raw = remainder
-                            else:
-                                continue
-                        connectors_in_link.append(raw)
-                    normalized_path: list[str] = []
-                    for idx, segment in enumerate(connectors_in_link):
-                        segment_base = segment
-                        match = MULTI_CONNECTOR_SUFFIX.match(segment)
-                        if match and _is_simple_connector(segment):
-                            base = match.group("base")
-                            if base.startswith("has"):
-                                segment_base = base
-                                path_key = tuple(normalized_path + [segment_base])
-                                multi_paths_seen.add(path_key)
-                                if idx < len(connectors_in_link) - 1:
-                                    multi_paths_with_children.add(path_key)
-                        normalized_path.append(segment_base)
-                for path_key in multi_paths_seen:
-                    if path_key not in multi_paths_with_children:
-                        collapsible_multi_paths.add(path_key)
-                data_container._collapsible_multi_paths = collapsible_multi_paths
-            for link in schema["Ontology link"]:
-                if not isinstance(link, str):
-                    continue
-                if link in ("NotOntologize", "Comment"):
-                    continue
-                for segment in link.split("-"):
-                    if segment.startswith("type|"):
-                        continue
-                    if "|" in segment:
-                        command, remainder = segment.split("|", 1)
-                        if command == "rev":
-                            segment = remainder
-                        else:
-                            continue
-                    match = MULTI_CONNECTOR_SUFFIX.match(segment)
-                    if match and _is_simple_connector(segment):
-                        base = match.group("base")
-                        if base.startswith("has"):
-                            multi_connector_candidates.add(base)
-        unique_id = data_container.data["unique_id"]
+        current_level = root if start_node is None else start_node
+        context = _get_structure_context(data_container)
+        unit_map = context.unit_map
+        connector_types = context.connector_types
+        connectors = context.connectors
+        multi_connector_candidates = context.multi_connector_candidates
+        collapsible_multi_paths = context.collapsible_multi_paths
+        unique_ids = context.unique_ids
 
         # ---- skip only true empties (0 and 0.0 are valid) ------------- #
-        if (
-            value is None
-            or (isinstance(value, str) and value.strip() == "")
-            or (isinstance(value, float) and pd.isna(value))
-            or (
-                isinstance(value, (int, float, Decimal))
-                and pd.isna(pd.Series([value])[0])
-            )
-        ):
+        if _is_empty_value(value):
             return
         # ---------------------------------------------------------------- #
 
-        traversed: list[str] = []
+        traversed: list[str] = list(path[:start_index])
 
-        for index, parts in enumerate(path):
+        for index, parts in enumerate(path[start_index:], start=start_index):
             # ---------- special-command parsing ------------------------- #
             if "|" not in parts:
                 part = parts
             elif "type|" in parts:
                 _, typ = parts.split("|", 1)
                 if typ:
-                    _merge_type(current_level, typ)
+                    current_level.add_type(typ)
                     parent_path = tuple(traversed[:-1]) if traversed else ()
                     _update_entry_tokens(parent_path, current_level, typ)
                 continue
             else:  # rev|
                 command, part = parts.split("|", 1)
                 if command == "rev":
-                    current_level = current_level.setdefault("@reverse", {})
+                    current_level = current_level.reverse_node()
                 else:
                     raise ValueError(f"Unknown command {command} in {parts}")
 
-            part, connector_index = _split_multi_connector(part)
+            part, connector_index = _split_multi_connector(part, multi_connector_candidates)
 
             if isinstance(current_level, list):
                 current_level = current_level[-1]
@@ -576,34 +822,32 @@ def add_to_structure(
             # Suffix indices apply at every multi-connector level.
 
             # -------- create node if missing ---------------------------- #
-            if part not in current_level and (value or unit):
+            if part not in current_level.props and (value or unit):
                 if part in connectors:
-                    connector_type = context_connector.loc[
-                        context_connector["Item"] == part, "Key"
-                    ].values[0]
-                    current_level[part] = (
-                        {}
+                    connector_type = connector_types[part]
+                    current_level.props[part] = (
+                        JsonLdNode()
                         if pd.isna(connector_type)
-                        else {"@type": connector_type}
+                        else JsonLdNode(connector_type)
                     )
                 else:
-                    current_level[part] = {}
+                    current_level.props[part] = JsonLdNode()
 
-            next_level = current_level[part]
+            next_level = current_level.props[part]
 
             # -------- measured-property block --------------------------- #
             if penultimate and unit != "No Unit":
                 if pd.isna(unit):
                     raise ValueError(f"Value '{value}' missing unit.")
                 unit_info = unit_map.get(unit, {})
-                mp_entry = {
+                mp_entry = JsonLdNode.from_dict({
                     "@type": _extract_type(path[-1]),
                     "hasNumericalPart": {
                         "@type": "emmo:RealData",
                         "hasNumberValue": value,
                     },
                     "hasMeasurementUnit": unit_info.get("Key", "UnknownUnit"),
-                }
+                })
                 parent = current_level[-1] if isinstance(current_level, list) else current_level
                 _add_or_extend_list(parent, part, mp_entry)
                 break
@@ -642,35 +886,29 @@ def add_to_structure(
                 selected = None
                 if desired_type:
                     for entry in registry_entries:
-                        existing_type = entry["node"].get("@type")
-                        if isinstance(existing_type, list):
-                            if desired_type in existing_type:
-                                selected = entry
-                                break
-                        elif existing_type == desired_type:
+                        if desired_type in entry["node"].types:
                             selected = entry
                             break
                 if selected is None:
                     selected = _select_entry(
                         metadata, registry_entries, part, traversed
                     )
-                if selected is not None and desired_type:
-                    existing_type = selected["node"].get("@type")
-                    if isinstance(existing_type, list):
-                        if desired_type not in existing_type:
-                            selected = None
-                    elif existing_type != desired_type:
-                        selected = None
+                if (
+                    selected is not None
+                    and desired_type
+                    and desired_type not in selected["node"].types
+                ):
+                    selected = None
                 if selected is not None:
                     target_node = selected["node"]
                 else:
                     entries_for_parent = _get_registry_entries(
                         connector_parent_path, current_level
                     )
-                    holder = current_level.get(part)
+                    holder = current_level.props.get(part)
                     if (
-                        isinstance(holder, dict)
-                        and (not holder or list(holder.keys()) == ["@type"])
+                        isinstance(holder, JsonLdNode)
+                        and holder.is_bare
                         and not any(entry.get("node") is holder for entry in entries_for_parent)
                     ):
                         target_node = holder
@@ -696,21 +934,16 @@ def add_to_structure(
             # -------- final-value branch -------------------------------- #
             if last and unit == "No Unit":
                 if part == "schema:manufacturer":
-                    manufacturer_payload = {"@type": "schema:Organization"}
+                    manufacturer_payload = JsonLdNode("schema:Organization")
                     if isinstance(value, str) and value:
-                        manufacturer_payload["schema:name"] = value
-                        if value in unique_id["Item"].values:
-                            uid = get_information_value(
-                                df=unique_id,
-                                row_to_look=value,
-                                col_to_look="ID",
-                                col_to_match="Item",
-                            )
+                        manufacturer_payload.props["schema:name"] = value
+                        if value in unique_ids:
+                            uid = _lookup_unique_id(unique_ids, value)
                             if not pd.isna(uid):
-                                manufacturer_payload["@id"] = uid
+                                manufacturer_payload.props["@id"] = uid
 
                     registry_entries = []
-                    if not is_multi_connector and isinstance(current_level, dict):
+                    if not is_multi_connector and isinstance(current_level, JsonLdNode):
                         connector_parent_path: tuple[str, ...] = parent_path[:-1]
                         connector_key: str | None = (
                             parent_path[-1] if parent_path else None
@@ -720,7 +953,7 @@ def add_to_structure(
                                 if entry.get("connector") != connector_key:
                                     continue
                                 node = entry.get("node")
-                                if isinstance(node, dict):
+                                if isinstance(node, JsonLdNode):
                                     registry_entries.append(entry)
 
                     if registry_entries:
@@ -729,12 +962,11 @@ def add_to_structure(
                         )
                         if selected is not None:
                             target = selected["node"]
-                            target[part] = manufacturer_payload
-                            if part in current_level and current_level[part] in (
-                                None,
-                                {},
+                            target.props[part] = manufacturer_payload
+                            if part in current_level.props and _is_vacant(
+                                current_level.props[part]
                             ):
-                                current_level.pop(part)
+                                current_level.props.pop(part)
                             _update_entry_tokens(
                                 parent_path,
                                 target,
@@ -743,7 +975,7 @@ def add_to_structure(
                             )
                             break
 
-                    current_level[part] = manufacturer_payload
+                    current_level.props[part] = manufacturer_payload
                     break
 
                 if part == "hasStringValue" and isinstance(value, str):
@@ -751,10 +983,10 @@ def add_to_structure(
                         target_node = current_level[-1]
                     else:
                         target_node = current_level
-                    target_node[part] = value
+                    target_node.props[part] = value
                     break
                 registry_entries = []
-                if not is_multi_connector and isinstance(current_level, dict):
+                if not is_multi_connector and isinstance(current_level, JsonLdNode):
                     connector_parent_path: tuple[str, ...] = parent_path[:-1]
                     connector_key: str | None = (
                         parent_path[-1] if parent_path else None
@@ -764,31 +996,30 @@ def add_to_structure(
                             if entry.get("connector") != connector_key:
                                 continue
                             node = entry.get("node")
-                            if isinstance(node, dict):
+                            if isinstance(node, JsonLdNode):
                                 registry_entries.append(entry)
 
                 if registry_entries:
                     selected = _select_entry(metadata, registry_entries, part, traversed)
                     if selected is not None:
                         target = selected["node"]
-                        holder = target.get(part)
-                        if not isinstance(holder, dict):
-                            target[part] = {} if holder in (None, {}) else {"rdfs:comment": holder}
-                        target_node = target[part]
-                        if value in unique_id["Item"].values:
-                            uid = get_information_value(
-                                df=unique_id,
-                                row_to_look=value,
-                                col_to_look="ID",
-                                col_to_match="Item",
-                            )
+                        holder = target.props.get(part)
+                        if not isinstance(holder, JsonLdNode):
+                            target_node = JsonLdNode()
+                            if holder is not None:
+                                target_node.props["rdfs:comment"] = holder
+                            target.props[part] = target_node
+                        else:
+                            target_node = holder
+                        if value in unique_ids:
+                            uid = _lookup_unique_id(unique_ids, value)
                             if not pd.isna(uid):
-                                target_node["@id"] = uid
-                            _merge_type(target_node, value)
+                                target_node.props["@id"] = uid
+                            target_node.add_type(value)
                         elif value:
-                            target_node["rdfs:comment"] = value
-                        if part in current_level and current_level[part] in (None, {}):
-                            current_level.pop(part)
+                            target_node.props["rdfs:comment"] = value
+                        if part in current_level.props and _is_vacant(current_level.props[part]):
+                            current_level.props.pop(part)
                         _update_entry_tokens(
                             parent_path,
                             target,
@@ -806,22 +1037,19 @@ def add_to_structure(
                     ]
                     if (
                         connector_index is not None
-                        and connector_path in (collapsible_multi_paths or set())
+                        and connector_path in collapsible_multi_paths
                         and connector_index == 0
                         and not registry_entries
                     ):
-                        holder = current_level.get(part)
-                        if isinstance(holder, dict):
+                        holder = current_level.props.get(part)
+                        if isinstance(holder, JsonLdNode):
                             target_node = holder
-                        elif holder in (None, {}):
-                            current_level[part] = {}
-                            target_node = current_level[part]
                         elif isinstance(holder, list) and holder:
                             target_node = holder[0]
-                            current_level[part] = target_node
+                            current_level.props[part] = target_node
                         else:
-                            current_level[part] = {}
-                            target_node = current_level[part]
+                            target_node = JsonLdNode()
+                            current_level.props[part] = target_node
                         _register_connector_entry(
                             parent_path,
                             part,
@@ -852,18 +1080,13 @@ def add_to_structure(
                     _register_last(tuple(traversed), target_node)
                 else:
                     target_node = next_level
-                if value in unique_id["Item"].values:
-                    uid = get_information_value(
-                        df=unique_id,
-                        row_to_look=value,
-                        col_to_look="ID",
-                        col_to_match="Item",
-                    )
+                if value in unique_ids:
+                    uid = _lookup_unique_id(unique_ids, value)
                     if not pd.isna(uid):
-                        target_node["@id"] = uid
-                    _merge_type(target_node, value)
+                        target_node.props["@id"] = uid
+                    target_node.add_type(value)
                 elif value:
-                    target_node["rdfs:comment"] = value
+                    target_node.props["rdfs:comment"] = value
                 if is_multi_connector:
                     _update_entry_tokens(
                         parent_path,
@@ -882,6 +1105,142 @@ def add_to_structure(
         )
 
 
+class _PathTrieNode:
+    """Branch of the prefix trie used by ``add_rows_to_structure``.
+
+    ``items`` keeps child branches and row positions in sheet order. A child branch is only
+    extended while rows sharing its prefix follow each other, so a depth-first pass over the
+    trie applies the rows in their original order.
+    """
+
+    __slots__ = ("segment", "items")
+
+    def __init__(self, segment: str | None = None) -> None:
+        self.segment = segment
+        self.items: list[_PathTrieNode | int] = []
+
+
+def _shareable_prefix_length(
+    path: list[str], value: Any, unit: Any, context: StructureContext
+) -> int:
+    """Return how many leading segments of ``path`` can be resolved once for several rows.
+
+    Only plain connectors qualify: no ``|`` command, no multi-connector and neither of the two
+    last segments, which carry the measured-property and final-value logic.
+
+    Args:
+        path (list[str]): The split ontology path of the row.
+        value (Any): The value of the row.
+        unit (Any): The unit of the row.
+        context (StructureContext): The lookup tables of the conversion.
+
+    Returns:
+        int: The length of the shareable prefix.
+    """
+
+    if _is_empty_value(value) or not (value or unit):
+        return 0
+    candidates = context.multi_connector_candidates
+    for index, segment in enumerate(path[: len(path) - 2]):
+        if "|" in segment or _split_multi_connector(segment, candidates)[1] is not None:
+            return index
+        if segment in candidates and path[index + 1].startswith("type|"):
+            return index
+    return max(len(path) - 2, 0)
+
+
+def add_rows_to_structure(
+    jsonld: JsonLdNode,
+    rows: list[tuple[list[str], Any, str, str | None]],
+    data_container: "json_convert.ExcelContainer",
+) -> None:
+    """
+    Adds several schema rows to a JSON-LD structure, resolving shared ancestors only once.
+
+    The rows are grouped into a prefix trie over the plain connectors their paths start with.
+    A depth-first pass then resolves each branch of the trie a single time and continues
+    ``add_to_structure`` from there for every row below it. Branches are only shared between
+    rows that follow each other in the sheet, which keeps the order in which multi-connector
+    entries and the ``_select_entry`` fallbacks are resolved identical to adding the rows one
+    by one with ``add_to_structure``.
+
+    Args:
+        jsonld (JsonLdNode): The root node of the JSON-LD structure to modify.
+        rows (list[tuple[list[str], Any, str, str | None]]): The ``(path, value, unit, metadata)``
+            of each row, in sheet order.
+        data_container (ExcelContainer): The container holding the lookup sheets of the conversion.
+
+    Returns:
+        None: This function modifies the JSON-LD structure in place.
+
+    Raises:
+        RuntimeError: If a value cannot be added at its path (see ``add_to_structure``).
+    """
+    context = _get_structure_context(data_container)
+
+    trie = _PathTrieNode()
+    depths: list[int] = []
+    for position, (path, value, unit, _) in enumerate(rows):
+        depth = _shareable_prefix_length(path, value, unit, context)
+        depths.append(depth)
+        branch = trie
+        for segment in path[:depth]:
+            last_item = branch.items[-1] if branch.items else None
+            if not isinstance(last_item, _PathTrieNode) or last_item.segment != segment:
+                last_item = _PathTrieNode(segment)
+                branch.items.append(last_item)
+            branch = last_item
+        branch.items.append(position)
+
+    def _resolve(level: Any, segment: str, position: int) -> Any:
+        """Step from ``level`` into ``segment`` the way ``add_to_structure`` does."""
+
+        try:
+            if isinstance(level, list):
+                level = level[-1]
+            if segment not in level.props:
+                connector_type = context.connector_types.get(segment)
+                level.props[segment] = (
+                    JsonLdNode()
+                    if segment not in context.connectors or pd.isna(connector_type)
+                    else JsonLdNode(connector_type)
+                )
+            return level.props[segment]
+        except Exception as e:
+            traceback.print_exc()
+            path, value = rows[position][0], rows[position][1]
+            raise RuntimeError(
+                f"Error occurred with value '{value}' and path '{path}': {str(e)}"
+            )
+
+    def _first_row(branch: _PathTrieNode) -> int:
+        """Return the sheet position of the first row below ``branch``."""
+
+        item = branch.items[0]
+        return item if isinstance(item, int) else _first_row(item)
+
+    def _apply(branch: _PathTrieNode, level: Any) -> None:
+        """Apply the rows below ``branch`` depth-first, starting from ``level``."""
+
+        for item in branch.items:
+            if isinstance(item, _PathTrieNode):
+                _apply(item, _resolve(level, item.segment, _first_row(item)))
+                continue
+            path, value, unit, metadata = rows[item]
+            add_to_structure(
+                jsonld,
+                path,
+                value,
+                unit,
+                data_container,
+                metadata=metadata,
+                start_index=depths[item],
+                start_node=level,
+            )
+
+    _apply(trie, jsonld)
+
+
 def plf(value: Any, part: str, current_level: Optional[dict] = None, debug_switch: bool = DEBUG_STATUS):
     """
     Print Line Function (PLF).
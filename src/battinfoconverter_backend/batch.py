@@ -0,0 +1,141 @@
+"""
+batch.py
+Convert a set of uploaded workbooks at once and pack the results into one ZIP.
+
+`convert_workbooks` converts workbooks given as bytes in a bounded worker
+pool and yields each result as soon as it is done, so a caller can report
+progress per file; a workbook that fails does not stop the others.
+`write_zip` writes the results into a ZIP archive entry by entry, so only
+one encoded document is held besides the archive at any time.
+"""
+
+import functools
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from .json_convert import PARALLEL_MODES, convert_excel_to_jsonld
+from .output_formats import ENCODING_EXTENSIONS, encode_jsonld
+
+DEFAULT_WORKERS = 2
+
+OUTPUT_PREFIX = "BattINFO_converter_"
+
+# Encodings that are compressed already; their ZIP entries are stored as they are.
+_COMPRESSED_ENCODINGS = ("json-gzip", "json-zstd")
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of one workbook of a batch.
+
+    Attributes:
+        name (str): The name the workbook was given, e.g. its upload file name.
+        jsonld (dict | None): The converted document, None if the conversion failed.
+        error (str | None): Why the conversion failed, None if it succeeded.
+    """
+
+    name: str
+    jsonld: dict | None = None
+    error: str | None = None
+
+
+def _convert(content: bytes, options: dict) -> dict:
+    """Pool task: convert one workbook (top level, so processes can run it)."""
+    return convert_excel_to_jsonld(content, debug_mode=False, **options)
+
+
+def convert_workbooks(
+    workbooks: Iterable[tuple[str, bytes]],
+    workers: int = DEFAULT_WORKERS,
+    pool: str = "thread",
+    **options,
+) -> Iterator[BatchResult]:
+    """
+    Converts workbooks in a bounded worker pool.
+
+    Args:
+        workbooks (Iterable[tuple[str, bytes]]): The name and bytes of each workbook.
+        workers (int): The size of the worker pool. Default is 2.
+        pool (str): "thread" or "process", see `json_convert.PARALLEL_MODES`. Default is "thread".
+        **options: Passed on to `json_convert.convert_excel_to_jsonld`, e.g. ``use_bundles=True``.
+
+    Yields:
+        BatchResult: The result of each workbook, in the order they finish.
+
+    Raises:
+        ValueError: If the pool kind is unknown or there are fewer than one worker.
+    """
+    if pool not in PARALLEL_MODES:
+        raise ValueError(f"Unknown pool '{pool}', expected one of {PARALLEL_MODES}")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    executor_cls = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+    task = functools.partial(_convert, options=options)
+    with executor_cls(max_workers=workers) as executor:
+        futures = {executor.submit(task, content): name for name, content in workbooks}
+        for future in as_completed(futures):
+            try:
+                yield BatchResult(futures[future], jsonld=future.result())
+            except Exception as exc:  # any failure is reported per workbook, the batch goes on
+                yield BatchResult(futures[future], error=str(exc))
+
+
+def output_file_name(workbook_name: str, encoding: str = "json") -> str:
+    """
+    Names the output of a workbook as the web app does.
+
+    Args:
+        workbook_name (str): The workbook file name, e.g. "cell_1.xlsx".
+        encoding (str): One of `output_formats.OUTPUT_ENCODINGS`. Default is "json".
+
+    Returns:
+        str: E.g. "BattINFO_converter_cell_1.json".
+    """
+    return f"{OUTPUT_PREFIX}{Path(workbook_name).stem}{ENCODING_EXTENSIONS[encoding]}"
+
+
+def write_zip(
+    results: Iterable[BatchResult], target: str | Path | BinaryIO, encoding: str = "json"
+) -> dict[str, str]:
+    """
+    Writes the converted documents of a batch into a ZIP archive, one entry per workbook.
+
+    Failed results are left out. Entries are named by `output_file_name`; workbooks of the same name get a
+    " (2)", " (3)", ... suffix.
+
+    Args:
+        results (Iterable[BatchResult]): The results, e.g. from `convert_workbooks`.
+        target (str | Path | BinaryIO): The archive file, or a writable binary file-like object.
+        encoding (str): The encoding of the entries, one of `output_formats.OUTPUT_ENCODINGS`. Default is "json".
+
+    Returns:
+        dict[str, str]: The entry name of each written workbook by its name.
+
+    Raises:
+        ValueError: If the encoding is unknown.
+        ImportError: If the encoding needs an optional package that is not installed.
+    """
+    if encoding not in ENCODING_EXTENSIONS:
+        raise ValueError(f"Unknown output encoding '{encoding}', expected one of {tuple(ENCODING_EXTENSIONS)}")
+    compression = zipfile.ZIP_STORED if encoding in _COMPRESSED_ENCODINGS else zipfile.ZIP_DEFLATED
+    entries: dict[str, str] = {}
+    used: set[str] = set()
+    with zipfile.ZipFile(target, "w", compression=compression) as archive:
+        for result in results:
+            if result.jsonld is None:
+                continue
+            entry = output_file_name(result.name, encoding)
+            stem, suffix = entry[: -len(ENCODING_EXTENSIONS[encoding])], ENCODING_EXTENSIONS[encoding]
+            copy_number = 2
+            while entry in used:
+                entry = f"{stem} ({copy_number}){suffix}"
+                copy_number += 1
+            used.add(entry)
+            archive.writestr(entry, encode_jsonld(result.jsonld, encoding))
+            entries[result.name] = entry
+    return entries
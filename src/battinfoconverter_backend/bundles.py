@@ -0,0 +1,191 @@
+"""
+bundles.py
+Precompiled lookup sheets of the shipped templates.
+
+Of the five sheets of a workbook only ``@Schema`` holds the values of a
+cell; ``@Context``, ``@Predicates``, ``@Classes`` and ``@Units`` come with
+the template. A bundle stores these four sheets of one template as the rows
+they are read into, named by `excel_tools.sheet_content_digest` of the
+sheets. With ``use_bundles`` an `ExcelContainer` hashes the lookup sheets of
+the workbook, which costs a fraction of reading them, and takes them from
+the matching bundle. Workbooks claiming the same schema version do not
+always have the same lookup sheets, so the digest, not the version, selects
+the bundle; a workbook with edited lookup sheets has none and is read as
+before.
+
+Build the bundles of the templates in ``Excel for reference`` with
+``battinfoconverter-bundles "Excel for reference"`` after adding a template.
+"""
+
+import argparse
+import functools
+from pathlib import Path
+
+import simplejson as json
+from pandas import DataFrame
+
+from .excel_tools import (
+    ExcelSource,
+    ReadLimits,
+    frame_from_rows,
+    read_sheet_names,
+    sheet_content_digest,
+    workbook_buffer,
+)
+from .excel_tools import _BufferReader, _read_rows_openpyxl
+
+# Bumped whenever the stored rows change meaning; bundles of another format are ignored.
+BUNDLE_FORMAT = 2
+
+BUNDLE_DIR = Path(__file__).resolve().parent / "bundles"
+
+BUNDLE_SUFFIX = ".json"
+
+
+def lookup_sheet_names(
+    workbook_sheets: list[str], sheet_names: dict[str, tuple[str, str]]
+) -> dict[str, str] | None:
+    """
+    Picks the name each lookup sheet has in a workbook, the current one first.
+
+    Args:
+        workbook_sheets (list[str]): The sheet names of the workbook, see `excel_tools.read_sheet_names`.
+        sheet_names (dict[str, tuple[str, str]]): The current and legacy name of each lookup sheet by data key,
+            like `json_convert.SHEET_NAMES` without the schema sheet.
+
+    Returns:
+        dict[str, str] | None: The sheet name by data key, None if the workbook lacks one of the sheets.
+    """
+    present = set(workbook_sheets)
+    chosen = {}
+    for key, names in sheet_names.items():
+        name = next((name for name in names if name in present), None)
+        if name is None:
+            return None
+        chosen[key] = name
+    return chosen
+
+
+@functools.lru_cache(maxsize=64)
+def _read_bundle(path: Path) -> dict | None:
+    """The stored bundle, parsed once per process; None if there is none or it has another format."""
+    try:
+        with path.open(encoding="utf-8") as bundle_file:
+            bundle = json.load(bundle_file)
+    except (FileNotFoundError, ValueError):
+        return None
+    return bundle if bundle.get("format") == BUNDLE_FORMAT else None
+
+
+def load_bundle(
+    excel_file: ExcelSource,
+    sheet_names: dict[str, tuple[str, str]],
+    directory: str | Path = BUNDLE_DIR,
+    limits: ReadLimits | None = None,
+) -> dict[str, DataFrame] | None:
+    """
+    Looks up the lookup sheets of a workbook in the bundles.
+
+    Args:
+        excel_file (ExcelSource): The workbook: a path, a binary file-like object or the workbook bytes.
+        sheet_names (dict[str, tuple[str, str]]): The current and legacy name of each lookup sheet by data key.
+        directory (str | Path): Where the bundles are stored. Default is the bundles shipped with the package.
+        limits (ReadLimits | None): Bounds on the cost of hashing the lookup sheets of an untrusted workbook, as
+            when reading them, see `excel_tools.ReadLimits`. Default is None (unbounded).
+
+    Returns:
+        dict[str, DataFrame] | None: The sheets by data key, equal to reading them from the workbook; None if no
+            bundle matches.
+
+    Raises:
+        WorkbookLimitError: If hashing the lookup sheets exceeds ``limits``.
+    """
+    with workbook_buffer(excel_file) as buffer:
+        names = lookup_sheet_names(read_sheet_names(buffer), sheet_names)
+        digest = sheet_content_digest(buffer, list(names.values()), limits) if names is not None else None
+    if digest is None:
+        return None
+    bundle = _read_bundle(Path(directory) / f"{digest}{BUNDLE_SUFFIX}")
+    if bundle is None or bundle["digest"] != digest or set(bundle["sheets"]) != set(names):
+        return None
+    return {key: frame_from_rows(bundle["sheets"][key]["rows"]) for key in names}
+
+
+def build_bundle(excel_file: ExcelSource, sheet_names: dict[str, tuple[str, str]]) -> dict:
+    """
+    Reads the lookup sheets of a template into a bundle.
+
+    Args:
+        excel_file (ExcelSource): The template workbook.
+        sheet_names (dict[str, tuple[str, str]]): The current and legacy name of each lookup sheet by data key.
+
+    Returns:
+        dict: The bundle: format, digest and the rows of each sheet as read with openpyxl.
+
+    Raises:
+        KeyError: If the workbook lacks one of the lookup sheets.
+        ValueError: If the sheets cannot be hashed or hold values JSON cannot store exactly (e.g. dates).
+    """
+    with workbook_buffer(excel_file) as buffer:
+        names = lookup_sheet_names(read_sheet_names(buffer), sheet_names)
+        if names is None:
+            raise KeyError(f"The workbook lacks one of the sheets {list(sheet_names.values())}")
+        digest = sheet_content_digest(buffer, list(names.values()))
+        if digest is None:
+            raise ValueError("The lookup sheets cannot be read without openpyxl")
+        sheets = {}
+        for key, name in names.items():
+            rows = _read_rows_openpyxl(_BufferReader(buffer), name)
+            for row in rows:
+                for value in row:
+                    if value is not None and not isinstance(value, (str, int, float, bool)):
+                        raise ValueError(f"Sheet '{name}' holds a {type(value).__name__}, which a bundle cannot store")
+            sheets[key] = {"name": name, "rows": rows}
+    return {"format": BUNDLE_FORMAT, "digest": digest, "sheets": sheets}
+
+
+def write_bundle(bundle: dict, directory: str | Path = BUNDLE_DIR) -> Path:
+    """
+    Stores a bundle under its digest.
+
+    Args:
+        bundle (dict): The result of `build_bundle`.
+        directory (str | Path): Where the bundles are stored. Default is the bundles shipped with the package.
+
+    Returns:
+        Path: The bundle file.
+    """
+    path = Path(directory) / f"{bundle['digest']}{BUNDLE_SUFFIX}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as bundle_file:
+        json.dump(bundle, bundle_file, ensure_ascii=False, separators=(",", ":"))
+        bundle_file.write("\n")
+    _read_bundle.cache_clear()
+    return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point of the build step, see ``--help``."""
+    # json_convert imports this module for ExcelContainer, so the sheet names are imported here
+    from .json_convert import SHEET_NAMES
+
+    parser = argparse.ArgumentParser(description="Precompile the lookup sheets of BattINFO templates.")
+    parser.add_argument("templates", type=Path, nargs="+", help="template workbooks or folders of them")
+    parser.add_argument("--output", type=Path, default=BUNDLE_DIR, help="where to store the bundles")
+    args = parser.parse_args(argv)
+
+    lookup_sheets = {key: names for key, names in SHEET_NAMES.items() if key != "schema"}
+    workbooks = []
+    for template in args.templates:
+        workbooks.extend(sorted(template.glob("*.xlsx")) if template.is_dir() else [template])
+    for workbook in workbooks:
+        try:
+            path = write_bundle(build_bundle(workbook, lookup_sheets), args.output)
+        except (KeyError, ValueError) as exc:
+            print(f"{workbook.name}: skipped ({exc})")
+            continue
+        print(f"{workbook.name}: {path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+cache.py
+A persistent, content-addressed cache of conversion results.
+
+Results are stored in a SQLite file under the SHA-256 of the workbook bytes
+and the converter version, so an unchanged workbook is not converted again,
+whatever its file name, while a new release of the converter starts afresh.
+Entries are kept as gzip-compressed JSON with a checksum that is verified on
+every read; a damaged entry is dropped and counts as a miss. When the stored
+results outgrow ``max_bytes`` the least recently used ones are evicted.
+
+Pass a `ConversionCache` as ``cache=`` to `json_convert.convert_excel_to_jsonld`
+or `json_convert.convert_excel_columns_to_jsonld`. One cache file can be
+shared by several threads and processes.
+"""
+
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+from importlib.metadata import version as package_version
+from pathlib import Path
+from typing import Any
+
+import simplejson as json
+
+CONVERTER_VERSION = package_version("battinfoconverter-backend")
+
+# 256 MiB of compressed results, some tens of thousands of documents.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    digest TEXT NOT NULL,
+    version TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    checksum TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (digest, version, variant)
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def workbook_digest(content: bytes | memoryview) -> str:
+    """
+    Hashes the bytes of a workbook.
+
+    Args:
+        content (bytes | memoryview): The workbook bytes, e.g. the view of `excel_tools.workbook_buffer`.
+
+    Returns:
+        str: The SHA-256 hex digest.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+class ConversionCache:
+    """
+    Conversion results in a SQLite file, keyed by workbook digest and converter version.
+
+    Attributes:
+        path (Path): The SQLite file; it is created on first use.
+        max_bytes (int): The total size of the stored results above which the least recently used are evicted.
+        version (str): The converter version the results belong to. Default is the installed version.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES, version: str = CONVERTER_VERSION) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ConversionCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @property
+    def total_bytes(self) -> int:
+        """The size of all stored results, in bytes."""
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+    def get(self, digest: str, variant: str) -> Any | None:
+        """
+        Looks up a result and marks it as recently used.
+
+        Args:
+            digest (str): The `workbook_digest` of the workbook.
+            variant (str): Which result of the workbook, e.g. the value column the document was converted from.
+
+        Returns:
+            Any | None: The stored JSON value, None if there is none or it failed the integrity check.
+        """
+        key = (digest, self.version, variant)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, checksum FROM results WHERE digest = ? AND version = ? AND variant = ?", key
+            ).fetchone()
+            if row is None:
+                return None
+            payload, checksum = row
+            try:
+                if hashlib.sha256(payload).hexdigest() != checksum:
+                    raise ValueError("checksum mismatch")
+                value = json.loads(gzip.decompress(payload).decode("utf-8"))
+            except (ValueError, OSError, EOFError):
+                self._connection.execute(
+                    "DELETE FROM results WHERE digest = ? AND version = ? AND variant = ?", key
+                )
+                return None
+            self._connection.execute(
+                "UPDATE results SET last_used = ? WHERE digest = ? AND version = ? AND variant = ?",
+                (time.time(), *key),
+            )
+        return value
+
+    def put(self, digest: str, variant: str, value: Any) -> None:
+        """
+        Stores a result, evicting the least recently used ones if the cache grows over `max_bytes`.
+
+        Args:
+            digest (str): The `workbook_digest` of the workbook.
+            variant (str): Which result of the workbook.
+            value (Any): The JSON value to store, e.g. a JSON-LD document.
+        """
+        text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, use_decimal=True)
+        payload = gzip.compress(text.encode("utf-8"), mtime=0)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, self.version, variant, payload, hashlib.sha256(payload).hexdigest(), len(payload), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used results until the rest fits into `max_bytes`."""
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        stale = []
+        for digest, version, variant, size in self._connection.execute(
+            "SELECT digest, version, variant, size FROM results ORDER BY last_used"
+        ):
+            stale.append((digest, version, variant))
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.executemany(
+            "DELETE FROM results WHERE digest = ? AND version = ? AND variant = ?", stale
+        )
+
+    def clear(self) -> None:
+        """Removes all stored results."""
+        with self._lock:
+            self._connection.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        """Closes the SQLite connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,94 @@
+"""
+context_export.py
+Move the inline ``@context`` of converted documents into a shared context file.
+
+Every conversion inlines the prefixes of the ``@Context`` sheet. With
+`externalise_context` the inline part is written once as a context document
+named by the SHA-256 of its content, and each document references it by
+IRI instead. Documents converted from the same template share the file, and
+a consumer that already holds it, e.g. from an earlier batch, can skip it.
+Because the name changes with the content, a cached copy is never stale.
+
+``rdf_export`` resolves such a reference offline when the context is passed
+as ``contexts={iri: context_document["@context"]}``.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any
+
+import simplejson as json
+
+CONTEXT_FILE_PREFIX = "context-"
+CONTEXT_FILE_SUFFIX = ".jsonld"
+
+# Hex digits of the SHA-256 kept in the file name (64 bits).
+DIGEST_LENGTH = 16
+
+
+def context_file_name(context: dict) -> str:
+    """
+    Names a context document by the hash of its content.
+
+    Args:
+        context (dict): The term definitions, e.g. the inline part of a converted document's ``@context``.
+
+    Returns:
+        str: ``context-<first 16 hex digits of the SHA-256>.jsonld``; equal contexts get equal names, whatever
+            their key order.
+    """
+    canonical = json.dumps(context, sort_keys=True, separators=(",", ":"), ensure_ascii=False, use_decimal=True)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:DIGEST_LENGTH]
+    return f"{CONTEXT_FILE_PREFIX}{digest}{CONTEXT_FILE_SUFFIX}"
+
+
+def externalise_context(jsonld: dict, base_iri: str = "") -> tuple[dict, str, dict]:
+    """
+    Replaces the inline part of a document's ``@context`` by a reference to a context document.
+
+    Remote contexts referenced by IRI, such as the battery domain context, stay where they are, so the term
+    definitions and their order are unchanged.
+
+    Args:
+        jsonld (dict): The converted document; it is not changed.
+        base_iri (str): Where the context files are published, e.g. "https://example.org/contexts/". Default is ""
+            (a relative reference, resolved against the location of the document).
+
+    Returns:
+        tuple[dict, str, dict]: The document referencing the context, the file name of the context document and
+            the context document (``{"@context": {...}}``) to publish under that name.
+
+    Raises:
+        ValueError: If the document has no inline context.
+    """
+    context = jsonld.get("@context")
+    entries = context if isinstance(context, list) else [context]
+    inline = [entry for entry in entries if isinstance(entry, dict)]
+    if len(inline) != 1:
+        raise ValueError(f"Expected one inline @context definition, found {len(inline)}")
+    name = context_file_name(inline[0])
+    reference: Any = [base_iri + name if isinstance(entry, dict) else entry for entry in entries]
+    if not isinstance(context, list):
+        reference = reference[0]
+    return {**jsonld, "@context": reference}, name, {"@context": inline[0]}
+
+
+def write_context(context_document: dict, directory: str | Path, name: str | None = None) -> Path:
+    """
+    Writes a context document into a directory, unless a file of that name is already there.
+
+    Args:
+        context_document (dict): The context document returned by `externalise_context`.
+        directory (str | Path): The directory the context files are published from.
+        name (str | None): The file name returned by `externalise_context`. Default is None (derived again).
+
+    Returns:
+        Path: The context file.
+    """
+    path = Path(directory) / (name or context_file_name(context_document["@context"]))
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + ".tmp")
+        partial.write_text(json.dumps(context_document, indent=4, ensure_ascii=False), encoding="utf-8")
+        partial.replace(path)
+    return path
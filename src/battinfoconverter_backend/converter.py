@@ -0,0 +1,103 @@
+"""
+converter.py
+Parse a filled workbook once and render JSON-LD variants of it.
+
+``Converter.from_workbook(path).render({"Electrolyte solute A molarity": 1.2})``
+builds the document of the workbook with some ``@Schema`` values replaced,
+without reading the file again. This is meant for parameter sweeps and
+design-of-experiments runs that produce many variants of one cell. Variants
+that only change measured values, comments or string literals are filled
+into a prebuilt document (see `skeletons`).
+"""
+
+import copy
+from typing import Any
+
+import numpy as np
+
+from . import auxiliary as aux
+from . import json_convert
+from .excel_tools import ExcelSource
+from .json_convert import BUILD_STRATEGIES, VALUE_COLUMN, ExcelContainer
+from .skeletons import SkeletonCache, template_key
+from .table_convert import metadata_keys
+
+
+class Converter:
+    """
+    Renders JSON-LD documents from the cached sheets of one workbook.
+
+    Overrides are keyed by ``Metadata`` label, numbered ``label.1``, ``label.2``, ... where a label repeats in the
+    schema sheet (see `table_convert.metadata_keys`). `render` does not change the converter, so it can be called
+    any number of times, also from several threads.
+
+    Attributes:
+        data_container (ExcelContainer): The parsed workbook.
+        build_strategy (str): How the schema rows are added to the JSON-LD, one of `json_convert.BUILD_STRATEGIES`.
+    """
+
+    def __init__(self, data_container: ExcelContainer, build_strategy: str = "sequential") -> None:
+        if build_strategy not in BUILD_STRATEGIES:
+            raise ValueError(f"Unknown build strategy '{build_strategy}', expected one of {BUILD_STRATEGIES}")
+        self.data_container = data_container
+        self.build_strategy = build_strategy
+        schema = data_container.data["schema"]
+        self._schema = schema[["Metadata", "Unit", "Ontology link"]]
+        self._values = schema[VALUE_COLUMN].to_numpy(dtype=object, copy=True)
+        self._rows = {key: row for row, key in enumerate(metadata_keys(schema)) if isinstance(key, str)}
+        # build the unit and connector lookups now, so every variant shares them
+        aux._get_structure_context(data_container)
+        template_key(data_container)
+        self._skeletons = SkeletonCache()
+
+    @classmethod
+    def from_workbook(
+        cls, excel_file: ExcelSource, excel_engine: str = "openpyxl", build_strategy: str = "sequential"
+    ) -> "Converter":
+        """
+        Parses a workbook for rendering.
+
+        Args:
+            excel_file (ExcelSource): The filled workbook: a path, a binary file-like object or the workbook bytes.
+            excel_engine (str): The reader used for the sheets, one of `excel_tools.EXCEL_ENGINES`. Default is "openpyxl".
+            build_strategy (str): How the schema rows are added, one of `json_convert.BUILD_STRATEGIES`.
+                Default is "sequential".
+
+        Returns:
+            Converter: The converter of the workbook.
+        """
+        return cls(ExcelContainer(excel_file, engine=excel_engine), build_strategy=build_strategy)
+
+    @property
+    def metadata_labels(self) -> list[str]:
+        """The labels `render` accepts as override keys, in sheet order."""
+        return list(self._rows)
+
+    def render(self, overrides: dict[str, Any] | None = None) -> dict:
+        """
+        Builds the JSON-LD of the workbook with some values replaced.
+
+        Args:
+            overrides (dict[str, Any] | None): New values by ``Metadata`` label; None clears a value.
+                Default is None (the workbook as it is).
+
+        Returns:
+            dict: The JSON-LD document of the variant.
+
+        Raises:
+            ValueError: If an override label is not in the schema sheet, or the variant misses required fields.
+        """
+        overrides = overrides or {}
+        unknown = [label for label in overrides if label not in self._rows]
+        if unknown:
+            raise ValueError(f"Unknown Metadata label(s) {unknown}, see Converter.metadata_labels")
+
+        values = self._values.copy()
+        for label, value in overrides.items():
+            values[self._rows[label]] = np.nan if value is None else value
+
+        # a shallow copy shares the sheets and the structure context but gets its own build state
+        variant = copy.copy(self.data_container)
+        variant.data = {**self.data_container.data, "schema": self._schema.assign(**{VALUE_COLUMN: values})}
+        jsonld_output = self._skeletons.create_jsonld(variant, build_strategy=self.build_strategy)
+        return json_convert.assit_format_json_rated_capacity(jsonld_output)
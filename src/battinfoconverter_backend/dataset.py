@@ -0,0 +1,77 @@
+"""
+dataset.py
+Merge many converted cells into one JSON-LD dataset document.
+
+Every conversion carries the full ``@context`` of its ``@Context`` sheet and
+repeats the nodes that have an ``@id`` from the ``@Classes`` sheet, such as
+the manufacturer and the operator. `merge_jsonld` puts the cells into one
+``@graph`` under a single shared ``@context`` and keeps one copy of each
+identified node, which the cells reference by ``{"@id": ...}``. In JSON-LD
+a node reference means the same as the node itself, so the dataset has the
+same triples as the documents it was merged from.
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+import simplejson as json
+
+
+def _node_key(node: dict) -> str:
+    """Text that is equal for nodes with the same content, whatever their key order."""
+    return json.dumps(node, sort_keys=True, use_decimal=True)
+
+
+def _extract_nodes(value: Any, nodes: dict[str, dict], keys: dict[str, str]) -> Any:
+    """Copy ``value``, replacing nested identified nodes by references and collecting them in ``nodes``."""
+    if isinstance(value, list):
+        return [_extract_nodes(item, nodes, keys) for item in value]
+    if not isinstance(value, dict):
+        return value
+    copied = {key: _extract_nodes(item, nodes, keys) for key, item in value.items()}
+    node_id = copied.get("@id")
+    if not isinstance(node_id, str) or len(copied) == 1:
+        return copied
+    key = _node_key(copied)
+    if node_id not in nodes:
+        nodes[node_id], keys[node_id] = copied, key
+    elif keys[node_id] != key:
+        # the same @id described differently: keep this description where it is
+        return copied
+    return {"@id": node_id}
+
+
+def merge_jsonld(documents: Iterable[dict]) -> dict:
+    """
+    Merges converted JSON-LD documents into one dataset with a shared ``@context``.
+
+    Args:
+        documents (Iterable[dict]): The documents, e.g. the results of `json_convert.convert_excel_to_jsonld` or
+            the documents of `json_convert.convert_excel_columns_to_jsonld`. They are not changed.
+
+    Returns:
+        dict: ``{"@context": ..., "@graph": [...]}`` with the cells in input order, followed by each identified node
+            once. A node whose ``@id`` occurs with different content in different places is kept inline there.
+
+    Raises:
+        ValueError: If there are no documents or their ``@context`` differs (e.g. templates of different versions).
+    """
+    context: Any = None
+    cells: list[dict] = []
+    nodes: dict[str, dict] = {}
+    keys: dict[str, str] = {}
+    for position, document in enumerate(documents):
+        document_context = document.get("@context")
+        if position == 0:
+            context = document_context
+        elif document_context != context:
+            raise ValueError(f"Document {position} has a different @context than the first document")
+        # the cell itself stays in the graph, only the nodes inside it are shared
+        cells.append({
+            key: _extract_nodes(value, nodes, keys) for key, value in document.items() if key != "@context"
+        })
+    if not cells:
+        raise ValueError("No documents to merge")
+
+    graph = cells + list(nodes.values())
+    return {"@context": context, "@graph": graph} if context is not None else {"@graph": graph}
@@ -2,14 +2,41 @@
 excel_tools.py
 read_excel_preserve_decimals(): a drop-in replacement for pandas.read_excel
 that *keeps the exact number of decimal places* a user sees in Excel.
+
+Two engines are available: "openpyxl" loads the workbook with openpyxl,
+"native" streams only the requested sheet XML, sharedStrings.xml and
+styles.xml straight from the xlsx archive (falling back to openpyxl for
+anything it cannot read).
 """
 
-from collections.abc import Sequence
+import hashlib
+import io
+import mmap
+import posixpath
+import time
+import zipfile
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import IO, Any
+from xml.etree.ElementTree import fromstring, iterparse
 
 import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from openpyxl.utils.datetime import (
+    CALENDAR_MAC_1904,
+    CALENDAR_WINDOWS_1900,
+    from_excel,
+    from_ISO8601,
+)
+
+EXCEL_ENGINES = ("openpyxl", "native")
+
+# Everything a workbook can be read from: a path, a binary file-like object or the raw bytes.
+ExcelSource = str | Path | IO[bytes] | bytes | bytearray | memoryview
 
 # ------------------------------------------------------------------ #
 # robust import for format_cell (new path / old path / fallback)     #
@@ -33,6 +60,82 @@ except ImportError:
             return f"{v:.{n_dec}f}"
 
 
+# ------------------------------------------------------------------ #
+# resource limits for untrusted workbooks                            #
+# ------------------------------------------------------------------ #
+class WorkbookLimitError(ValueError):
+    """Raised when reading a workbook would exceed one of its `ReadLimits`."""
+
+
+@dataclass(frozen=True)
+class ReadLimits:
+    """
+    Bounds on what reading an untrusted workbook may cost; None lifts a bound.
+
+    The defaults fit the largest templates many times over. A breach raises `WorkbookLimitError` as soon as it is
+    seen: the archive size before anything is decompressed, the sheet size while its rows are streamed.
+
+    Attributes:
+        max_uncompressed_bytes (int | None): The total size of the archive members once decompressed, as declared
+            in the archive (a member is never inflated beyond its declared size). Default is 256 MiB.
+        max_rows (int | None): The last row holding a value, per sheet. Default is 100,000.
+        max_cells (int | None): Rows times columns of a sheet as read, i.e. up to its last value. Default is 2,000,000.
+        max_seconds (float | None): Wall-clock seconds for reading the workbook, checked between rows. Default is 60.
+        deadline (float | None): The `time.monotonic` time the budget runs out, set by `start`. Default is None.
+    """
+
+    max_uncompressed_bytes: int | None = 256 * 2**20
+    max_rows: int | None = 100_000
+    max_cells: int | None = 2_000_000
+    max_seconds: float | None = 60.0
+    deadline: float | None = None
+
+    def start(self) -> "ReadLimits":
+        """The limits with the clock started, so reading several sheets shares one budget; started ones are kept."""
+        if self.deadline is not None or self.max_seconds is None:
+            return self
+        return replace(self, deadline=time.monotonic() + self.max_seconds)
+
+    def check_time(self) -> None:
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise WorkbookLimitError(f"Reading the workbook took longer than {self.max_seconds:g} s")
+
+    def check_extent(self, rows: int, columns: int) -> None:
+        if self.max_rows is not None and rows > self.max_rows:
+            raise WorkbookLimitError(f"The sheet has values down to row {rows} (limit {self.max_rows})")
+        if self.max_cells is not None and rows * columns > self.max_cells:
+            raise WorkbookLimitError(
+                f"The sheet spans {rows} rows x {columns} columns = {rows * columns} cells (limit {self.max_cells})"
+            )
+
+
+def check_archive(path: ExcelSource, limits: ReadLimits) -> None:
+    """
+    Check the declared size of a workbook archive against ``limits`` before anything is decompressed.
+
+    Archives that are not zip files are left to the readers to reject.
+    Raises `WorkbookLimitError` if the archive would inflate beyond
+    ``max_uncompressed_bytes``.
+    """
+    if limits.max_uncompressed_bytes is None:
+        return
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        path = _BufferReader(path)
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError):
+        return
+    finally:
+        if hasattr(path, "seek"):
+            path.seek(0)
+    with archive:
+        total = sum(info.file_size for info in archive.infolist())
+    if total > limits.max_uncompressed_bytes:
+        raise WorkbookLimitError(
+            f"The workbook expands to {total / 2**20:.1f} MiB (limit {limits.max_uncompressed_bytes / 2**20:.1f} MiB)"
+        )
+
+
 # ------------------------------------------------------------------ #
 # internal helper                                                    #
 # ------------------------------------------------------------------ #
@@ -51,25 +154,602 @@ def _clean_cell(cell) -> Any:
     return cell.value                  # integer-like
 
 
+# ------------------------------------------------------------------ #
+# native engine                                                      #
+# ------------------------------------------------------------------ #
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class _NativeCell:
+    """Minimal stand-in for an openpyxl cell, enough for ``_clean_cell``."""
+
+    __slots__ = ("value", "data_type", "number_format")
+
+    def __init__(self, value: Any, data_type: str, number_format: str) -> None:
+        self.value = value
+        self.data_type = data_type
+        self.number_format = number_format
+
+
+def _read_rels(archive: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """Return ``{rId: (type, target part)}`` for the relationships of ``part``."""
+    folder, name = posixpath.split(part)
+    rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+    if rels_path not in archive.NameToInfo:
+        return {}
+    rels = {}
+    for rel in fromstring(archive.read(rels_path)).iter(f"{_PKG_REL_NS}Relationship"):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            target = target[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type", ""), target)
+    return rels
+
+
+def _text_content(node) -> str:
+    """Concatenate the plain and rich-text runs of a ``<si>``/``<is>`` node."""
+    snippets = []
+    plain = node.find(f"{_MAIN_NS}t")
+    if plain is not None and plain.text is not None:
+        snippets.append(plain.text)
+    for run in node.iterfind(f"{_MAIN_NS}r/{_MAIN_NS}t"):
+        if run.text is not None:
+            snippets.append(run.text)
+    return "".join(snippets)
+
+
+def _read_shared_strings(archive: zipfile.ZipFile, part: str | None) -> list[str]:
+    """Read the shared string table the way openpyxl does."""
+    if part is None or part not in archive.NameToInfo:
+        return []
+    strings = []
+    with archive.open(part) as source:
+        for _, node in iterparse(source):
+            if node.tag == f"{_MAIN_NS}si":
+                strings.append(_text_content(node).replace("x005F_", ""))
+                node.clear()
+    return strings
+
+
+def _read_cell_formats(
+    archive: zipfile.ZipFile, part: str | None
+) -> tuple[list[str], set[int], set[int]]:
+    """Return the number format of every cell style plus the date and timedelta style ids."""
+    if part is None or part not in archive.NameToInfo:
+        return ["General"], set(), set()
+    root = fromstring(archive.read(part))
+    custom = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in root.iterfind(f"{_MAIN_NS}numFmts/{_MAIN_NS}numFmt")
+    }
+    formats, date_ids, timedelta_ids = [], set(), set()
+    for idx, xf in enumerate(root.iterfind(f"{_MAIN_NS}cellXfs/{_MAIN_NS}xf")):
+        fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom[fmt_id] if fmt_id in custom else BUILTIN_FORMATS.get(fmt_id)
+        if is_date_format(fmt):
+            date_ids.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_ids.add(idx)
+        formats.append(fmt if fmt is not None else "General")
+    return formats or ["General"], date_ids, timedelta_ids
+
+
+def _parse_sheet(
+    archive: zipfile.ZipFile,
+    sheet_part: str,
+    shared_strings: list[str],
+    formats: list[str],
+    date_ids: set[int],
+    timedelta_ids: set[int],
+    epoch,
+    max_row: int | None = None,
+    limits: ReadLimits | None = None,
+) -> list[list[Any]]:
+    """Stream the ``<row>`` elements of a sheet into the rows ``ws.iter_rows()`` would give, up to the last value.
+
+    Cells without a value are not kept, so rows and columns that are only formatted do not widen the result.
+    With ``max_row`` the cells of later rows are skipped; the merged ranges at the end of the sheet are still read.
+    """
+    cells: dict[tuple[int, int], Any] = {}
+    merged: list[tuple[int, int, int, int]] = []
+    row_counter = 0
+    # extent of the values in the skipped part, so the kept rows come out as wide as in a full read
+    skipped_rows = skipped_columns = 0
+    # extent of the values read so far, checked against ``limits`` whenever it grows
+    last_row = last_column = 1
+    with archive.open(sheet_part) as source:
+        for _, element in iterparse(source):
+            tag = element.tag
+            if tag == f"{_MAIN_NS}row":
+                r_attr = element.get("r")
+                row_counter = int(float(r_attr)) if r_attr is not None else row_counter + 1
+                if limits is not None:
+                    limits.check_time()
+                if max_row is not None and row_counter > max_row:
+                    last_column = 0
+                    for position, c in enumerate(element.iterfind(f"{_MAIN_NS}c"), start=1):
+                        coordinate = c.get("r")
+                        position = coordinate_to_tuple(coordinate)[1] if coordinate else position
+                        if _has_value(c):
+                            last_column = position
+                    if last_column:
+                        skipped_rows = row_counter
+                        skipped_columns = max(skipped_columns, last_column)
+                        if limits is not None:
+                            limits.check_extent(min(skipped_rows, max_row), skipped_columns)
+                    element.clear()
+                    continue
+                col_counter = 0
+                for c in element.iterfind(f"{_MAIN_NS}c"):
+                    coordinate = c.get("r")
+                    if coordinate:
+                        row, column = coordinate_to_tuple(coordinate)
+                        col_counter = column
+                    else:
+                        col_counter += 1
+                        row, column = row_counter, col_counter
+                    data_type = c.get("t", "n")
+                    style_id = int(c.get("s", 0))
+                    value = None if data_type == "inlineStr" else (c.findtext(f"{_MAIN_NS}v") or None)
+                    if value is not None:
+                        if data_type == "n":
+                            value = float(value) if ("." in value or "E" in value or "e" in value) else int(value)
+                            if style_id in date_ids:
+                                data_type = "d"
+                                try:
+                                    value = from_excel(value, epoch, timedelta=style_id in timedelta_ids)
+                                except (OverflowError, ValueError):
+                                    data_type, value = "e", "#VALUE!"
+                        elif data_type == "s":
+                            value = shared_strings[int(value)]
+                        elif data_type == "b":
+                            value = bool(int(value))
+                        elif data_type == "str":
+                            data_type = "s"
+                        elif data_type == "d":
+                            value = from_ISO8601(value)
+                    elif data_type == "inlineStr":
+                        child = c.find(f"{_MAIN_NS}is")
+                        if child is not None:
+                            data_type = "s"
+                            value = _text_content(child)
+                    if value is None:
+                        continue  # formatted but empty
+                    if limits is not None and (row > last_row or column > last_column):
+                        last_row, last_column = max(last_row, row), max(last_column, column)
+                        limits.check_extent(last_row, last_column)
+                    number_format = formats[style_id] if style_id < len(formats) else "General"
+                    cells[row, column] = _clean_cell(_NativeCell(value, data_type, number_format))
+                element.clear()
+            elif tag == f"{_MAIN_NS}mergeCell":
+                merged.append(range_boundaries(element.get("ref")))
+                element.clear()
+
+    # openpyxl keeps only the top-left value of a merged range
+    for min_col, min_row, max_col, last_row in merged:
+        for row in range(min_row, last_row + 1):
+            for column in range(min_col, max_col + 1):
+                if (row, column) != (min_row, min_col):
+                    cells.pop((row, column), None)
+
+    n_rows = max(max((row for row, _ in cells), default=1), min(skipped_rows, max_row or 0))
+    n_cols = max(max((column for _, column in cells), default=1), skipped_columns)
+    return [
+        [cells.get((row, column)) for column in range(1, n_cols + 1)]
+        for row in range(1, n_rows + 1)
+    ]
+
+
+def _has_value(c) -> bool:
+    """Whether a ``<c>`` element holds a value, i.e. is read as something other than None."""
+    if c.findtext(f"{_MAIN_NS}v"):
+        return True
+    return c.get("t") == "inlineStr" and c.find(f"{_MAIN_NS}is") is not None
+
+
+def _value_extent(ws) -> tuple[int, int]:
+    """The last row and column of a worksheet holding a value (at least 1, 1), ignoring cells that are only formatted."""
+    last_row = last_column = 1
+    for (row, column), cell in ws._cells.items():
+        if cell.value is not None:
+            last_row, last_column = max(last_row, row), max(last_column, column)
+    return last_row, last_column
+
+
+def _read_workbook_manifest(archive: zipfile.ZipFile):
+    """Return the workbook XML root, its relationships and ``[(sheet name, (type, part))]`` in tab order."""
+    package_rels = _read_rels(archive, "")
+    workbook_part = next(
+        (target for kind, target in package_rels.values() if kind.endswith("/officeDocument")),
+        "xl/workbook.xml",
+    )
+    workbook = fromstring(archive.read(workbook_part))
+    workbook_rels = _read_rels(archive, workbook_part)
+    sheets = [
+        (sheet.get("name"), workbook_rels.get(sheet.get(f"{_REL_NS}id"), ("", "")))
+        for sheet in workbook.iterfind(f"{_MAIN_NS}sheets/{_MAIN_NS}sheet")
+    ]
+    return workbook, workbook_rels, sheets
+
+
+def _read_rows_native(
+    path: str | Path | IO[bytes], sheet_name: Any, max_row: int | None = None, limits: ReadLimits | None = None
+) -> list[list[Any]] | None:
+    """
+    Read one sheet straight from the xlsx archive, mirroring openpyxl's ``ws.iter_rows()``.
+
+    Returns ``None`` when the archive holds something this reader does not handle,
+    so the caller can fall back to openpyxl.
+
+    Raises:
+        KeyError: If ``sheet_name`` is a name that does not exist in the workbook.
+        WorkbookLimitError: If the sheet exceeds ``limits``.
+    """
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError):
+        return None
+    with archive:
+        try:
+            workbook, workbook_rels, sheets = _read_workbook_manifest(archive)
+        except Exception:
+            return None
+
+        if isinstance(sheet_name, str):
+            matches = [rel for name, rel in sheets if name == sheet_name]
+            if not matches:
+                raise KeyError(f"Worksheet {sheet_name} does not exist.")
+            kind, sheet_part = matches[0]
+        else:
+            worksheets = [rel for _, rel in sheets if rel[0].endswith("/worksheet")]
+            try:
+                kind, sheet_part = worksheets[sheet_name]
+            except (IndexError, TypeError):
+                return None
+        if not kind.endswith("/worksheet") or sheet_part not in archive.NameToInfo:
+            return None
+
+        try:
+            properties = workbook.find(f"{_MAIN_NS}workbookPr")
+            date1904 = properties is not None and properties.get("date1904") in ("1", "true", "True")
+            parts = {kind: target for kind, target in workbook_rels.values()}
+            shared_strings = _read_shared_strings(
+                archive, next((t for k, t in parts.items() if k.endswith("/sharedStrings")), None)
+            )
+            formats, date_ids, timedelta_ids = _read_cell_formats(
+                archive, next((t for k, t in parts.items() if k.endswith("/styles")), None)
+            )
+            return _parse_sheet(
+                archive,
+                sheet_part,
+                shared_strings,
+                formats,
+                date_ids,
+                timedelta_ids,
+                CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900,
+                max_row,
+                limits,
+            )
+        except WorkbookLimitError:
+            raise
+        except Exception:
+            return None
+
+
+def _read_rows_openpyxl(
+    path: str | Path | IO[bytes], sheet_name: Any, max_row: int | None = None, limits: ReadLimits | None = None
+) -> list[list[Any]]:
+    """Read one sheet through openpyxl's workbook model, from A1 up to its last value (see `_value_extent`).
+
+    With ``limits`` the sheet is streamed first (see `_check_extent_streaming`), so an oversized sheet is rejected
+    before the whole workbook is loaded.
+    """
+    if limits is not None:
+        _check_extent_streaming(path, sheet_name, max_row, limits)
+    wb = load_workbook(path, data_only=True)
+    ws = wb[sheet_name] if isinstance(sheet_name, str) else wb.worksheets[sheet_name]
+    last_row, last_column = _value_extent(ws)
+    if max_row is not None:
+        last_row = min(max_row, last_row)
+    if limits is not None:
+        limits.check_time()
+        limits.check_extent(last_row, last_column)
+    rows = []
+    for row in ws.iter_rows(min_row=1, max_row=last_row, min_col=1, max_col=last_column):
+        if limits is not None:
+            limits.check_time()
+        rows.append([_clean_cell(c) for c in row])
+    return rows
+
+
+def _check_extent_streaming(
+    path: str | Path | IO[bytes], sheet_name: Any, max_row: int | None, limits: ReadLimits
+) -> None:
+    """Stream a sheet in openpyxl's read-only mode and check the extent of its values against ``limits``.
+
+    Like the native reader, the columns of the rows beyond ``max_row`` count, its rows do not.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if isinstance(sheet_name, str) else wb.worksheets[sheet_name]
+        ws.reset_dimensions()  # the dimension the sheet declares may be false, read every row
+        last_row = last_column = 1
+        for row in ws.iter_rows():
+            limits.check_time()
+            for cell in row:
+                if cell.value is None or (cell.row <= last_row and cell.column <= last_column):
+                    continue
+                last_row = max(last_row, min(cell.row, max_row or cell.row))
+                last_column = max(last_column, cell.column)
+                limits.check_extent(last_row, last_column)
+    finally:
+        wb.close()
+
+
+# ------------------------------------------------------------------ #
+# in-memory sources (no copies of the workbook bytes)                #
+# ------------------------------------------------------------------ #
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable binary stream over a buffer, so zipfile can use it without copying it."""
+
+    def __init__(self, buffer: bytes | bytearray | memoryview) -> None:
+        view = buffer if isinstance(buffer, memoryview) else memoryview(buffer)
+        self._view = view if view.format == "B" and view.ndim == 1 else view.cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        if base + offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = base + offset
+        return self._pos
+
+    def read(self, size: int | None = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _map_file(fileno: int) -> mmap.mmap | None:
+    """Memory-map an open file read-only; ``None`` if it cannot be mapped (empty file, pipe, ...)."""
+    try:
+        return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        return None
+
+
+@contextmanager
+def workbook_buffer(source: ExcelSource) -> Iterator[memoryview]:
+    """
+    Expose the bytes of a workbook as one read-only ``memoryview``.
+
+    Paths and real files are memory-mapped, ``bytes``/``memoryview`` and
+    ``BytesIO`` buffers (e.g. Streamlit uploads) are used in place, and any
+    other file-like object is read once. The view is only valid inside the
+    ``with`` block.
+    """
+    mapped: mmap.mmap | None = None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+    elif isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            mapped = _map_file(f.fileno())
+            view = memoryview(mapped) if mapped is not None else memoryview(f.read())
+    elif isinstance(source, io.BytesIO):
+        view = source.getbuffer()
+    else:
+        try:
+            mapped = _map_file(source.fileno())
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            mapped = None
+        if mapped is not None:
+            view = memoryview(mapped)
+        else:
+            if source.seekable():
+                source.seek(0)
+            view = memoryview(source.read())
+    try:
+        yield view
+    finally:
+        view.release()
+        if mapped is not None:
+            try:
+                mapped.close()
+            except BufferError:  # a reader still holds a slice; the map goes away once it is collected
+                pass
+
+
+def _hash_sheet(
+    digest,
+    archive: zipfile.ZipFile,
+    sheet_part: str,
+    shared_strings: list[str],
+    formats: list[str],
+    limits: ReadLimits | None = None,
+) -> None:
+    """Feed each cell of a sheet into ``digest``: position, type, raw value and number format decide what is read.
+
+    With ``limits`` the extent of the values and the time are checked while streaming, as when the sheet is read.
+    """
+    row_counter = 0
+    # extent of the values hashed so far, checked against ``limits`` whenever it grows
+    last_row = last_column = 1
+    with archive.open(sheet_part) as source:
+        for _, element in iterparse(source):
+            tag = element.tag
+            if tag == f"{_MAIN_NS}row":
+                r_attr = element.get("r")
+                row_counter = int(float(r_attr)) if r_attr is not None else row_counter + 1
+                if limits is not None:
+                    limits.check_time()
+                col_counter = 0
+                for c in element.iterfind(f"{_MAIN_NS}c"):
+                    coordinate = c.get("r")
+                    col_counter = coordinate_to_tuple(coordinate)[1] if coordinate else col_counter + 1
+                    data_type = c.get("t", "n")
+                    style_id = int(c.get("s", 0))
+                    if data_type == "inlineStr":
+                        child = c.find(f"{_MAIN_NS}is")
+                        value = _text_content(child) if child is not None else ""
+                    else:
+                        value = c.findtext(f"{_MAIN_NS}v") or ""
+                        if data_type == "s" and value:
+                            value = shared_strings[int(value)]
+                    if limits is not None and value and (row_counter > last_row or col_counter > last_column):
+                        last_row, last_column = max(last_row, row_counter), max(last_column, col_counter)
+                        limits.check_extent(last_row, last_column)
+                    number_format = formats[style_id] if style_id < len(formats) else "General"
+                    digest.update(
+                        f"{row_counter}\x1f{col_counter}\x1f{data_type}\x1f{number_format}\x1f{value}\x1e".encode()
+                    )
+                element.clear()
+            elif tag == f"{_MAIN_NS}mergeCell":
+                digest.update(f"merge\x1f{element.get('ref')}\x1e".encode())
+                element.clear()
+
+
 # ------------------------------------------------------------------ #
 # public API                                                         #
 # ------------------------------------------------------------------ #
+def sheet_content_digest(
+    path: ExcelSource, sheet_names: Sequence[str], limits: ReadLimits | None = None
+) -> str | None:
+    """
+    Hash the content of some sheets without building their rows.
+
+    Cells are hashed with their raw value, shared strings resolved, and the
+    number format of their style, so two workbooks get the same digest
+    when ``read_excel_preserve_decimals`` reads the same rows from these
+    sheets, however differently Excel stored them. Returns ``None`` if a
+    sheet is missing or the archive is not readable natively. With
+    ``limits`` (see ``ReadLimits``) an oversized sheet, or hashing running
+    out of time, raises ``WorkbookLimitError`` as reading it would.
+    """
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        path = _BufferReader(path)
+    try:
+        archive = zipfile.ZipFile(path)
+    except (zipfile.BadZipFile, OSError):
+        return None
+    with archive:
+        try:
+            workbook, workbook_rels, sheets = _read_workbook_manifest(archive)
+            parts = {kind: target for kind, target in workbook_rels.values()}
+            shared_strings = _read_shared_strings(
+                archive, next((t for k, t in parts.items() if k.endswith("/sharedStrings")), None)
+            )
+            formats, _, _ = _read_cell_formats(
+                archive, next((t for k, t in parts.items() if k.endswith("/styles")), None)
+            )
+            properties = workbook.find(f"{_MAIN_NS}workbookPr")
+            date1904 = properties is not None and properties.get("date1904") in ("1", "true", "True")
+            by_name = dict(sheets)
+            digest = hashlib.sha256(f"date1904={date1904}\x1e".encode())
+            for sheet_name in sheet_names:
+                kind, sheet_part = by_name.get(sheet_name, ("", ""))
+                if not kind.endswith("/worksheet") or sheet_part not in archive.NameToInfo:
+                    return None
+                digest.update(f"sheet\x1f{sheet_name}\x1e".encode())
+                try:
+                    _hash_sheet(digest, archive, sheet_part, shared_strings, formats, limits)
+                except WorkbookLimitError as exc:
+                    raise WorkbookLimitError(f"Sheet '{sheet_name}': {exc}") from None
+        except WorkbookLimitError:
+            raise
+        except Exception:
+            return None
+    return digest.hexdigest()
+
+
+def read_sheet_names(path: ExcelSource) -> list[str]:
+    """
+    List the sheet names of a workbook in tab order, reading only the workbook manifest.
+
+    Falls back to openpyxl (read-only mode) for archives the native reader does not handle.
+    """
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        path = _BufferReader(path)
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return [name for name, _ in _read_workbook_manifest(archive)[2]]
+    except Exception:
+        if hasattr(path, "seek"):
+            path.seek(0)
+        wb = load_workbook(path, read_only=True)
+        try:
+            return wb.sheetnames
+        finally:
+            wb.close()
+
+
 def read_excel_preserve_decimals(
-    path: str | Path | IO[bytes],
+    path: ExcelSource,
     sheet_name: Any = 0,
     header: int | Sequence[int] | None = 0,
+    engine: str = "openpyxl",
+    nrows: int | None = None,
+    limits: ReadLimits | None = None,
     **pd_kwargs,
 ) -> pd.DataFrame:
     """
     Load an Excel sheet while preserving user-visible decimals **and**
     reproduce pandas’ header logic (Unnamed columns + de-duplication).
+
+    ``engine`` is one of ``EXCEL_ENGINES``; "native" falls back to openpyxl
+    for files it cannot read and returns the same DataFrame. ``path`` may
+    also be the workbook bytes (``bytes`` or ``memoryview``), read in place.
+    With ``nrows`` only the first data rows below the header are kept, as
+    in ``pandas.read_excel``; the native engine skips parsing the rest.
+    Like ``pandas.read_excel``, the sheet ends at its last value: trailing
+    rows and columns that are only formatted are not read.
+    With ``limits`` (see ``ReadLimits``) an oversized archive or sheet, or
+    a read running out of time, raises ``WorkbookLimitError`` early.
     """
-    wb = load_workbook(path, data_only=True)
-    ws = wb[sheet_name] if isinstance(sheet_name, str) else wb.worksheets[sheet_name]
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine '{engine}', expected one of {EXCEL_ENGINES}")
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        path = _BufferReader(path)
+    if limits is not None:
+        limits = limits.start()
+        check_archive(path, limits)
+
+    # 1 — read all rows (or the first ``nrows`` below the header), fixing numeric cells
+    max_row = None if nrows is None else (0 if header is None else header + 1) + nrows
+    try:
+        rows = _read_rows_native(path, sheet_name, max_row, limits) if engine == "native" else None
+        if rows is None:
+            rows = _read_rows_openpyxl(path, sheet_name, max_row, limits)
+    except WorkbookLimitError as exc:
+        raise WorkbookLimitError(f"Sheet '{sheet_name}': {exc}") from None
+
+    return frame_from_rows(rows, header, **pd_kwargs)
 
-    # 1 — read all rows, fixing numeric cells
-    rows: list[list[Any]] = [[_clean_cell(c) for c in row] for row in ws.iter_rows()]
 
+def frame_from_rows(rows: list[list[Any]], header: int | None = 0, **pd_kwargs) -> pd.DataFrame:
+    """
+    Build the DataFrame ``read_excel_preserve_decimals`` returns from the rows of a sheet.
+
+    Lets rows stored elsewhere, e.g. in a template bundle, come back exactly as if the sheet was read.
+    """
     # 2 — build DataFrame without headers first
     df = pd.DataFrame(rows, **pd_kwargs)
 
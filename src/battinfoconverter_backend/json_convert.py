@@ -1,63 +1,167 @@
 import datetime
+import re
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import IO
+from typing import TYPE_CHECKING
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
 from . import auxiliary as aux
+from . import bundles, rewrite
+from .cache import ConversionCache, workbook_digest
+from .excel_tools import ExcelSource, ReadLimits, check_archive, workbook_buffer
 from .excel_tools import read_excel_preserve_decimals as read_excel
-from .json_template import (
-    SNIPPTED_RATED_CAPACITY_NEGATIVE_ELECTRODE,
-    SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE,
-)
 from importlib.metadata import version
 
+if TYPE_CHECKING:  # skeletons builds on this module
+    from .skeletons import SkeletonCache
+    from .template_compiler import CompiledTemplate
+
 APP_VERSION = version("battinfoconverter-backend")
 
+# "sequential" walks every row from the document root, "trie" resolves shared ancestors once.
+BUILD_STRATEGIES = ("sequential", "trie")
+
+# Sheet names per data key: the current naming convention first, then the legacy one.
+SHEET_NAMES = {
+    "schema": ("@Schema", "Schema"),
+    "unit_map": ("@Units", "Ontology - Unit"),
+    "context_toplevel": ("@Context", "@context-TopLevel"),
+    "context_connector": ("@Predicates", "@context-Connector"),
+    "unique_id": ("@Classes", "Unique ID"),
+}
+
+# The value column of a single-cell schema sheet; multi-cell sheets repeat it as "Value.1", "Value.2", ...
+VALUE_COLUMN = "Value"
+VALUE_COLUMN_PATTERN = re.compile(r"^Value(\.\d+)?$")
+
+# Header fields every cell must fill in, and those of them that need a unique ID in the @Classes sheet.
+REQUIRED_FIELDS = (
+    "Cell type",
+    "Cell ID",
+    "Date of cell assembly",
+    "Institution/company",
+    "Scientist/technician/operator",
+)
+REQUIRED_ID_FIELDS = ("Institution/company", "Scientist/technician/operator")
+
+# Rows holding the schema version, the current label first, then the label of older coin cell templates.
+SCHEMA_VERSION_FIELDS = ("Schema version", "BattINFO CoinCellSchema version")
+
+# Pools that can parse the sheets concurrently, see `ExcelContainer.parallel`.
+PARALLEL_MODES = ("thread", "process")
+
+# One pool per mode, started on first use and shared by every container, so a conversion does not pay for
+# starting worker processes.
+_SHEET_POOLS: dict[str, Executor] = {}
+_SHEET_POOLS_LOCK = threading.Lock()
+
+
+def _sheet_pool(mode: str) -> Executor:
+    """The shared pool of ``mode`` (one of `PARALLEL_MODES`) that parses sheets, with one worker per sheet."""
+    with _SHEET_POOLS_LOCK:
+        pool = _SHEET_POOLS.get(mode)
+        if pool is None:
+            executor_cls = ThreadPoolExecutor if mode == "thread" else ProcessPoolExecutor
+            pool = _SHEET_POOLS[mode] = executor_cls(max_workers=len(SHEET_NAMES))
+        return pool
+
+
+def read_sheet(
+    excel_file: ExcelSource, sheet_names: tuple[str, str], engine: str = "openpyxl", limits: ReadLimits | None = None
+) -> DataFrame:
+    """
+    Reads a sheet under its current name, falling back to its legacy name.
+
+    Args:
+        excel_file (ExcelSource): The Excel file to read from, or its bytes.
+        sheet_names (tuple[str, str]): The current and the legacy name of the sheet, as in `SHEET_NAMES`.
+        engine (str): The Excel engine passed to `read_excel_preserve_decimals`. Default is "openpyxl".
+        limits (ReadLimits | None): Bounds on the cost of reading the sheet, see `excel_tools.ReadLimits`.
+            Default is None (unbounded).
+
+    Returns:
+        DataFrame: The sheet content with the displayed decimals preserved.
+
+    Raises:
+        KeyError: If the workbook has neither of the sheet names.
+        WorkbookLimitError: If reading the sheet exceeds ``limits``.
+    """
+    current_name, legacy_name = sheet_names
+    try:
+        return read_excel(excel_file, sheet_name=current_name, engine=engine, limits=limits)
+    except KeyError:
+        return read_excel(excel_file, sheet_name=legacy_name, engine=engine, limits=limits)
+
+
 @dataclass
 class ExcelContainer:
-    excel_file: str | Path | IO[bytes]
+    """
+    Holds the sheets of an Excel schema file needed for the JSON-LD conversion.
+
+    Attributes:
+        excel_file (ExcelSource): The Excel file to read: a path, a binary file-like object or the workbook bytes.
+            It is accessed once through `excel_tools.workbook_buffer` (memory-mapped or used in place, not copied).
+        engine (str): The Excel engine, one of `excel_tools.EXCEL_ENGINES`. Default is "openpyxl".
+        parallel (str | None): If set to one of `PARALLEL_MODES`, the file is read into memory once and the sheets
+            are parsed concurrently in a thread or process pool. The pool of each mode is started once and shared by
+            all containers; a process pool is worth it only with several cores, as each sheet gets a copy of the
+            file. This lowers the latency of a single conversion; leave it unset when many files are converted side
+            by side. Default is None (sheets are read one by one).
+        use_bundles (bool): Take the lookup sheets from the precompiled bundle of the template (see `bundles`) if one
+            matches them, and read only the schema sheet. Default is False.
+        limits (ReadLimits | None): Bounds on the archive size, the sheet sizes and the time spent reading, for
+            untrusted uploads; a breach raises `excel_tools.WorkbookLimitError` before the rest is read. The time
+            budget covers all sheets. Default is None (unbounded).
+        data (dict): The sheets as DataFrames, keyed like `SHEET_NAMES`.
+    """
+    excel_file: ExcelSource
+    engine: str = "openpyxl"
+    parallel: str | None = None
+    use_bundles: bool = False
+    limits: ReadLimits | None = None
     data: dict = field(init=False)
 
     def __post_init__(self):
-        # use the helper in place of pd.read_excel so decimal precision is kept
-        try:
-            schema = read_excel(self.excel_file, sheet_name="@Schema")
-        except KeyError:
-            schema = read_excel(self.excel_file, sheet_name="Schema")
-
-        try:
-            unit_map = read_excel(self.excel_file, sheet_name="@Units")
-        except KeyError:
-            unit_map = read_excel(self.excel_file, sheet_name="Ontology - Unit")
-
-        try:
-            context_toplevel = read_excel(self.excel_file, sheet_name="@Context")
-        except KeyError:
-            context_toplevel = read_excel(self.excel_file, sheet_name="@context-TopLevel")
+        if self.parallel is not None and self.parallel not in PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode '{self.parallel}', expected one of {PARALLEL_MODES} or None")
 
-        try:
-            context_connector = read_excel(self.excel_file, sheet_name="@Predicates")
-        except KeyError:
-            context_connector = read_excel(self.excel_file, sheet_name="@context-Connector")
-
-        try:
-            unique_id = read_excel(self.excel_file, sheet_name="@Classes")
-        except KeyError:
-            unique_id = read_excel(self.excel_file, sheet_name="Unique ID")
-
-        self.data = {
-            "schema": schema,
-            "unit_map": unit_map,
-            "context_toplevel": context_toplevel,
-            "context_connector": context_connector,
-            "unique_id": unique_id,
-        }
-        self._last_nodes: dict[tuple[str, ...], dict] = {}
+        # use the helper in place of pd.read_excel so decimal precision is kept
+        with workbook_buffer(self.excel_file) as buffer:
+            limits = self.limits.start() if self.limits is not None else None
+            if limits is not None:
+                check_archive(buffer, limits)
+            lookup_sheets = {key: names for key, names in SHEET_NAMES.items() if key != "schema"}
+            bundled = bundles.load_bundle(buffer, lookup_sheets, limits=limits) if self.use_bundles else None
+            to_read = SHEET_NAMES if bundled is None else {"schema": SHEET_NAMES["schema"]}
+            # with a bundle only the schema sheet is left, not worth a pool
+            if self.parallel is None or bundled is not None:
+                sheets = {key: read_sheet(buffer, names, self.engine, limits) for key, names in to_read.items()}
+            else:
+                # threads share the buffer, processes get one pickled copy each
+                content = buffer if self.parallel == "thread" else buffer.tobytes()
+                executor = _sheet_pool(self.parallel)
+                futures = {
+                    key: executor.submit(read_sheet, content, names, self.engine, limits)
+                    for key, names in SHEET_NAMES.items()
+                }
+                try:
+                    sheets = {key: future.result() for key, future in futures.items()}
+                except BrokenExecutor:
+                    # e.g. a worker process was killed; the next container starts a new pool
+                    with _SHEET_POOLS_LOCK:
+                        if _SHEET_POOLS.get(self.parallel) is executor:
+                            del _SHEET_POOLS[self.parallel]
+                    raise
+
+        self.data = {key: sheets[key] if key in sheets else bundled[key] for key in SHEET_NAMES}
+        self._last_nodes: dict[tuple[str, ...], aux.JsonLdNode] = {}
         self._path_counts: dict[tuple[str, ...], int] = {}
         self._connector_registry: dict[tuple[str, ...], list[dict]] = {}
+        self._structure_context: aux.StructureContext | None = None
 
 
 def get_information_value(df: DataFrame, row_to_look: str, col_to_look: str = "Value", col_to_match: str = "Metadata") -> str | None:
@@ -75,53 +179,41 @@ def get_information_value(df: DataFrame, row_to_look: str, col_to_look: str = "V
     """
     if row_to_look.endswith(' '):  # Check if the string ends with a space
         row_to_look = row_to_look.rstrip(' ')  # Remove only trailing spaces
-    result = df.query(f"{col_to_match} == @row_to_look")[col_to_look]
+    result = df.loc[df[col_to_match] == row_to_look, col_to_look]
     return result.iloc[0] if not result.empty else None
 
 
-def create_jsonld_with_conditions(data_container: ExcelContainer) -> dict:
+def create_jsonld_header(data_container: ExcelContainer, value_column: str = VALUE_COLUMN) -> dict:
     """
-    Creates a JSON-LD structure based on the provided data container containing schema and context information.
-
-    This function extracts necessary information from the schema and context sheets of the provided
-    `ExcelContainer` to generate a JSON-LD object. It performs validation on required fields, handles
-    ontology links, and structures data in compliance with the EMMO domain for battery context.
+    Creates the header of a cell's JSON-LD: context, cell type and ID, assembly date, operator, institution and comments.
 
     Args:
-        data_container (ExcelContainer): A datalcass container with data extracted from the input Excel schema required for generating JSON-LD,
-            including schema, context, and unique identifiers.
+        data_container (ExcelContainer): The container with the schema, context and unique ID sheets.
+        value_column (str): The schema column holding the values of the cell to convert. Default is "Value".
 
     Returns:
-        dict: A JSON-LD dictionary representing the structured information derived from the input data.
+        dict: The JSON-LD document before any ontologized schema row is added.
 
     Raises:
-        ValueError: If required fields are missing or have invalid data in the schema or unique ID sheets.
+        ValueError: If the value column, a required field, a unique ID or the schema version is missing.
     """
     schema = data_container.data['schema']
+    if value_column not in schema.columns:
+        raise ValueError(f"The schema sheet has no value column '{value_column}'")
     context_toplevel = data_container.data['context_toplevel']
 
-    #Harvest the information for the required section of the schemas
-    ls_info_to_harvest = [
-    "Cell type", 
-    "Cell ID", 
-    "Date of cell assembly", 
-    "Institution/company",
-    "Scientist/technician/operator" 
-    ]
-
     dict_harvested_info = {}
 
     #Harvest the required value from the schema sheet. 
-    for field in ls_info_to_harvest:
-        if get_information_value(df=schema, row_to_look=field) is np.nan:
+    for field in REQUIRED_FIELDS:
+        if get_information_value(df=schema, row_to_look=field, col_to_look=value_column) is np.nan:
             raise ValueError(f"Missing information in the schema, please fill in the field '{field}'")
         else:
-            dict_harvested_info[field] = get_information_value(df=schema, row_to_look=field)
+            dict_harvested_info[field] = get_information_value(df=schema, row_to_look=field, col_to_look=value_column)
 
     #Harvest unique ID value for the required value from the schema sheet.
-    ls_id_info_to_harvest = [ "Institution/company", "Scientist/technician/operator"]
     dict_harvest_id = {}
-    for id in ls_id_info_to_harvest:
+    for id in REQUIRED_ID_FIELDS:
         try:
             dict_harvest_id[id] = get_information_value(df=data_container.data['unique_id'],
                                                         row_to_look=dict_harvested_info[id],
@@ -134,12 +226,12 @@ def create_jsonld_with_conditions(data_container: ExcelContainer) -> dict:
 
     schema_version = None
     try:
-        schema_version = get_information_value(df=schema, row_to_look="Schema version")
+        schema_version = get_information_value(df=schema, row_to_look=SCHEMA_VERSION_FIELDS[0], col_to_look=value_column)
     except Exception:
         schema_version = None
     if schema_version is None or pd.isna(schema_version):
         schema_version = get_information_value(
-            df=schema, row_to_look="BattINFO CoinCellSchema version"
+            df=schema, row_to_look=SCHEMA_VERSION_FIELDS[1], col_to_look=value_column
         )
     if schema_version is None or pd.isna(schema_version):
         raise ValueError("Missing schema version in the schema sheet")
@@ -168,40 +260,136 @@ def create_jsonld_with_conditions(data_container: ExcelContainer) -> dict:
 
     jsonld["rdfs:comment"].append(f"BattINFO Converter version: {APP_VERSION}")
     jsonld["rdfs:comment"].append(f"Software credit: This JSON-LD was created using BattINFO converter (https://battinfoconverter.streamlit.app/) version: {APP_VERSION} and the schema version: {jsonld['schema:version']}, this web application was developed at Empa, Swiss Federal Laboratories for Materials Science and Technology in the Laboratory Materials for Energy Conversion")
+    return jsonld
+
+
+def compile_ontology_prefixes(ontology_prefixes: list[str]) -> list[tuple[str, ...]]:
+    """
+    Splits ontology link prefixes into the path segments they select, for `create_jsonld_with_conditions`.
+
+    Args:
+        ontology_prefixes (list[str]): Ontology link prefixes, e.g. "hasElectrolyte" or "hasPositiveElectrode-hasCoating".
+
+    Returns:
+        list[tuple[str, ...]]: The segments of each prefix.
+
+    Raises:
+        ValueError: If no prefix is given or a prefix has an empty segment.
+    """
+    if isinstance(ontology_prefixes, str):
+        ontology_prefixes = [ontology_prefixes]
+    compiled = [tuple(prefix.split('-')) for prefix in ontology_prefixes]
+    if not compiled or any('' in segments for segments in compiled):
+        raise ValueError(f"Expected ontology link prefixes like 'hasElectrolyte', got {ontology_prefixes!r}")
+    return compiled
+
+
+def _matches_prefixes(ontology_path: list[str], prefixes: list[tuple[str, ...]], candidates: set[str]) -> bool:
+    """Whether a row's path starts with a prefix; a segment matches as written or as its connector (hasSolventA -> hasSolvent)."""
+    for prefix in prefixes:
+        if len(prefix) <= len(ontology_path) and all(
+            wanted == segment or wanted == aux._split_multi_connector(segment, candidates)[0]
+            for wanted, segment in zip(prefix, ontology_path)
+        ):
+            return True
+    return False
+
+
+def create_jsonld_with_conditions(
+    data_container: ExcelContainer,
+    build_strategy: str = "sequential",
+    value_column: str = VALUE_COLUMN,
+    ontology_prefixes: list[str] | None = None,
+) -> dict:
+    """
+    Creates a JSON-LD structure based on the provided data container containing schema and context information.
+
+    This function extracts necessary information from the schema and context sheets of the provided
+    `ExcelContainer` to generate a JSON-LD object. It performs validation on required fields, handles
+    ontology links, and structures data in compliance with the EMMO domain for battery context.
+
+    Args:
+        data_container (ExcelContainer): A datalcass container with data extracted from the input Excel schema required for generating JSON-LD,
+            including schema, context, and unique identifiers.
+        build_strategy (str): How the schema rows are added, one of `BUILD_STRATEGIES`. "sequential" adds the rows one by one,
+            "trie" groups them into a prefix trie (see `auxiliary.add_rows_to_structure`). Both give the same JSON-LD. Default is "sequential".
+        value_column (str): The schema column holding the values of the cell to convert. Default is "Value".
+        ontology_prefixes (list[str] | None): Only add the rows whose ontology link starts with one of these prefixes,
+            compared segment by segment (e.g. "hasElectrolyte"); a segment also matches the suffixed forms of a
+            multi connector ("hasComponent" selects "hasComponentA", "hasComponentB", ...). The header is built as usual
+            and comment rows are left out. The selected branches come out as in the full document. Default is None
+            (all rows).
+
+    Returns:
+        dict: A JSON-LD dictionary representing the structured information derived from the input data.
+
+    Raises:
+        ValueError: If required fields are missing or have invalid data in the schema or unique ID sheets, or if the build strategy
+            or a prefix is invalid.
+    """
+    if build_strategy not in BUILD_STRATEGIES:
+        raise ValueError(f"Unknown build strategy '{build_strategy}', expected one of {BUILD_STRATEGIES}")
+    prefixes = compile_ontology_prefixes(ontology_prefixes) if ontology_prefixes is not None else None
+    if prefixes is not None:
+        candidates = aux._get_structure_context(data_container).multi_connector_candidates
+
+    schema = data_container.data['schema']
+    jsonld = create_jsonld_header(data_container, value_column=value_column)
+
+    # Build on compact nodes and materialise the plain JSON-LD dictionary once at the end.
+    root = aux.JsonLdNode.from_dict(jsonld)
+    comments = root.props["rdfs:comment"]
 
     data_container._last_nodes = {}
     data_container._path_counts = {}
     data_container._connector_registry = {}
+    rows_to_add = []
 
-    for _, row in schema.iterrows():
-        if pd.isna(row['Value']) or row['Ontology link'] == 'NotOntologize':
+    schema_rows = zip(schema['Metadata'], schema[value_column], schema['Unit'], schema['Ontology link'])
+    # the header is row 1 of the sheet, so the first schema row is Excel row 2
+    for row, (metadata, value, unit, ontology_link) in enumerate(schema_rows, start=2):
+        if pd.isna(value) or ontology_link == 'NotOntologize':
             continue
-        if row['Ontology link'] == 'Comment':
-            if row['Unit'] == 'No Unit':
-                jsonld["rdfs:comment"].append(f"{row['Metadata']}: {row['Value']}")
+        if ontology_link == 'Comment':
+            if prefixes is not None:
+                continue
+            if unit == 'No Unit':
+                comments.append(f"{metadata}: {value}")
             else:
-                jsonld["rdfs:comment"].append(f"{row['Metadata']}: {row['Value']} {row['Unit']}")
+                comments.append(f"{metadata}: {value} {unit}")
             continue
 
-        ontology_path = row['Ontology link'].split('-')
+        if not isinstance(ontology_link, str):
+            raise ValueError(
+                f"Row {row} ({metadata}): the value '{value}' has no ontology link, it is filled in the wrong row, "
+                "please check the schema"
+            )
+        ontology_path = ontology_link.split('-')
+        if prefixes is not None and not _matches_prefixes(ontology_path, prefixes, candidates):
+            continue
 
         # Default behavior for other entries
-        if pd.isna(row['Unit']):
+        if pd.isna(unit):
             raise ValueError(
-                f"The value '{row['Value']}' is filled in the wrong row, please check the schema"
+                f"The value '{value}' is filled in the wrong row, please check the schema"
             )
+        if build_strategy == "trie":
+            rows_to_add.append((ontology_path, value, unit, metadata))
+            continue
         aux.add_to_structure(
-            jsonld,
+            root,
             ontology_path,
-            row['Value'],
-            row['Unit'],
+            value,
+            unit,
             data_container,
-            metadata=row['Metadata'],
+            metadata=metadata,
         )
-    return jsonld
+    if rows_to_add:
+        aux.add_rows_to_structure(root, rows_to_add, data_container)
+    return root.to_dict()
 
 
-def assit_format_json_rated_capacity(json_dict: dict) -> dict:
+def assit_format_json_rated_capacity(json_dict: dict, applied_elsewhere: Iterable[str] = ()) -> dict:
     """
     Assit formating rated capacity part to follow the newly purposed structure.
 
@@ -213,62 +401,64 @@ def assit_format_json_rated_capacity(json_dict: dict) -> dict:
     the required field is input. 
     ** This version remians a beta version for this function. Further discussion on what to do / how to proceed when the user input different reference electrode  (yes,no) remians to be discussed. 
 
+    The rewrite itself is declared in `json_template.REWRITE_RULES` and applied by `rewrite.apply_rewrite_rules`, which
+    replaces the structure of the positive electrode, then the one of the negative electrode, each only if all of its
+    values are present and the negative one only if the positive one was replaced.
+
     Args:
         json_dict (dict): The JSON dictionary to format.
+        applied_elsewhere (Iterable[str]): Rewrite rules counted as applied when another rule requires them, for a
+            partial document, see `rules_applied_to_full_document`. Default is none.
 
     Returns:
         dict: The modified JSON dictionary with the rated capacity section formatted according to the new structure.
     """
-    try:
-        ##Positive electrode
-        #Extract the values
-        pos_1 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentCharging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        pos_2 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentCharging"]["hasInput"][2]["hasNumericalPart"]["hasNumberValue"]
-        pos_3 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantVoltageCharging"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"]
-        pos_4 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantVoltageCharging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        pos_5 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentDischarging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        pos_6 = json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentDischarging"]["hasInput"][2]["hasNumericalPart"]["hasNumberValue"]
-        
-        #Load the template with pre-defined place holder 
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"] = SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE
-        
-        #Re-assign the values
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = pos_1
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = pos_2
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = pos_3
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = pos_4
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasNext"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = pos_5
-        json_dict["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasNext"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = pos_6
-
-        ##Negative electrode
-        #Extract the values
-        neg_1 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentDischarging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        neg_2 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentDischarging"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"]
-        neg_3 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantVoltageCharging"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"]
-        neg_4 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantVoltageCharging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        neg_5 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentCharging"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"]
-        neg_6 = json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasInput"]["ConstantCurrentCharging"]["hasInput"][2]["hasNumericalPart"]["hasNumberValue"]
-
-
-        #Load the template with pre-defined place holder 
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"] = SNIPPTED_RATED_CAPACITY_NEGATIVE_ELECTRODE
-
-        #Re-assign the values
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = neg_1
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = neg_2
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = neg_3
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = neg_4
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasNext"]["hasInput"][0]["hasNumericalPart"]["hasNumberValue"] = neg_5
-        json_dict["hasNegativeElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["hasMeasurementParameter"]["hasTask"]["hasNext"]["hasNext"]["hasInput"][1]["hasNumericalPart"]["hasNumberValue"] = neg_6
-        
-        json_output = json_dict
-    #If the try claus failed (likely due to not all pre-defined values required for the formatting the rated capacity strcuture is given, simply return the original json_dict)
-    except: 
-        json_output = json_dict
-    return json_output
-
-
-def convert_excel_to_jsonld(excel_file: str | Path | IO[bytes], debug_mode:bool = True) -> dict:
+    return rewrite.apply_rewrite_rules(json_dict, applied_elsewhere=applied_elsewhere)
+
+
+def rules_applied_to_full_document(
+    data_container: ExcelContainer, ontology_prefixes: list[str], build_strategy: str = "sequential"
+) -> set[str]:
+    """
+    Tells which of the rewrite rules required by other rules apply to the full document of a partial conversion.
+
+    A rule of a selected branch may require one of a branch that is left out, or only partly selected; e.g. the
+    negative electrode is only rewritten together with the positive one. Such a required rule is decided on its
+    whole branch, built for the purpose, so the selected branches come out as in the full document.
+
+    Args:
+        data_container (ExcelContainer): The parsed workbook.
+        ontology_prefixes (list[str]): The ontology link prefixes of the partial conversion.
+        build_strategy (str): How the schema rows are added, one of `BUILD_STRATEGIES`. Default is "sequential".
+
+    Returns:
+        set[str]: The names of the required rules that apply to the full document; empty if the partial document
+            holds the whole branch of each of them.
+    """
+    rules = rewrite.DEFAULT_RULES
+    selected = set(compile_ontology_prefixes(ontology_prefixes))
+    branches = {rewrite.compile_path(rules.anchors[name])[0] for name in rules.required}
+    missing = sorted(branch for branch in branches if (branch,) not in selected)
+    if not missing:
+        return set()
+    whole_branches = create_jsonld_with_conditions(
+        data_container, build_strategy=build_strategy, ontology_prefixes=missing
+    )
+    return set(rules.apply(whole_branches)) & rules.required
+
+
+def convert_excel_to_jsonld(
+    excel_file: ExcelSource,
+    debug_mode: bool = True,
+    build_strategy: str = "sequential",
+    excel_engine: str = "openpyxl",
+    parallel_sheets: str | None = None,
+    cache: ConversionCache | None = None,
+    use_bundles: bool = False,
+    skeletons: "SkeletonCache | CompiledTemplate | None" = None,
+    ontology_prefixes: list[str] | None = None,
+    limits: ReadLimits | None = None,
+) -> dict:
     """
     Converts an Excel file into a JSON-LD representation.
 
@@ -277,22 +467,180 @@ def convert_excel_to_jsonld(excel_file: str | Path | IO[bytes], debug_mode:bool
     function to construct a structured section of the JSON-LD and incorporates it into the final output.
 
     Args:
-        excel_file (ExcelContainer): An instance of the `ExcelContainer` dataclass encapsulating the Excel file to be converted.
+        excel_file (ExcelSource): The Excel file to be converted: a path, a binary file-like object or the workbook bytes.
         debug_mode (bool): Flag to enable or disable debug mode. Default is True.
+        build_strategy (str): How the schema rows are added to the JSON-LD, one of `BUILD_STRATEGIES`. Default is "sequential".
+        excel_engine (str): The reader used for the sheets, one of `excel_tools.EXCEL_ENGINES`. "native" reads the sheets straight
+            from the xlsx archive and falls back to "openpyxl" for files it cannot handle. Default is "openpyxl".
+        parallel_sheets (str | None): Parse the sheets concurrently from one in-memory copy of the file, one of
+            `PARALLEL_MODES`. Default is None (sheets are read one by one).
+        cache (ConversionCache | None): A cache to look the result up in by the workbook's content, and to store it in
+            after a conversion. Default is None (always convert).
+        use_bundles (bool): Take the lookup sheets of an unmodified template from its precompiled bundle and read
+            only the schema sheet, see `ExcelContainer.use_bundles`. Default is False.
+        skeletons (SkeletonCache | CompiledTemplate | None): Fill the values into a prebuilt document of the template
+            when the workbook matches one, see `skeletons.SkeletonCache`, or build it with a compiled template, see
+            `template_compiler.CompiledTemplate`. Default is None (always use the full builder).
+        ontology_prefixes (list[str] | None): Convert only the branches whose ontology link starts with one of these
+            prefixes, e.g. ["hasElectrolyte"], plus the header (see `create_jsonld_with_conditions`). Such a partial
+            document is neither looked up in nor stored in ``cache``, and ``skeletons`` is not used. Default is None
+            (the whole document).
+        limits (ReadLimits | None): Bounds on the cost of reading an untrusted workbook, see `ExcelContainer.limits`.
+            Default is None (unbounded).
 
     Returns:
         dict: A JSON-LD dictionary representing the entire structured information derived from the Excel file.
 
     Raises:
         ValueError: If any required fields in the Excel file are missing or contain invalid data.
+        WorkbookLimitError: If reading the workbook exceeds ``limits`` (a `ValueError` too).
     """
     if debug_mode:
         print('*********************************************************')
         print(f"Initialize new session of Excel file conversion, started at {datetime.datetime.now()}")
         print('*********************************************************')
-    data_container = ExcelContainer(excel_file) 
+    if cache is not None and ontology_prefixes is None:
+        with workbook_buffer(excel_file) as buffer:
+            digest = workbook_digest(buffer)
+            jsonld_output = cache.get(digest, VALUE_COLUMN)
+            if jsonld_output is None:
+                jsonld_output = convert_excel_to_jsonld(
+                    buffer, debug_mode=False, build_strategy=build_strategy,
+                    excel_engine=excel_engine, parallel_sheets=parallel_sheets, use_bundles=use_bundles,
+                    skeletons=skeletons, limits=limits,
+                )
+                cache.put(digest, VALUE_COLUMN, jsonld_output)
+            elif debug_mode:
+                print(f"Reusing the cached conversion of workbook {digest}")
+        return jsonld_output
+
+    data_container = ExcelContainer(
+        excel_file, engine=excel_engine, parallel=parallel_sheets, use_bundles=use_bundles, limits=limits
+    )
 
     # Generate JSON-LD using the data container
-    jsonld_output = create_jsonld_with_conditions(data_container)
-    jsonld_output = assit_format_json_rated_capacity(jsonld_output) # Simply comment this line out if assit_format is not prefereed. 
+    applied_elsewhere: set[str] = set()
+    if ontology_prefixes is not None:
+        jsonld_output = create_jsonld_with_conditions(
+            data_container, build_strategy=build_strategy, ontology_prefixes=ontology_prefixes
+        )
+        applied_elsewhere = rules_applied_to_full_document(data_container, ontology_prefixes, build_strategy)
+    elif skeletons is not None:
+        jsonld_output = skeletons.create_jsonld(data_container, build_strategy=build_strategy)
+    else:
+        jsonld_output = create_jsonld_with_conditions(data_container, build_strategy=build_strategy)
+    jsonld_output = assit_format_json_rated_capacity(jsonld_output, applied_elsewhere) # Simply comment this line out if assit_format is not prefereed. 
     return jsonld_output
+
+
+def find_value_columns(schema: DataFrame) -> list[str]:
+    """
+    Lists the value columns of a schema sheet, one per cell.
+
+    Args:
+        schema (DataFrame): The schema sheet, e.g. `ExcelContainer.data["schema"]`.
+
+    Returns:
+        list[str]: The columns "Value", "Value.1", ... in sheet order.
+    """
+    return [column for column in schema.columns if VALUE_COLUMN_PATTERN.match(str(column))]
+
+
+def convert_excel_columns_to_jsonld(
+    excel_file: ExcelSource,
+    value_columns: list[str] | None = None,
+    debug_mode: bool = True,
+    build_strategy: str = "sequential",
+    excel_engine: str = "openpyxl",
+    parallel_sheets: str | None = None,
+    cache: ConversionCache | None = None,
+    skeletons: "SkeletonCache | None" = None,
+) -> Iterator[tuple[str, dict]]:
+    """
+    Converts a multi-cell Excel file, where every value column of the schema sheet describes one cell.
+
+    The workbook is loaded once, and all columns share the `Ontology link` and `Unit` columns and the unit and
+    connector lookups built from them (`auxiliary.StructureContext`); only the values differ between the documents.
+
+    Args:
+        excel_file (ExcelSource): The Excel file to be converted: a path, a binary file-like object or the workbook bytes.
+        value_columns (list[str] | None): The schema columns to convert, e.g. per-cell-ID columns.
+            Default is None (every "Value", "Value.1", ... column, see `find_value_columns`).
+        debug_mode (bool): Flag to enable or disable debug mode. Default is True.
+        build_strategy (str): How the schema rows are added to the JSON-LD, one of `BUILD_STRATEGIES`. Default is "sequential".
+        excel_engine (str): The reader used for the sheets, one of `excel_tools.EXCEL_ENGINES`. Default is "openpyxl".
+        parallel_sheets (str | None): Parse the sheets concurrently, one of `PARALLEL_MODES`. Default is None.
+        cache (ConversionCache | None): A cache of the documents by workbook content and column. The workbook is only
+            loaded if one of the columns is not cached. Default is None (always convert).
+        skeletons (SkeletonCache | None): Fill the values of each column into a prebuilt document of the template,
+            see `skeletons.SkeletonCache`. Default is None (always use the full builder).
+
+    Yields:
+        tuple[str, dict]: The value column and the JSON-LD of its cell, in column order.
+
+    Raises:
+        ValueError: If a column is missing from the schema sheet, or a cell misses required fields
+            (the message names the column).
+    """
+    if debug_mode:
+        print('*********************************************************')
+        print(f"Initialize new session of multi-cell Excel file conversion, started at {datetime.datetime.now()}")
+        print('*********************************************************')
+    if cache is not None:
+        yield from _convert_columns_cached(
+            excel_file, value_columns, cache, debug_mode,
+            build_strategy=build_strategy, excel_engine=excel_engine, parallel_sheets=parallel_sheets,
+            skeletons=skeletons,
+        )
+        return
+
+    data_container = ExcelContainer(excel_file, engine=excel_engine, parallel=parallel_sheets)
+    schema = data_container.data["schema"]
+    if value_columns is None:
+        value_columns = find_value_columns(schema)
+    missing = [column for column in value_columns if column not in schema.columns]
+    if missing:
+        raise ValueError(f"The schema sheet has no value column(s) {missing}")
+
+    for column in value_columns:
+        try:
+            if skeletons is not None:
+                jsonld_output = skeletons.create_jsonld(data_container, build_strategy=build_strategy, value_column=column)
+            else:
+                jsonld_output = create_jsonld_with_conditions(
+                    data_container, build_strategy=build_strategy, value_column=column
+                )
+        except ValueError as exc:
+            raise ValueError(f"Value column '{column}': {exc}") from exc
+        yield column, assit_format_json_rated_capacity(jsonld_output)
+
+
+# Cache entry holding the value columns of a multi-cell workbook, so a fully cached workbook needs no load.
+_CACHED_COLUMNS = "@value-columns"
+
+
+def _convert_columns_cached(
+    excel_file: ExcelSource,
+    value_columns: list[str] | None,
+    cache: ConversionCache,
+    debug_mode: bool,
+    **options,
+) -> Iterator[tuple[str, dict]]:
+    """`convert_excel_columns_to_jsonld` through ``cache``, converting only if a column is missing from it."""
+    with workbook_buffer(excel_file) as buffer:
+        digest = workbook_digest(buffer)
+        columns = value_columns if value_columns is not None else cache.get(digest, _CACHED_COLUMNS)
+        cached = [cache.get(digest, column) for column in columns] if columns is not None else [None]
+        if all(jsonld_output is not None for jsonld_output in cached):
+            if debug_mode:
+                print(f"Reusing the cached conversions of workbook {digest}")
+            yield from zip(columns, cached)
+            return
+
+        converted = []
+        for column, jsonld_output in convert_excel_columns_to_jsonld(buffer, value_columns, debug_mode=False, **options):
+            cache.put(digest, column, jsonld_output)
+            converted.append(column)
+            yield column, jsonld_output
+        if value_columns is None:
+            cache.put(digest, _CACHED_COLUMNS, converted)
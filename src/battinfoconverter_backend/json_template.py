@@ -184,3 +184,52 @@ SNIPPTED_RATED_CAPACITY_NEGATIVE_ELECTRODE = {
     }
 }
 
+
+# Path-rewrite rules applied to every converted document by `rewrite.apply_rewrite_rules`.
+# A rule replaces the value at "at" by a copy of "template" and moves the values of "moves" from their path in
+# the replaced value (key) to their path in the template (value). It only applies if every source path exists and,
+# if it "requires" an earlier rule, that rule applied to the same document.
+# Paths are keys separated by "." with list positions in brackets, e.g. "hasInput[1].hasNumberValue".
+RATED_CAPACITY_POSITIVE_ELECTRODE_RULE = {
+    "name": "rated capacity of the positive electrode",
+    "at": "hasPositiveElectrode.hasMeasuredProperty[0].@reverse.hasOutput",
+    "template": SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE,
+    "moves": {
+        "hasInput.ConstantCurrentCharging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentCharging.hasInput[2].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasInput[1].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantVoltageCharging.hasInput[0].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantVoltageCharging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasInput[1].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentDischarging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasNext.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentDischarging.hasInput[2].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasNext.hasInput[1].hasNumericalPart.hasNumberValue",
+    },
+}
+
+RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE = {
+    "name": "rated capacity of the negative electrode",
+    "at": "hasNegativeElectrode.hasMeasuredProperty[0].@reverse.hasOutput",
+    "template": SNIPPTED_RATED_CAPACITY_NEGATIVE_ELECTRODE,
+    # both electrodes or only the positive one get the recommended structure, never only the negative one
+    "requires": RATED_CAPACITY_POSITIVE_ELECTRODE_RULE["name"],
+    "moves": {
+        "hasInput.ConstantCurrentDischarging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentDischarging.hasInput[0].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasInput[1].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantVoltageCharging.hasInput[0].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantVoltageCharging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasInput[1].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentCharging.hasInput[1].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasNext.hasInput[0].hasNumericalPart.hasNumberValue",
+        "hasInput.ConstantCurrentCharging.hasInput[2].hasNumericalPart.hasNumberValue":
+            "hasMeasurementParameter.hasTask.hasNext.hasNext.hasInput[1].hasNumericalPart.hasNumberValue",
+    },
+}
+
+REWRITE_RULES = (RATED_CAPACITY_POSITIVE_ELECTRODE_RULE, RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE)
@@ -0,0 +1,195 @@
+"""
+output_formats.py
+Encoders and matching readers for the converted JSON-LD.
+
+"json" is the pretty-printed output the app has always produced. The other
+encodings trade readability for size: "json-min" drops the whitespace,
+"json-gzip"/"json-zstd" compress the minified text, and "cbor"/"msgpack"
+are binary encodings that also avoid repeating the key quoting. Every
+encoding round-trips ``Decimal`` values exactly.
+
+gzip is in the standard library; zstd, CBOR and MessagePack need the
+optional packages ``zstandard``, ``cbor2`` and ``msgpack``
+(``pip install battinfoconverter-backend[formats]``).
+"""
+
+import gzip
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import simplejson as json
+
+OUTPUT_ENCODINGS = ("json", "json-min", "json-gzip", "json-zstd", "cbor", "msgpack")
+
+ENCODING_EXTENSIONS = {
+    "json": ".json",
+    "json-min": ".min.json",
+    "json-gzip": ".json.gz",
+    "json-zstd": ".json.zst",
+    "cbor": ".cbor",
+    "msgpack": ".msgpack",
+}
+
+ENCODING_MIME_TYPES = {
+    "json": "application/json",
+    "json-min": "application/json",
+    "json-gzip": "application/gzip",
+    "json-zstd": "application/zstd",
+    "cbor": "application/cbor",
+    "msgpack": "application/vnd.msgpack",
+}
+
+# MessagePack has no decimal type, so Decimals travel as their text in this extension type.
+MSGPACK_DECIMAL_EXT = 1
+
+
+# ------------------------------------------------------------------ #
+# optional dependencies                                              #
+# ------------------------------------------------------------------ #
+def _require(module: str, encoding: str):
+    """Import an optional encoder package or explain how to install it."""
+    try:
+        return __import__(module)
+    except ImportError as exc:
+        raise ImportError(
+            f"The '{encoding}' encoding needs the '{module}' package: "
+            "pip install battinfoconverter-backend[formats]"
+        ) from exc
+
+
+def _zstd_compress(data: bytes) -> bytes:
+    return _require("zstandard", "json-zstd").ZstdCompressor().compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    # stream-decode so frames without a stored content size (e.g. from the zstd CLI) work as well
+    return _require("zstandard", "json-zstd").ZstdDecompressor().decompressobj().decompress(data)
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        msgpack = _require("msgpack", "msgpack")
+        return msgpack.ExtType(MSGPACK_DECIMAL_EXT, str(value).encode("ascii"))
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == MSGPACK_DECIMAL_EXT:
+        return Decimal(data.decode("ascii"))
+    return _require("msgpack", "msgpack").ExtType(code, data)
+
+
+# ------------------------------------------------------------------ #
+# public API                                                         #
+# ------------------------------------------------------------------ #
+def _check_encoding(encoding: str) -> None:
+    if encoding not in OUTPUT_ENCODINGS:
+        raise ValueError(f"Unknown output encoding '{encoding}', expected one of {OUTPUT_ENCODINGS}")
+
+
+def encode_jsonld(jsonld: dict, encoding: str = "json") -> bytes:
+    """
+    Serialises a JSON-LD document.
+
+    Args:
+        jsonld (dict): The JSON-LD document, e.g. the result of `convert_excel_to_jsonld`.
+        encoding (str): One of `OUTPUT_ENCODINGS`. Default is "json" (UTF-8 text indented by 4 spaces).
+
+    Returns:
+        bytes: The encoded document.
+
+    Raises:
+        ValueError: If the encoding is unknown.
+        ImportError: If the encoding needs an optional package that is not installed.
+    """
+    _check_encoding(encoding)
+    if encoding == "json":
+        return json.dumps(jsonld, indent=4, use_decimal=True).encode("utf-8")
+    if encoding == "cbor":
+        return _require("cbor2", encoding).dumps(jsonld)
+    if encoding == "msgpack":
+        return _require("msgpack", encoding).packb(jsonld, default=_msgpack_default, use_bin_type=True)
+
+    minified = json.dumps(jsonld, separators=(",", ":"), ensure_ascii=False, use_decimal=True).encode("utf-8")
+    if encoding == "json-gzip":
+        # a fixed mtime keeps the output identical for identical documents
+        return gzip.compress(minified, mtime=0)
+    if encoding == "json-zstd":
+        return _zstd_compress(minified)
+    return minified
+
+
+def decode_jsonld(data: bytes, encoding: str = "json") -> dict:
+    """
+    Reads a JSON-LD document written by `encode_jsonld`.
+
+    Numbers with a fractional part come back as ``Decimal`` for the JSON encodings, so no digits are lost.
+
+    Args:
+        data (bytes): The encoded document.
+        encoding (str): The encoding it was written with, one of `OUTPUT_ENCODINGS`. Default is "json".
+
+    Returns:
+        dict: The JSON-LD document.
+
+    Raises:
+        ValueError: If the encoding is unknown.
+        ImportError: If the encoding needs an optional package that is not installed.
+    """
+    _check_encoding(encoding)
+    if encoding == "cbor":
+        return _require("cbor2", encoding).loads(data)
+    if encoding == "msgpack":
+        return _require("msgpack", encoding).unpackb(data, ext_hook=_msgpack_ext_hook, raw=False)
+    if encoding == "json-gzip":
+        data = gzip.decompress(data)
+    elif encoding == "json-zstd":
+        data = _zstd_decompress(data)
+    return json.loads(data.decode("utf-8"), use_decimal=True)
+
+
+def encoding_from_path(path: str | Path) -> str:
+    """
+    Infers the encoding from a file name, matching the longest known extension.
+
+    Raises:
+        ValueError: If the file name does not end with one of `ENCODING_EXTENSIONS`.
+    """
+    name = Path(path).name.lower()
+    matches = [enc for enc, ext in ENCODING_EXTENSIONS.items() if name.endswith(ext)]
+    if not matches:
+        raise ValueError(f"Cannot infer the output encoding of '{path}', pass one of {OUTPUT_ENCODINGS}")
+    return max(matches, key=lambda enc: len(ENCODING_EXTENSIONS[enc]))
+
+
+def write_jsonld(jsonld: dict, path: str | Path, encoding: str | None = None) -> Path:
+    """
+    Writes a JSON-LD document to a file.
+
+    Args:
+        jsonld (dict): The JSON-LD document.
+        path (str | Path): The target file.
+        encoding (str | None): One of `OUTPUT_ENCODINGS`. Default is None (inferred from the file extension).
+
+    Returns:
+        Path: The written file.
+    """
+    path = Path(path)
+    path.write_bytes(encode_jsonld(jsonld, encoding or encoding_from_path(path)))
+    return path
+
+
+def read_jsonld(path: str | Path, encoding: str | None = None) -> dict:
+    """
+    Reads a JSON-LD document written by `write_jsonld`.
+
+    Args:
+        path (str | Path): The file to read.
+        encoding (str | None): One of `OUTPUT_ENCODINGS`. Default is None (inferred from the file extension).
+
+    Returns:
+        dict: The JSON-LD document.
+    """
+    path = Path(path)
+    return decode_jsonld(path.read_bytes(), encoding or encoding_from_path(path))
@@ -0,0 +1,439 @@
+"""
+rdf_export.py
+Streams a converted JSON-LD document as N-Triples or N-Quads.
+
+The statements are written straight from the converter's output structure,
+so no JSON-LD expansion (and no RDF library) is needed on the way into a
+triple store. Terms are resolved with the document's ``@context``: the
+prefixes of the ``@Context`` sheet plus the remote contexts it references,
+which are read from copies committed with the package (see
+`BUNDLED_CONTEXTS`) instead of being fetched. A copy is only replaced on
+purpose, with ``battinfoconverter-contexts
+src/battinfoconverter_backend/contexts --refresh``, which records its source
+URL, retrieval date and SHA-256 in ``contexts/sources.json``; the copy is
+checked against that record when it is read.
+
+Blank nodes are labelled in document order (``_:b0``, ``_:b1``, ...), so the
+same workbook always gives the same output.
+
+Only the parts of the JSON-LD context processing the converter emits are
+supported: term, prefix and ``@vocab`` mappings, keyword aliases, ``@reverse``
+and ``@type`` coercion. Scoped contexts, ``@list`` containers and language
+maps are not.
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import re
+import urllib.request
+from collections.abc import Iterator
+from decimal import Decimal
+from pathlib import Path
+from typing import IO, Any
+
+RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+# Remote contexts that are resolved from a committed copy, keyed by the IRI used in the documents.
+BUNDLED_CONTEXTS = {
+    "https://w3id.org/emmo/domain/battery/context": "battery_context.json",
+}
+CONTEXT_DIR = Path(__file__).resolve().parent / "contexts"
+# Per copy: the IRI, the URL it was downloaded from, the retrieval date and its SHA-256.
+SOURCES_FILE_NAME = "sources.json"
+
+_GEN_DELIMS = (":", "/", "?", "#", "[", "]", "@")
+_ABSOLUTE_IRI = re.compile(r"^[A-Za-z][A-Za-z0-9+.\-]*:")
+_IRI_UNSAFE = re.compile(r'[\x00-\x20<>"{}|^`\\]')
+_LITERAL_ESCAPES = {"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r"}
+
+
+# ------------------------------------------------------------------ #
+# bundled remote contexts                                            #
+# ------------------------------------------------------------------ #
+def load_bundled_context(iri: str) -> dict | list:
+    """
+    Reads the committed copy of a remote context, checked against its record in ``contexts/sources.json``.
+
+    Args:
+        iri (str): The context IRI, one of the keys of `BUNDLED_CONTEXTS`.
+
+    Returns:
+        dict | list: The value of the ``@context`` key of the context document.
+
+    Raises:
+        KeyError: If the IRI has no bundled copy.
+        FileNotFoundError: If the copy is not in the package.
+        ValueError: If the copy has no record or differs from it.
+    """
+    if iri not in BUNDLED_CONTEXTS:
+        raise KeyError(f"No bundled copy of the remote context '{iri}', pass it with `contexts=`")
+    file_name = BUNDLED_CONTEXTS[iri]
+    path = CONTEXT_DIR / file_name
+    if not path.is_file():
+        raise FileNotFoundError(
+            f"The bundled copy of '{iri}' is missing at {path}; pass the context with `contexts=`, or add the copy "
+            f"with `battinfoconverter-contexts src/battinfoconverter_backend/contexts` and commit it"
+        )
+    content = path.read_bytes()
+    source = _read_sources(CONTEXT_DIR).get(file_name)
+    if source is None or source["sha256"] != hashlib.sha256(content).hexdigest():
+        raise ValueError(
+            f"The bundled copy of '{iri}' at {path} does not match its record in {SOURCES_FILE_NAME}; "
+            f"refresh it with `battinfoconverter-contexts src/battinfoconverter_backend/contexts --refresh`"
+        )
+    return json.loads(content)["@context"]
+
+
+def _read_sources(directory: Path) -> dict[str, dict]:
+    path = directory / SOURCES_FILE_NAME
+    if not path.is_file():
+        return {}
+    with path.open(encoding="utf-8") as sources_file:
+        return json.load(sources_file)
+
+
+def download_contexts(target: Path, refresh: bool = False, timeout: float = 30) -> list[Path]:
+    """
+    Downloads the contexts of `BUNDLED_CONTEXTS` into a folder and records their source in ``sources.json``.
+
+    Run by a maintainer on the source tree, the copies and the record are then committed; the package is built from
+    them and never downloads a context itself (see `main`).
+
+    Args:
+        target (Path): The folder to write to, normally ``src/battinfoconverter_backend/contexts``.
+        refresh (bool): Download the contexts that are there already too. Default is False (only missing ones).
+        timeout (float): The timeout of each download, in seconds. Default is 30.
+
+    Returns:
+        list[Path]: The written copies.
+
+    Raises:
+        ValueError: If an IRI does not return a JSON-LD context document.
+    """
+    target.mkdir(parents=True, exist_ok=True)
+    sources = _read_sources(target)
+    written = []
+    for iri, file_name in BUNDLED_CONTEXTS.items():
+        path = target / file_name
+        if path.is_file() and not refresh:
+            continue
+        request = urllib.request.Request(iri, headers={"Accept": "application/ld+json, application/json"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            document = json.load(response)
+            url = response.geturl()
+        if "@context" not in document:
+            raise ValueError(f"'{iri}' did not return a JSON-LD context document")
+        content = (json.dumps(document, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+        path.write_bytes(content)
+        sources[file_name] = {
+            "iri": iri,
+            "url": url,
+            "retrieved": datetime.date.today().isoformat(),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+        written.append(path)
+    if written:
+        record = json.dumps(sources, indent=2, sort_keys=True) + "\n"
+        (target / SOURCES_FILE_NAME).write_text(record, encoding="utf-8")
+    return written
+
+
+# ------------------------------------------------------------------ #
+# context processing                                                 #
+# ------------------------------------------------------------------ #
+class _ActiveContext:
+    """Term definitions of a processed ``@context``, with lazily expanded IRIs."""
+
+    def __init__(self, context: Any, contexts: dict[str, Any] | None = None) -> None:
+        self.raw: dict[str, Any] = {}
+        self.vocab: str | None = None
+        self._contexts = contexts or {}
+        self._resolved: dict[str, dict | None] = {}
+        self._process(context, set())
+
+    def _process(self, context: Any, seen: set[str]) -> None:
+        for item in context if isinstance(context, list) else [context]:
+            if item is None:
+                self.raw, self.vocab = {}, None
+            elif isinstance(item, str):
+                if item in seen:
+                    raise ValueError(f"Recursive context inclusion of '{item}'")
+                remote = self._contexts[item] if item in self._contexts else load_bundled_context(item)
+                self._process(remote, seen | {item})
+            elif isinstance(item, dict):
+                for key, value in item.items():
+                    if key == "@vocab":
+                        self.vocab = None if value is None else self._expand(value, vocab=True)
+                    elif not key.startswith("@"):
+                        self.raw[key] = value
+            else:
+                raise ValueError(f"Invalid @context entry: {item!r}")
+        self._resolved.clear()
+
+    def term(self, key: str) -> dict | None:
+        """The resolved definition of ``key`` (``iri``, ``type``, ``reverse``, ``prefix``), or None."""
+        if key not in self._resolved:
+            self._resolved[key] = None  # guards against cyclic definitions
+            self._resolved[key] = self._define(key)
+        return self._resolved[key]
+
+    def _define(self, key: str) -> dict | None:
+        if key not in self.raw or self.raw[key] is None:
+            return None
+        raw = self.raw[key]
+        simple = isinstance(raw, str)
+        if simple:
+            raw = {"@id": raw}
+        reverse = "@reverse" in raw
+        iri = raw.get("@reverse" if reverse else "@id", key)
+        if iri is None:
+            return None
+        if not iri.startswith("@"):
+            iri = self._expand(iri, vocab=True, skip_term=key)
+            if iri is None:
+                return None
+        prefix = raw.get("@prefix", simple and ":" not in key and "/" not in key and iri.endswith(_GEN_DELIMS))
+        coercion = raw.get("@type")
+        if coercion is not None and coercion not in ("@id", "@vocab"):
+            coercion = self._expand(coercion, vocab=True)
+        return {"iri": iri, "type": coercion, "reverse": reverse, "prefix": prefix}
+
+    def _expand(self, value: str, vocab: bool, skip_term: str | None = None) -> str | None:
+        """JSON-LD IRI expansion; returns None for a term that cannot be resolved."""
+        if value.startswith("@") or value.startswith("_:"):
+            return value
+        if vocab and value != skip_term and (definition := self.term(value)) is not None:
+            return definition["iri"]
+        if ":" in value:
+            prefix, suffix = value.split(":", 1)
+            if suffix.startswith("//"):
+                return value
+            if prefix != skip_term and (definition := self.term(prefix)) is not None and definition["prefix"]:
+                return definition["iri"] + suffix
+            if _ABSOLUTE_IRI.match(value):
+                return value
+        if vocab and self.vocab is not None:
+            return self.vocab + value
+        return None
+
+    def expand_iri(self, value: str, vocab: bool) -> str:
+        """Expand an IRI or raise a ``ValueError`` naming the term that is not defined."""
+        iri = self._expand(value, vocab=vocab)
+        if iri is None:
+            raise ValueError(f"'{value}' is not defined in the JSON-LD context and is not an absolute IRI")
+        return iri
+
+
+# ------------------------------------------------------------------ #
+# N-Triples terms                                                    #
+# ------------------------------------------------------------------ #
+def _iri(iri: str) -> str:
+    if iri.startswith("_:"):
+        return iri
+    return "<" + _IRI_UNSAFE.sub(lambda m: "%{:02X}".format(ord(m.group())), iri) + ">"
+
+
+def _literal(lexical: str, datatype: str | None = None) -> str:
+    text = '"' + "".join(_LITERAL_ESCAPES.get(ch, ch) for ch in lexical) + '"'
+    if datatype is not None and datatype != XSD + "string":
+        text += "^^" + _iri(datatype)
+    return text
+
+
+def _canonical_double(value: float | Decimal) -> str:
+    """The canonical ``xsd:double`` form JSON-LD uses for numbers with a fraction (e.g. ``6.6E0``)."""
+    value = Decimal(repr(value)) if isinstance(value, float) else value
+    if not value.is_finite():
+        return "NaN" if value.is_nan() else ("-INF" if value < 0 else "INF")
+    sign, digits, exponent = value.normalize().as_tuple()
+    digits = "".join(map(str, digits)) or "0"
+    mantissa = digits[0] + "." + (digits[1:] or "0")
+    return ("-" if sign else "") + mantissa + "E" + str(exponent + len(digits) - 1 if digits != "0" else 0)
+
+
+def _native_literal(value: Any, datatype: str | None) -> str:
+    """A JSON value as a literal, typed like JSON-LD's RDF conversion does."""
+    if isinstance(value, bool):
+        return _literal(str(value).lower(), datatype or XSD + "boolean")
+    if isinstance(value, (int, float, Decimal)):
+        # numbers without a fractional part are integers, unless huge or coerced to xsd:double
+        integral = not isinstance(value, (float, Decimal)) or (
+            (value.is_integer() if isinstance(value, float) else value.is_finite() and value == value.to_integral_value())
+        )
+        if integral and abs(value) < 10**21 and datatype != XSD + "double":
+            return _literal(str(int(value)), datatype or XSD + "integer")
+        return _literal(_canonical_double(value), datatype or XSD + "double")
+    return _literal(str(value), datatype)
+
+
+# ------------------------------------------------------------------ #
+# public API                                                         #
+# ------------------------------------------------------------------ #
+class _StatementWriter:
+    """Walks a JSON-LD document and yields its statements in document order."""
+
+    def __init__(self, active: _ActiveContext, graph: str | None, blank_node_prefix: str) -> None:
+        self.active = active
+        self.graph = None if graph is None else _iri(active.expand_iri(graph, vocab=False))
+        self.blank_node_prefix = blank_node_prefix
+        self.blank_nodes = 0
+        self.aliases = {
+            key: definition["iri"]
+            for key in active.raw
+            if (definition := active.term(key)) is not None and definition["iri"].startswith("@")
+        }
+
+    def statement(self, subject: str, predicate: str, obj: str) -> str:
+        if self.graph is None:
+            return f"{subject} {predicate} {obj} .\n"
+        return f"{subject} {predicate} {obj} {self.graph} .\n"
+
+    def keyword(self, key: str) -> str:
+        return self.aliases.get(key, key)
+
+    def subject_of(self, node: dict) -> str:
+        for key, value in node.items():
+            if self.keyword(key) == "@id":
+                return _iri(self.active.expand_iri(value, vocab=False))
+        label = f"_:{self.blank_node_prefix}{self.blank_nodes}"
+        self.blank_nodes += 1
+        return label
+
+    def node(self, node: dict, subject: str) -> Iterator[str]:
+        for key, value in node.items():
+            keyword = self.keyword(key)
+            if keyword in ("@context", "@id"):
+                continue
+            if keyword == "@type":
+                for type_name in value if isinstance(value, list) else [value]:
+                    yield self.statement(subject, _iri(RDF_TYPE), _iri(self.active.expand_iri(type_name, vocab=True)))
+            elif keyword == "@reverse":
+                for reverse_key, reverse_value in value.items():
+                    yield from self.property(subject, reverse_key, reverse_value, reverse=True)
+            elif keyword.startswith("@"):
+                raise ValueError(f"Unsupported JSON-LD keyword '{keyword}' in a node object")
+            else:
+                yield from self.property(subject, key, value)
+
+    def property(self, subject: str, key: str, value: Any, reverse: bool = False) -> Iterator[str]:
+        definition = self.active.term(key)
+        predicate = definition["iri"] if definition is not None else self.active.expand_iri(key, vocab=True)
+        coercion = definition["type"] if definition is not None else None
+        if definition is not None and definition["reverse"]:
+            reverse = not reverse
+        predicate = _iri(predicate)
+        written = set()
+        for item in _flatten(value):
+            if item is None:
+                continue
+            if isinstance(item, dict) and not any(self.keyword(k) == "@value" for k in item):
+                obj = self.subject_of(item)
+                yield self.statement(obj, predicate, subject) if reverse else self.statement(subject, predicate, obj)
+                yield from self.node(item, obj)
+                continue
+            obj = self.object(item, coercion)
+            if obj in written:  # an RDF graph is a set, repeated values give one statement
+                continue
+            written.add(obj)
+            yield self.statement(obj, predicate, subject) if reverse else self.statement(subject, predicate, obj)
+
+    def object(self, item: Any, coercion: str | None) -> str:
+        if isinstance(item, dict):
+            entries = {self.keyword(k): v for k, v in item.items()}
+            datatype = entries.get("@type")
+            datatype = None if datatype is None else self.active.expand_iri(datatype, vocab=True)
+            if "@language" in entries:
+                return _literal(str(entries["@value"])) + "@" + entries["@language"].lower()
+            return _native_literal(entries["@value"], datatype)
+        if isinstance(item, str) and coercion in ("@id", "@vocab"):
+            return _iri(self.active.expand_iri(item, vocab=coercion == "@vocab"))
+        return _native_literal(item, coercion)
+
+
+def _flatten(value: Any) -> Iterator[Any]:
+    if isinstance(value, list):
+        for item in value:
+            yield from _flatten(item)
+    else:
+        yield value
+
+
+def iter_statements(
+    jsonld: dict,
+    graph: str | None = None,
+    contexts: dict[str, Any] | None = None,
+    blank_node_prefix: str = "b",
+) -> Iterator[str]:
+    """
+    Yields the N-Triples (or, with ``graph``, N-Quads) lines of a JSON-LD document.
+
+    Args:
+        jsonld (dict): The JSON-LD document, e.g. the result of `convert_excel_to_jsonld`.
+        graph (str | None): The named graph of every statement. Default is None (N-Triples).
+        contexts (dict[str, Any] | None): Remote contexts by IRI, used before the bundled copies.
+        blank_node_prefix (str): Prefix of the blank node labels. Default is "b".
+
+    Yields:
+        str: One statement per line, including the trailing newline.
+
+    Raises:
+        ValueError: If a term is neither defined in the context nor an absolute IRI.
+    """
+    active = _ActiveContext(jsonld.get("@context"), contexts)
+    writer = _StatementWriter(active, graph, blank_node_prefix)
+    # a node with an @id (e.g. an organisation) can be described at several places in the document
+    named_statements = set()
+    for line in writer.node(jsonld, writer.subject_of(jsonld)):
+        if line.startswith("<"):
+            if line in named_statements:
+                continue
+            named_statements.add(line)
+        yield line
+
+
+def write_ntriples(
+    jsonld: dict,
+    destination: str | Path | IO[str],
+    graph: str | None = None,
+    contexts: dict[str, Any] | None = None,
+    blank_node_prefix: str = "b",
+) -> int:
+    """
+    Streams a JSON-LD document to an N-Triples file, or an N-Quads file if ``graph`` is given.
+
+    Args:
+        jsonld (dict): The JSON-LD document.
+        destination (str | Path | IO[str]): The target file or an open text stream.
+        graph (str | None): The named graph of every statement. Default is None (N-Triples).
+        contexts (dict[str, Any] | None): Remote contexts by IRI, used before the bundled copies.
+        blank_node_prefix (str): Prefix of the blank node labels. Default is "b".
+
+    Returns:
+        int: The number of statements written.
+    """
+    if isinstance(destination, (str, Path)):
+        with open(destination, "w", encoding="utf-8", newline="\n") as out:
+            return write_ntriples(jsonld, out, graph, contexts, blank_node_prefix)
+
+    count = 0
+    for line in iter_statements(jsonld, graph=graph, contexts=contexts, blank_node_prefix=blank_node_prefix):
+        destination.write(line)
+        count += 1
+    return count
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point adding or refreshing the committed copies of the remote contexts, see ``--help``."""
+    parser = argparse.ArgumentParser(description="Download the remote JSON-LD contexts committed with the package.")
+    parser.add_argument("target", type=Path, help="the contexts folder of the source tree")
+    parser.add_argument("--refresh", action="store_true", help="download contexts that are committed already too")
+    args = parser.parse_args(argv)
+    for path in download_contexts(args.target, refresh=args.refresh):
+        print(f"{path.name}: downloaded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+rewrite.py
+Declarative path rewrites applied to converted documents.
+
+Some structures recommended by the BattINFO ontology team are too involved
+to be expressed in the Excel template, e.g. the rated capacity of an
+electrode. The converter builds the plain structure from the template and a
+rewrite rule of ``json_template.REWRITE_RULES`` then swaps it for the
+recommended one, carrying the values over. A rule only applies if every
+value it moves is present, otherwise the plain structure keeps the
+information. A rule may also require an earlier one, e.g. the negative
+electrode is only rewritten together with the positive one.
+
+Rules are compiled once into key/index steps; the anchors of all rules are
+merged into one tree, so a document is walked once along the shared prefixes
+whatever the number of rules. The rules found are then applied in the order
+they were declared.
+"""
+
+import copy
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from .json_template import REWRITE_RULES
+
+_SEGMENT = re.compile(r"([^.\[\]]+)((?:\[\d+\])*)")
+_INDEX = re.compile(r"\[(\d+)\]")
+
+_MISSING = object()
+
+
+def compile_path(path: str) -> tuple[str | int, ...]:
+    """
+    Splits a rule path into the keys and list positions it goes through.
+
+    Args:
+        path (str): Keys separated by "." with list positions in brackets, e.g. "hasMeasuredProperty[0].@reverse".
+
+    Returns:
+        tuple[str | int, ...]: The steps, e.g. ("hasMeasuredProperty", 0, "@reverse").
+
+    Raises:
+        ValueError: If the path is empty or malformed.
+    """
+    steps: list[str | int] = []
+    for segment in path.split("."):
+        match = _SEGMENT.fullmatch(segment)
+        if match is None:
+            raise ValueError(f"Malformed rewrite path '{path}' at '{segment}'")
+        steps.append(match.group(1))
+        steps.extend(int(index) for index in _INDEX.findall(match.group(2)))
+    return tuple(steps)
+
+
+def _get(value: Any, steps: tuple[str | int, ...]) -> Any:
+    """The value at ``steps`` below ``value``, `_MISSING` if the document does not go there."""
+    for step in steps:
+        if isinstance(step, int):
+            if not isinstance(value, list) or step >= len(value):
+                return _MISSING
+        elif not isinstance(value, dict) or step not in value:
+            return _MISSING
+        value = value[step]
+    return value
+
+
+def _set(value: Any, steps: tuple[str | int, ...], new_value: Any) -> None:
+    for step in steps[:-1]:
+        value = value[step]
+    value[steps[-1]] = new_value
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    name: str
+    requires: str | None
+    template: Any
+    # (source steps below the anchor, target steps below the template)
+    moves: tuple[tuple[tuple[str | int, ...], tuple[str | int, ...]], ...]
+
+    def apply(self, container: Any, key: str | int) -> bool:
+        current = container[key]
+        values = [_get(current, source) for source, _ in self.moves]
+        if any(value is _MISSING for value in values):
+            return False
+        replacement = copy.deepcopy(self.template)
+        for (_, target), value in zip(self.moves, values):
+            _set(replacement, target, value)
+        container[key] = replacement
+        return True
+
+
+class RewriteRules:
+    """
+    A set of compiled path-rewrite rules.
+
+    Args:
+        rules (Iterable[dict]): Rules like those of `json_template.REWRITE_RULES`: a "name", the path "at" which the
+            value is replaced, the "template" replacing it, the "moves" from source paths below "at" to target
+            paths below the template and optionally the name of an earlier rule it "requires".
+
+    Raises:
+        ValueError: If a path is malformed, a target is not in its template, two rules share an anchor or a rule
+            requires one that is not declared before it.
+    """
+
+    def __init__(self, rules: Iterable[dict]) -> None:
+        # nested {step: (children, rule or None)} tree of the anchors
+        self._tree: dict[str | int, tuple[dict, _CompiledRule | None]] = {}
+        self.names: list[str] = []
+        # rule name -> its "at" path, and the names of the rules other rules require
+        self.anchors: dict[str, str] = {}
+        self.required: set[str] = set()
+        for rule in rules:
+            self._add(rule)
+
+    def _add(self, rule: dict) -> None:
+        name = rule["name"]
+        requires = rule.get("requires")
+        if requires is not None and requires not in self.names:
+            raise ValueError(f"Rewrite rule '{name}' requires '{requires}', which is not declared before it")
+        if requires is not None:
+            self.required.add(requires)
+        moves = []
+        for source, target in rule["moves"].items():
+            target_steps = compile_path(target)
+            if _get(rule["template"], target_steps) is _MISSING:
+                raise ValueError(f"Rewrite rule '{name}': target '{target}' is not in its template")
+            moves.append((compile_path(source), target_steps))
+        compiled = _CompiledRule(name, requires, rule["template"], tuple(moves))
+
+        anchor = compile_path(rule["at"])
+        tree = self._tree
+        for step in anchor[:-1]:
+            tree = tree.setdefault(step, ({}, None))[0]
+        children, existing = tree.get(anchor[-1], ({}, None))
+        if existing is not None:
+            raise ValueError(f"Rewrite rules '{existing.name}' and '{name}' share the anchor '{rule['at']}'")
+        tree[anchor[-1]] = (children, compiled)
+        self.names.append(name)
+        self.anchors[name] = rule["at"]
+
+    def apply(self, json_dict: dict, applied_elsewhere: Iterable[str] = ()) -> list[str]:
+        """
+        Applies the rules in place, in the order they were declared. A rule is applied only if all of its source
+        values exist and the rule it requires, if any, was applied.
+
+        Args:
+            json_dict (dict): The converted document.
+            applied_elsewhere (Iterable[str]): Rules counted as applied when another rule requires them, e.g. those
+                applying to the full document of a partial one. Default is none.
+
+        Returns:
+            list[str]: The names of the rules applied.
+        """
+        found: dict[str, tuple[_CompiledRule, Any, str | int]] = {}
+        pending = [(json_dict, self._tree)]
+        while pending:
+            container, tree = pending.pop()
+            for step, (children, rule) in tree.items():
+                if _get(container, (step,)) is _MISSING:
+                    continue
+                if rule is not None:
+                    found[rule.name] = (rule, container, step)
+                if children:
+                    pending.append((container[step], children))
+
+        applied: list[str] = []
+        satisfied = set(applied_elsewhere)
+        for name in self.names:
+            if name not in found:
+                continue
+            rule, container, step = found[name]
+            if (rule.requires is None or rule.requires in satisfied) and rule.apply(container, step):
+                satisfied.add(name)
+                applied.append(name)
+        return applied
+
+
+DEFAULT_RULES = RewriteRules(REWRITE_RULES)
+
+
+def apply_rewrite_rules(
+    json_dict: dict, rules: RewriteRules = DEFAULT_RULES, applied_elsewhere: Iterable[str] = ()
+) -> dict:
+    """
+    Rewrites the structures of a converted document that have a recommended form, see `json_template.REWRITE_RULES`.
+
+    Args:
+        json_dict (dict): The converted document; it is changed in place.
+        rules (RewriteRules): The compiled rules. Default is the rules of `json_template.REWRITE_RULES`.
+        applied_elsewhere (Iterable[str]): Rules counted as applied when another rule requires them, see
+            `RewriteRules.apply`. Default is none.
+
+    Returns:
+        dict: The same document.
+    """
+    rules.apply(json_dict, applied_elsewhere)
+    return json_dict
@@ -0,0 +1,301 @@
+"""
+skeletons.py
+Convert cells of a known template by filling their values into a prebuilt document.
+
+Workbooks filled in from the same template share the ``Metadata``,
+``Ontology link`` and ``Unit`` columns, and a batch of cells usually shares
+its materials and components too; what differs are the measured numbers,
+comments and free-text literals. `SkeletonCache` builds the JSON-LD of such
+a cell once with a placeholder in every value slot, records where each
+placeholder ended up and fills the values of later cells in by row position.
+
+Rows whose value can change the shape of the document (class names, unique
+IDs, multi-connector routing, empty values) are part of the skeleton key, so
+a cell that differs in one of them gets its own skeleton. A template the
+placeholders cannot be traced through falls back to the full builder.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+from . import auxiliary as aux
+from .json_convert import (
+    REQUIRED_FIELDS,
+    SCHEMA_VERSION_FIELDS,
+    VALUE_COLUMN,
+    ExcelContainer,
+    create_jsonld_header,
+    create_jsonld_with_conditions,
+)
+
+# The schema columns that decide the shape of a template's documents.
+TEMPLATE_COLUMNS = ("Metadata", "Ontology link", "Unit")
+
+DEFAULT_MAX_ENTRIES = 64
+
+# Rows whose value only ever becomes a literal of the document.
+_MEASURED, _COMMENT, _STRING = "measured", "comment", "string"
+
+_HEADER_COMMENTS = 2
+
+# Rows the header is read from; their values are part of the key even where they are also a comment.
+_HEADER_FIELDS = frozenset(REQUIRED_FIELDS + SCHEMA_VERSION_FIELDS)
+
+
+def _placeholder(row: int) -> str:
+    return f"\x00battinfo-slot-{row}\x00"
+
+
+@dataclass
+class _Skeleton:
+    """A document with placeholders, and where the value of each slot row goes."""
+
+    document: dict
+    # (row, path of keys and indices to the literal, comment text with the placeholder or None)
+    slots: list[tuple[int, tuple, str | None]]
+
+
+def _copy_json(value: Any) -> Any:
+    """Copy the dictionaries and lists of a JSON value, sharing the literals."""
+    if isinstance(value, dict):
+        return {key: _copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
+def template_key(data_container: ExcelContainer) -> str:
+    """
+    Hashes what the shape of a workbook's documents depends on besides the values.
+
+    The key is computed once and kept on the container, so shallow copies that share its sheets, like the variants
+    of `converter.Converter`, reuse it.
+
+    Args:
+        data_container (ExcelContainer): The parsed workbook.
+
+    Returns:
+        str: A SHA-256 hex digest of the `TEMPLATE_COLUMNS` of the schema sheet and of the lookup sheets.
+    """
+    key = getattr(data_container, "_template_key", None)
+    if key is not None:
+        return key
+    digest = hashlib.sha256()
+    for name, sheet in data_container.data.items():
+        frame = sheet[list(TEMPLATE_COLUMNS)] if name == "schema" else sheet
+        digest.update(repr((name, list(frame.columns), frame.to_numpy().tolist())).encode())
+    data_container._template_key = key = digest.hexdigest()
+    return key
+
+
+def _slot_kind(value: Any, unit: Any, ontology_link: Any) -> str | None:
+    """The kind of a filled row whose value only becomes a literal, None if the value can shape the document."""
+    if ontology_link == "Comment":
+        return _COMMENT
+    if not isinstance(ontology_link, str) or pd.isna(unit) or aux._is_empty_value(value):
+        return None
+    if unit != "No Unit":
+        return _MEASURED
+    last = ontology_link.rsplit("-", 1)[-1].split("|", 1)[-1]
+    if last == "hasStringValue" and isinstance(value, str):
+        return _STRING
+    return None
+
+
+def cell_signature(data_container: ExcelContainer, value_column: str = VALUE_COLUMN) -> tuple[dict[int, str], tuple]:
+    """
+    Splits the rows of a cell into value slots and rows that shape its document.
+
+    Args:
+        data_container (ExcelContainer): The parsed workbook.
+        value_column (str): The schema column holding the values of the cell. Default is "Value".
+
+    Returns:
+        tuple[dict[int, str], tuple]: The kind of each slot row by row position, and the signature: per ontologized
+            row None if it is empty, its kind if it is a slot, else its type name and value. Cells of one template
+            with equal signatures have documents of the same shape.
+    """
+    schema = data_container.data["schema"]
+    rows = zip(schema[value_column], schema["Unit"], schema["Ontology link"], schema["Metadata"])
+    kinds: dict[int, str] = {}
+    signature = []
+    for row, (value, unit, ontology_link, metadata) in enumerate(rows):
+        if ontology_link == "NotOntologize":
+            continue  # header fields, built by create_jsonld_header
+        if pd.isna(value):
+            signature.append(None)
+            continue
+        kind = None if metadata in _HEADER_FIELDS else _slot_kind(value, unit, ontology_link)
+        if kind is None:
+            signature.append((type(value).__name__, value))
+        else:
+            kinds[row] = kind
+            signature.append(kind)
+    return kinds, tuple(signature)
+
+
+def placeholder_document(
+    data_container: ExcelContainer, build_strategy: str, value_column: str, header: dict, kinds: dict[int, str]
+) -> dict | None:
+    """
+    Builds the document of a cell with a placeholder in place of the value of every slot row.
+
+    Args:
+        data_container (ExcelContainer): The parsed workbook.
+        build_strategy (str): How the rows are added, one of `json_convert.BUILD_STRATEGIES`.
+        value_column (str): The schema column holding the values of the cell.
+        header (dict): The header of the cell, see `json_convert.create_jsonld_header`.
+        kinds (dict[int, str]): The kind of each slot row, see `cell_signature`.
+
+    Returns:
+        dict | None: The document, or None if the rows change its header (which is rebuilt for every cell).
+    """
+    values = data_container.data["schema"][value_column].to_numpy(dtype=object, copy=True)
+    for row in kinds:
+        values[row] = _placeholder(row)
+    variant = copy.copy(data_container)
+    variant.data = {**data_container.data, "schema": data_container.data["schema"].assign(**{value_column: values})}
+    document = create_jsonld_with_conditions(variant, build_strategy=build_strategy, value_column=value_column)
+
+    comments = document.get("rdfs:comment")
+    if not isinstance(comments, list) or comments[:_HEADER_COMMENTS] != header["rdfs:comment"]:
+        return None
+    if any(document.get(field) != value for field, value in header.items() if field != "rdfs:comment"):
+        return None
+    return document
+
+
+def trace_slots(document: Any, kinds: dict[int, str]) -> list[tuple[int, tuple, str | None]] | None:
+    """
+    Finds where the placeholder of each slot row ended up in a document built with placeholders.
+
+    Args:
+        document (Any): The document, or a part of it.
+        kinds (dict[int, str]): The kind of each slot row, see `cell_signature`.
+
+    Returns:
+        list[tuple[int, tuple, str | None]] | None: Per placeholder found, its row, the keys and indices leading to
+            it and, for a comment, the text holding it; None if a placeholder is in a key or mixed with other text.
+    """
+    slots: list[tuple[int, tuple, str | None]] = []
+    placeholders = {_placeholder(row): row for row in kinds}
+
+    def trace(value: Any, path: tuple) -> bool:
+        if isinstance(value, dict):
+            return all(
+                "\x00" not in key and trace(item, path + (key,)) for key, item in value.items()
+            )
+        if isinstance(value, list):
+            return all(trace(item, path + (index,)) for index, item in enumerate(value))
+        if not isinstance(value, str) or "\x00" not in value:
+            return True
+        if value in placeholders:
+            row = placeholders[value]
+            if kinds[row] == _COMMENT:
+                return False
+            slots.append((row, path, None))
+            return True
+        row = next((row for text, row in placeholders.items() if text in value), None)
+        if row is None or kinds[row] != _COMMENT or value.count("\x00") != 2:
+            return False
+        slots.append((row, path, value))
+        return True
+
+    return slots if trace(document, ()) else None
+
+
+class SkeletonCache:
+    """
+    Prebuilt JSON-LD skeletons of recently converted templates, shared by every cell converted through it.
+
+    Attributes:
+        max_entries (int): The number of skeletons kept; the least recently used is dropped first. Default is 64.
+        hits (int): Conversions filled into an existing skeleton.
+        misses (int): Conversions that had to build a skeleton (or use the full builder).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._skeletons: OrderedDict[tuple, _Skeleton | None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._skeletons)
+
+    def create_jsonld(
+        self, data_container: ExcelContainer, build_strategy: str = "sequential", value_column: str = VALUE_COLUMN
+    ) -> dict:
+        """
+        Creates the JSON-LD of a cell, like `json_convert.create_jsonld_with_conditions`.
+
+        Args:
+            data_container (ExcelContainer): The parsed workbook.
+            build_strategy (str): How the rows are added when a skeleton has to be built, one of
+                `json_convert.BUILD_STRATEGIES`. Default is "sequential".
+            value_column (str): The schema column holding the values of the cell. Default is "Value".
+
+        Returns:
+            dict: The JSON-LD document, equal to the one the full builder gives.
+
+        Raises:
+            ValueError: If required fields are missing or have invalid data, as in the full builder.
+        """
+        header = aux.JsonLdNode.from_dict(create_jsonld_header(data_container, value_column)).to_dict()
+
+        # rows whose value can shape the document are part of the key, the others only by kind
+        kinds, signature = cell_signature(data_container, value_column)
+        key = (template_key(data_container), signature)
+
+        with self._lock:
+            known = key in self._skeletons
+            skeleton = self._skeletons.get(key)
+            if known:
+                self._skeletons.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not known:
+            skeleton = self._build(data_container, build_strategy, value_column, header, kinds)
+            with self._lock:
+                self._skeletons[key] = skeleton
+                while len(self._skeletons) > self.max_entries:
+                    self._skeletons.popitem(last=False)
+        if skeleton is None:
+            return create_jsonld_with_conditions(data_container, build_strategy=build_strategy, value_column=value_column)
+        return self._fill(skeleton, header, list(data_container.data["schema"][value_column]))
+
+    @staticmethod
+    def _build(
+        data_container: ExcelContainer, build_strategy: str, value_column: str, header: dict, kinds: dict[int, str]
+    ) -> _Skeleton | None:
+        """Build the document with placeholders in the slot rows; None if they cannot all be traced."""
+        document = placeholder_document(data_container, build_strategy, value_column, header, kinds)
+        slots = None if document is None else trace_slots(document, kinds)
+        if slots is None:
+            return None
+        return _Skeleton(document, slots)
+
+    @staticmethod
+    def _fill(skeleton: _Skeleton, header: dict, values: list[Any]) -> dict:
+        document = _copy_json(skeleton.document)
+        for field, value in header.items():
+            if field != "rdfs:comment":
+                document[field] = value
+        document["rdfs:comment"][:_HEADER_COMMENTS] = header["rdfs:comment"]
+        for row, path, text in skeleton.slots:
+            target = document
+            for step in path[:-1]:
+                target = target[step]
+            value = values[row]
+            target[path[-1]] = value if text is None else text.replace(_placeholder(row), f"{value}")
+        return document
@@ -0,0 +1,194 @@
+"""
+table_convert.py
+Bulk conversion of a table of cells (CSV, Parquet or a DataFrame) against one template workbook.
+
+The table has one row per cell and one column per ``Metadata`` label of the
+template's schema sheet. Labels that occur more than once in the schema are
+numbered like pandas numbers duplicate CSV headers (``label``, ``label.1``,
+...). Schema rows without a table column keep the template's own value, so
+constants such as the schema version only need to be filled in once.
+
+Missing values, required fields and units are checked for the whole table
+at once, before the first document is built.
+"""
+
+import datetime
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from . import json_convert
+from .excel_tools import ExcelSource
+from .json_convert import REQUIRED_FIELDS, REQUIRED_ID_FIELDS, VALUE_COLUMN, ExcelContainer
+
+TABLE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+# Text that is written exactly like Excel would display a number ("007" and "1.50e3" stay text).
+_NUMBER_TEXT = re.compile(r"^-?(0|[1-9]\d*)(\.\d+)?$")
+
+# Schema columns the JSON-LD builder needs; the rest of the (often very wide) sheet is dropped.
+_SCHEMA_COLUMNS = ["Metadata", "Unit", "Ontology link"]
+
+
+def _cell_value(value: Any) -> Any:
+    """Normalise a table value to what the Excel reader gives for the same cell."""
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA or value is pd.NaT:
+        return np.nan
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, str):
+        if not value.strip():
+            return np.nan
+        if _NUMBER_TEXT.match(value):
+            return int(value) if "." not in value else float(value)
+    return value
+
+
+def read_table(table_file: str | Path) -> DataFrame:
+    """
+    Reads a table of cells from a CSV or Parquet file.
+
+    CSV cells are read as text and converted back to numbers only when written like a plain number, so IDs such as
+    "000123" are kept. Parquet needs pandas' optional Parquet engine (``pyarrow`` or ``fastparquet``).
+
+    Args:
+        table_file (str | Path): The table, with a ``.csv`` or ``.parquet`` extension.
+
+    Returns:
+        DataFrame: One row per cell, one column per ``Metadata`` label.
+
+    Raises:
+        ValueError: If the file extension is not one of `TABLE_FORMATS`.
+    """
+    table_format = TABLE_FORMATS.get(Path(table_file).suffix.lower())
+    if table_format == "csv":
+        return pd.read_csv(table_file, dtype=str, keep_default_na=False)
+    if table_format == "parquet":
+        return pd.read_parquet(table_file)
+    raise ValueError(f"Unknown table format '{table_file}', expected one of {sorted(TABLE_FORMATS)}")
+
+
+def metadata_keys(schema: DataFrame) -> pd.Series:
+    """
+    Gives every schema row the table column it is read from.
+
+    Args:
+        schema (DataFrame): The schema sheet of the template.
+
+    Returns:
+        pd.Series: The stripped ``Metadata`` label of each row, numbered ``label.1``, ``label.2``, ... when it repeats;
+            NaN for rows without a label.
+    """
+    labels = schema["Metadata"].map(lambda label: label.strip() if isinstance(label, str) else np.nan)
+    occurrence = labels.groupby(labels).cumcount()
+    return labels.where(occurrence == 0, labels + "." + occurrence.astype(str))
+
+
+def _cell_values(schema: DataFrame, table: DataFrame) -> DataFrame:
+    """The values of every cell as a (schema rows x cells) frame, falling back to the template values."""
+    keys = metadata_keys(schema)
+    table = table.rename(columns=lambda column: column.strip() if isinstance(column, str) else column)
+    unknown = sorted(set(table.columns) - set(keys.dropna()))
+    if unknown:
+        raise ValueError(f"The table has columns that are not Metadata labels of the template: {unknown}")
+
+    values = table.reindex(columns=keys.where(keys.isin(table.columns))).apply(lambda column: column.map(_cell_value)).T
+    values.index = schema.index
+    from_template = (~keys.isin(table.columns)).to_numpy()
+    values.loc[from_template] = np.repeat(
+        schema[VALUE_COLUMN].to_numpy()[from_template][:, None], values.shape[1], axis=1
+    )
+    return values
+
+
+def _check_cells(schema: DataFrame, unique_id: DataFrame, values: DataFrame, cells: pd.Index) -> None:
+    """Raise one ``ValueError`` listing every missing required field, unknown unique ID and value without a unit."""
+    problems = []
+    filled = values.notna().to_numpy()
+    metadata = schema["Metadata"].map(lambda label: label.strip() if isinstance(label, str) else label)
+    rows = {field: np.flatnonzero((metadata == field).to_numpy()) for field in REQUIRED_FIELDS}
+
+    for field in REQUIRED_FIELDS:
+        missing = np.ones(len(cells), dtype=bool) if not len(rows[field]) else ~filled[rows[field][0]]
+        if missing.any():
+            problems.append(f"missing '{field}' for cells {list(cells[missing])}")
+
+    known_ids = set(unique_id["Item"].dropna())
+    for field in REQUIRED_ID_FIELDS:
+        if not len(rows[field]):
+            continue
+        names = pd.Series(values.iloc[rows[field][0]].to_numpy())
+        unknown = names.notna().to_numpy() & ~names.map(
+            lambda name: (name.rstrip(" ") if isinstance(name, str) else name) in known_ids
+        ).to_numpy()
+        if unknown.any():
+            problems.append(f"no unique ID for the '{field}' of cells {list(cells[unknown])}")
+
+    links = schema["Ontology link"]
+    ontologized = links.notna() & ~links.isin(["NotOntologize", "Comment"])
+    for row in np.flatnonzero((ontologized & schema["Unit"].isna()).to_numpy()):
+        if filled[row].any():
+            problems.append(
+                f"the value of '{schema['Metadata'].iloc[row]}' has no unit in the template, "
+                f"filled for cells {list(cells[filled[row]])}"
+            )
+    if problems:
+        raise ValueError("Invalid table: " + "; ".join(problems))
+
+
+def convert_table_to_jsonld(
+    template_file: ExcelSource,
+    table: DataFrame | str | Path,
+    debug_mode: bool = True,
+    build_strategy: str = "sequential",
+    excel_engine: str = "openpyxl",
+) -> Iterator[tuple[Any, dict]]:
+    """
+    Converts a table of cells against one template workbook.
+
+    The template is loaded once; its ``Ontology link`` and ``Unit`` columns and lookup sheets are shared by all cells.
+
+    Args:
+        template_file (ExcelSource): The template workbook.
+        table (DataFrame | str | Path): The cells, as a DataFrame or a CSV/Parquet file (see `read_table`).
+        debug_mode (bool): Flag to enable or disable debug mode. Default is True.
+        build_strategy (str): How the schema rows are added to the JSON-LD, one of `json_convert.BUILD_STRATEGIES`.
+            Default is "sequential".
+        excel_engine (str): The reader used for the template sheets, one of `excel_tools.EXCEL_ENGINES`.
+            Default is "openpyxl".
+
+    Yields:
+        tuple[Any, dict]: The table index of each cell and its JSON-LD, in table order.
+
+    Raises:
+        ValueError: Before anything is yielded, if the table has unknown columns, misses required fields or fills
+            values that have no unit; while converting, if a cell has other invalid data (the message names the cell).
+    """
+    if debug_mode:
+        print('*********************************************************')
+        print(f"Initialize new session of table conversion, started at {datetime.datetime.now()}")
+        print('*********************************************************')
+    if not isinstance(table, DataFrame):
+        table = read_table(table)
+    data_container = ExcelContainer(template_file, engine=excel_engine)
+    template_data = data_container.data
+    schema = template_data["schema"]
+
+    values = _cell_values(schema, table)
+    _check_cells(schema, template_data["unique_id"], values, table.index)
+
+    base_schema = schema[_SCHEMA_COLUMNS]
+    for position, cell in enumerate(table.index):
+        # the sheets, and with them the cached structure context, are shared; only the values change
+        cell_schema = base_schema.assign(**{VALUE_COLUMN: values.iloc[:, position]})
+        data_container.data = {**template_data, "schema": cell_schema}
+        try:
+            jsonld_output = json_convert.create_jsonld_with_conditions(data_container, build_strategy=build_strategy)
+        except ValueError as exc:
+            raise ValueError(f"Cell {cell!r}: {exc}") from exc
+        yield cell, json_convert.assit_format_json_rated_capacity(jsonld_output)
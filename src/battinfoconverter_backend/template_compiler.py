@@ -0,0 +1,417 @@
+"""
+template_compiler.py
+Compile a template into a Python module that builds its JSON-LD with straight-line code.
+
+For a fixed template the ontology paths, connector choices and lookups of a
+cell are known before its values are: `compile_template` converts a
+representative workbook once through the skeleton machinery of `skeletons`
+and writes the resulting document as one nested literal, with the value of each slot row read by position.
+The generated ``build(values)`` does no path parsing, lookup or
+multi-connector inference, so a cell converts at about the cost of
+building its dictionaries. Like the full builder, it leaves the rewrites
+of `rewrite` to the caller.
+
+The document of a template still depends on which rows are filled and on
+the class names, IDs and routing values of a cell, see
+`skeletons.cell_signature`. The module records the signature it was
+compiled for; `CompiledTemplate` uses it only for cells with the same
+signature, template and converter version, and the full builder for the
+others. Rebuild the module with ``battinfoconverter-compile`` after
+changing the template or upgrading the converter.
+"""
+
+import argparse
+import datetime
+import importlib.util
+import math
+import threading
+from decimal import Decimal
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+from . import auxiliary as aux
+from .excel_tools import ExcelSource
+from .json_convert import (
+    APP_VERSION,
+    REQUIRED_FIELDS,
+    REQUIRED_ID_FIELDS,
+    SCHEMA_VERSION_FIELDS,
+    VALUE_COLUMN,
+    ExcelContainer,
+    create_jsonld_header,
+    create_jsonld_with_conditions,
+)
+from .skeletons import cell_signature, placeholder_document, template_key, trace_slots
+
+# Bumped whenever the layout of the generated modules changes.
+COMPILED_FORMAT = 1
+
+_HEADER_COMMENTS = 2
+
+_INDENT = "    "
+
+_MODULE_HEAD = '''"""
+Compiled BattINFO template, generated by battinfoconverter_backend.template_compiler from {source}.
+
+Do not edit: rebuild it with battinfoconverter-compile after changing the template or upgrading the converter.
+"""
+
+import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+COMPILED_FORMAT = {compiled_format!r}
+
+APP_VERSION = {app_version!r}
+
+TEMPLATE_KEY = {template_key!r}
+
+# The cells this module builds, see skeletons.cell_signature.
+SIGNATURE = {signature}
+
+# The first ID of each item of the unique ID sheet.
+UNIQUE_IDS = {unique_ids}
+
+
+def _unique_id(name, field):
+    try:
+        if name.endswith(" "):
+            name = name.rstrip(" ")
+    except AttributeError:
+        raise ValueError(f"Missing unique ID for the field '{{field}}'") from None
+    unique_id = UNIQUE_IDS.get(name)
+    if unique_id is None:
+        raise ValueError(f"Missing unique ID for the field '{{field}}'")
+    return unique_id
+
+
+def build(values):
+    """Builds the JSON-LD of a cell from the values of its schema rows, in row order."""
+'''
+
+
+def _literal(value: Any) -> str:
+    """The Python source of a constant of the document; the generated module imports datetime and Decimal."""
+    if value is None or isinstance(value, (bool, int, str, Decimal, datetime.date, datetime.time)):
+        return repr(value)
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else f"float({str(value)!r})"
+    if isinstance(value, tuple):
+        return "(" + ", ".join(_literal(item) for item in value) + ("," if len(value) == 1 else "") + ")"
+    raise ValueError(f"Cannot compile the value {value!r} of type {type(value).__name__}")
+
+
+def _format(prefix: str, source: str, suffix: str) -> str:
+    """The source of ``f"{prefix}{value}{suffix}"`` for the value built by ``source``."""
+    parts = [repr(prefix)] if prefix else []
+    parts.append(f"format({source})")
+    if suffix:
+        parts.append(repr(suffix))
+    return " + ".join(parts)
+
+
+def _expression(value: Any, path: tuple, slots: dict[tuple, tuple[int, str | None]], depth: int) -> str:
+    """The source building ``value``, found at ``path`` of the document, with the slot rows read from ``values``."""
+    if path in slots:
+        row, text = slots[path]
+        if text is None:
+            return f"values[{row}]"
+        prefix, _, suffix = text.split("\x00")
+        return _format(prefix, f"values[{row}]", suffix)
+    indent = _INDENT * (depth + 1)
+    if isinstance(value, dict):
+        if not value:
+            return "{}"
+        items = "".join(
+            f"{indent}{key!r}: {_expression(item, path + (key,), slots, depth + 1)},\n" for key, item in value.items()
+        )
+        return "{\n" + items + _INDENT * depth + "}"
+    if isinstance(value, list):
+        if not value:
+            return "[]"
+        items = "".join(
+            f"{indent}{_expression(item, path + (index,), slots, depth + 1)},\n" for index, item in enumerate(value)
+        )
+        return "[\n" + items + _INDENT * depth + "]"
+    return _literal(value)
+
+
+def _first_row(column: Any, label: str) -> int | None:
+    """The position of the first row holding ``label``, as `json_convert.get_information_value` finds it."""
+    rows = np.flatnonzero((column == label).to_numpy())
+    return int(rows[0]) if len(rows) else None
+
+
+def _read(row: int | None) -> str:
+    return "None" if row is None else f"values[{row}]"
+
+
+def _header_source(data_container: ExcelContainer, header: dict) -> tuple[list[str], dict]:
+    """
+    The statements reading the header of a cell, mirroring `json_convert.create_jsonld_header`, and the source of
+    each header field.
+    """
+    metadata = data_container.data["schema"]["Metadata"]
+    lines = []
+    fields = {}
+    for number, field in enumerate(REQUIRED_FIELDS):
+        name = f"required_{number}"
+        fields[field] = name
+        lines += [
+            f"{name} = {_read(_first_row(metadata, field))}",
+            f"if {name} is np.nan:",
+            f"{_INDENT}raise ValueError({f'Missing information in the schema, please fill in the field {field!r}'!r})",
+        ]
+    ids = {}
+    for number, field in enumerate(REQUIRED_ID_FIELDS):
+        ids[field] = f"unique_id_{number}"
+        lines.append(f"unique_id_{number} = _unique_id({fields[field]}, {field!r})")
+    first, second = (_read(_first_row(metadata, field)) for field in SCHEMA_VERSION_FIELDS)
+    lines += [
+        f"schema_version = {first}",
+        "if schema_version is None or pd.isna(schema_version):",
+        f"{_INDENT}schema_version = {second}",
+        "if schema_version is None or pd.isna(schema_version):",
+        f"{_INDENT}raise ValueError('Missing schema version in the schema sheet')",
+    ]
+
+    comments = header["rdfs:comment"]
+    credit, credit_end = comments[1].split(f"schema version: {header['schema:version']}, ", 1)
+    person, organization = "schema:Person", "schema:Organization"
+    sources = {
+        "@context": _expression(header["@context"], (), {}, 2),
+        "@type": fields["Cell type"],
+        "schema:version": "schema_version",
+        "schema:productID": fields["Cell ID"],
+        "schema:dateCreated": fields["Date of cell assembly"],
+        "schema:creator": (
+            f"{{'@type': {person!r}, '@id': {ids['Scientist/technician/operator']}, "
+            f"'schema:name': {fields['Scientist/technician/operator']}}}"
+        ),
+        "schema:manufacturer": (
+            f"{{'@type': {organization!r}, '@id': {ids['Institution/company']}, "
+            f"'schema:name': {fields['Institution/company']}}}"
+        ),
+        "rdfs:comment": [
+            repr(comments[0]),
+            _format(credit + "schema version: ", "schema_version", ", " + credit_end),
+        ],
+    }
+    if set(sources) != set(header):
+        raise ValueError(f"Cannot compile the header fields {sorted(set(header) ^ set(sources))}")
+    return lines, sources
+
+
+def compile_template(
+    excel_file: ExcelSource, value_column: str = VALUE_COLUMN, build_strategy: str = "sequential"
+) -> str:
+    """
+    Compiles the template of a workbook into the source of a module building its JSON-LD from row values.
+
+    The generated module defines ``build(values)``, taking the values of the schema rows in row order, and the
+    ``TEMPLATE_KEY`` and ``SIGNATURE`` of the cells it applies to; see `CompiledTemplate` for using it. Its output is
+    checked against the full builder before the source is returned.
+
+    Args:
+        excel_file (ExcelSource): A representative workbook of the template: the compiled module applies to cells
+            that fill the same rows with the same class names, IDs and routing values.
+        value_column (str): The schema column holding the values of the cell. Default is "Value".
+        build_strategy (str): How the rows are added, one of `json_convert.BUILD_STRATEGIES`. Default is "sequential".
+
+    Returns:
+        str: The source of the module.
+
+    Raises:
+        ValueError: If the cell is not convertible, its value slots cannot be traced through the document, a constant
+            of the document has no literal form, or the compiled module does not reproduce the full builder.
+    """
+    data_container = ExcelContainer(excel_file)
+    header = aux.JsonLdNode.from_dict(create_jsonld_header(data_container, value_column)).to_dict()
+    kinds, signature = cell_signature(data_container, value_column)
+    document = placeholder_document(data_container, build_strategy, value_column, header, kinds)
+    if document is None:
+        raise ValueError("The schema rows change the header of the document, the template cannot be compiled")
+    traced = trace_slots(document, kinds)
+    if traced is None:
+        raise ValueError("The value slots of the template cannot be traced through the document")
+    slots = {path: (row, text) for row, path, text in traced}
+
+    header_lines, header_sources = _header_source(data_container, header)
+    fields = []
+    for key, value in document.items():
+        if key == "rdfs:comment":
+            comments = header_sources[key] + [
+                _expression(comment, (key, index), slots, 2)
+                for index, comment in enumerate(value[_HEADER_COMMENTS:], start=_HEADER_COMMENTS)
+            ]
+            source = "[\n" + "".join(f"{_INDENT * 3}{comment},\n" for comment in comments) + _INDENT * 2 + "]"
+        elif key in header_sources:
+            source = header_sources[key]
+        else:
+            source = _expression(value, (key,), slots, 2)
+        fields.append(f"{_INDENT * 2}{key!r}: {source},\n")
+
+    unique_id = data_container.data["unique_id"]
+    unique_ids: dict = {}
+    for item, identifier in zip(unique_id["Item"], unique_id["ID"]):
+        if isinstance(item, str):
+            unique_ids.setdefault(item, identifier)
+    source = _MODULE_HEAD.format(
+        source=Path(excel_file).name if isinstance(excel_file, (str, Path)) else "a workbook",
+        compiled_format=COMPILED_FORMAT,
+        app_version=APP_VERSION,
+        template_key=template_key(data_container),
+        signature=_literal(signature),
+        unique_ids="{\n" + "".join(f"{_INDENT}{key!r}: {_literal(value)},\n" for key, value in unique_ids.items()) + "}",
+    )
+    source += "".join(f"{_INDENT}{line}\n" for line in header_lines)
+    source += f"{_INDENT}return {{\n" + "".join(fields) + f"{_INDENT}}}\n"
+
+    module = ModuleType("battinfo_compiled_template")
+    exec(compile(source, "<compiled template>", "exec"), module.__dict__)
+    expected = create_jsonld_with_conditions(data_container, build_strategy=build_strategy, value_column=value_column)
+    if module.build(list(data_container.data["schema"][value_column])) != expected:
+        raise ValueError("The compiled template does not reproduce the full builder")
+    return source
+
+
+class CompiledTemplate:
+    """
+    A module generated by `compile_template`, used in place of a `skeletons.SkeletonCache`.
+
+    It can be passed as ``skeletons=`` to `json_convert.convert_excel_to_jsonld`: cells of the compiled template and
+    signature are built by the module, the others by the full builder.
+
+    Args:
+        module (ModuleType): The generated module, e.g. from `load_compiled_template`.
+
+    Attributes:
+        module (ModuleType): The generated module.
+        hits (int): Conversions built by the module.
+        misses (int): Conversions that used the full builder.
+
+    Raises:
+        ValueError: If the module was generated in another layout or by another converter version.
+    """
+
+    def __init__(self, module: ModuleType) -> None:
+        if getattr(module, "COMPILED_FORMAT", None) != COMPILED_FORMAT:
+            raise ValueError(f"'{module.__name__}' is not a compiled template of format {COMPILED_FORMAT}, rebuild it")
+        if module.APP_VERSION != APP_VERSION:
+            raise ValueError(
+                f"'{module.__name__}' was compiled by converter version {module.APP_VERSION}, "
+                f"not {APP_VERSION}; rebuild it"
+            )
+        self.module = module
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def matches(self, data_container: ExcelContainer, value_column: str = VALUE_COLUMN) -> bool:
+        """
+        Tells whether the module builds the document of a cell.
+
+        Args:
+            data_container (ExcelContainer): The parsed workbook.
+            value_column (str): The schema column holding the values of the cell. Default is "Value".
+
+        Returns:
+            bool: True if the workbook has the template and the cell has the signature the module was compiled for.
+        """
+        return (
+            value_column in data_container.data["schema"].columns
+            and template_key(data_container) == self.module.TEMPLATE_KEY
+            and cell_signature(data_container, value_column)[1] == self.module.SIGNATURE
+        )
+
+    def create_jsonld(
+        self, data_container: ExcelContainer, build_strategy: str = "sequential", value_column: str = VALUE_COLUMN
+    ) -> dict:
+        """
+        Creates the JSON-LD of a cell, like `skeletons.SkeletonCache.create_jsonld`.
+
+        Args:
+            data_container (ExcelContainer): The parsed workbook.
+            build_strategy (str): How the rows are added when the full builder is used, one of
+                `json_convert.BUILD_STRATEGIES`. Default is "sequential".
+            value_column (str): The schema column holding the values of the cell. Default is "Value".
+
+        Returns:
+            dict: The JSON-LD document, equal to the one the full builder gives; the rated capacity rewrites are left to
+                the caller, as in `json_convert.convert_excel_to_jsonld`.
+
+        Raises:
+            ValueError: If required fields are missing or have invalid data, as in the full builder.
+        """
+        matched = self.matches(data_container, value_column)
+        with self._lock:
+            if matched:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not matched:
+            return create_jsonld_with_conditions(data_container, build_strategy=build_strategy, value_column=value_column)
+        return self.module.build(list(data_container.data["schema"][value_column]))
+
+
+def write_compiled_template(
+    excel_file: ExcelSource, target: str | Path, value_column: str = VALUE_COLUMN
+) -> Path:
+    """
+    Compiles the template of a workbook and writes the module.
+
+    Args:
+        excel_file (ExcelSource): A representative workbook of the template, see `compile_template`.
+        target (str | Path): The module file to write, e.g. "coin_cell_1_1_15.py".
+        value_column (str): The schema column holding the values of the cell. Default is "Value".
+
+    Returns:
+        Path: The written file.
+
+    Raises:
+        ValueError: If the template cannot be compiled, see `compile_template`.
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(compile_template(excel_file, value_column), encoding="utf-8")
+    return target
+
+
+def load_compiled_template(path: str | Path) -> CompiledTemplate:
+    """
+    Imports a module written by `write_compiled_template`.
+
+    Args:
+        path (str | Path): The module file.
+
+    Returns:
+        CompiledTemplate: The module, ready to be passed as ``skeletons=``.
+
+    Raises:
+        ValueError: If the module was generated in another layout or by another converter version.
+    """
+    path = Path(path)
+    spec = importlib.util.spec_from_file_location(f"battinfo_compiled_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return CompiledTemplate(module)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point of the compiler, see ``--help``."""
+    parser = argparse.ArgumentParser(description="Compile a BattINFO template into a module building its JSON-LD.")
+    parser.add_argument("workbook", type=Path, help="a representative workbook of the template")
+    parser.add_argument("--output", type=Path, required=True, help="the module file to write")
+    parser.add_argument("--value-column", default=VALUE_COLUMN, help="the schema column holding the values")
+    args = parser.parse_args(argv)
+    path = write_compiled_template(args.workbook, args.output, args.value_column)
+    print(f"{args.workbook.name}: {path}")
+
+
+if __name__ == "__main__":
+    main()
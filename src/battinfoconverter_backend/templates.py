@@ -0,0 +1,109 @@
+"""
+templates.py
+Identify the template a workbook was filled in from, without loading it.
+
+`peek_template` reads only the workbook manifest and the first rows of the
+schema sheet, which takes milliseconds instead of the full parse of all
+five sheets. It is meant for routing files, e.g. to a cached template or
+to the worker pool of a domain, before they are converted.
+"""
+
+import hashlib
+from dataclasses import dataclass
+
+import pandas as pd
+
+from .excel_tools import ExcelSource, read_sheet_names, workbook_buffer
+from .excel_tools import read_excel_preserve_decimals as read_excel
+from .json_convert import SCHEMA_VERSION_FIELDS, SHEET_NAMES
+
+# Index of each naming convention in the `json_convert.SHEET_NAMES` pairs.
+SHEET_CONVENTIONS = ("current", "legacy")
+
+# Domain of each known "Schema name".
+TEMPLATE_DOMAINS = {
+    "CoinCellSchema": "battery",
+    "ElectrolysisCellSchema": "catalysis",
+}
+
+# The identification block at the top of the schema sheet fits well within these rows.
+PEEK_ROWS = 20
+
+
+@dataclass(frozen=True)
+class TemplateInfo:
+    """
+    What `peek_template` found out about a workbook.
+
+    Attributes:
+        sheet_convention (str): The sheet naming convention, one of `SHEET_CONVENTIONS`.
+        sheet_names (tuple[str, ...]): All sheet names of the workbook, in tab order.
+        schema_name (str | None): The "Schema name" of the template, None for templates without one.
+        schema_version (str | None): The schema version, None if it is not filled in.
+        domain (str | None): "battery" or "catalysis" (see `TEMPLATE_DOMAINS`), None for an unknown schema name.
+        columns (tuple[str, ...]): The named header columns of the schema sheet.
+        fingerprint (str): A SHA-256 hex digest of all of the above, equal for workbooks filled in from the same
+            template version whatever their values.
+    """
+
+    sheet_convention: str
+    sheet_names: tuple[str, ...]
+    schema_name: str | None
+    schema_version: str | None
+    domain: str | None
+    columns: tuple[str, ...]
+    fingerprint: str
+
+
+def _first_value(schema: pd.DataFrame, label: str):
+    """The value of the first schema row with ``label``, None if there is none or it is empty."""
+    values = schema.loc[schema["Metadata"] == label, "Value"]
+    if values.empty or pd.isna(values.iloc[0]):
+        return None
+    return values.iloc[0]
+
+
+def peek_template(excel_file: ExcelSource) -> TemplateInfo:
+    """
+    Identifies the template of a workbook from its manifest and the top of its schema sheet.
+
+    Args:
+        excel_file (ExcelSource): The workbook: a path, a binary file-like object or the workbook bytes.
+
+    Returns:
+        TemplateInfo: The naming convention, schema name and version, domain and fingerprint of the template.
+
+    Raises:
+        KeyError: If the workbook has no schema sheet under either naming convention.
+    """
+    with workbook_buffer(excel_file) as buffer:
+        sheet_names = tuple(read_sheet_names(buffer))
+        for convention, schema_sheet in zip(SHEET_CONVENTIONS, SHEET_NAMES["schema"]):
+            if schema_sheet in sheet_names:
+                break
+        else:
+            raise KeyError(f"Worksheet {SHEET_NAMES['schema'][0]} does not exist.")
+        schema = read_excel(buffer, sheet_name=schema_sheet, engine="native", nrows=PEEK_ROWS)
+
+    schema_name = _first_value(schema, "Schema name")
+    schema_version = next(
+        (value for value in (_first_value(schema, field) for field in SCHEMA_VERSION_FIELDS) if value is not None),
+        None,
+    )
+    # the "Schema name" row came with the catalysis template, all templates before it are coin cell ones
+    domain = "battery" if schema_name is None else TEMPLATE_DOMAINS.get(schema_name)
+    columns = tuple(column for column in schema.columns if not column.startswith("Unnamed: "))
+
+    schema_name = None if schema_name is None else str(schema_name)
+    schema_version = None if schema_version is None else str(schema_version)
+    signature = [convention, *sheet_names, *columns, schema_name or "", schema_version or ""]
+    fingerprint = hashlib.sha256("\x1f".join(signature).encode("utf-8")).hexdigest()
+    return TemplateInfo(
+        sheet_convention=convention,
+        sheet_names=sheet_names,
+        schema_name=schema_name,
+        schema_version=schema_version,
+        domain=domain,
+        columns=columns,
+        fingerprint=fingerprint,
+    )
@@ -0,0 +1,177 @@
+"""
+validation.py
+Check a filled workbook for every problem before converting it.
+
+The conversion stops at the first invalid row. `validate_workbook` scans the
+whole ``@Schema`` sheet against the lookup sheets instead, without building
+any JSON-LD, and returns all problems with their Excel row numbers, so they
+can be fixed in one go.
+
+Issues of severity "error" make the conversion fail. Issues of severity
+"warning" are converted, but lose information: a unit missing from
+``@Units`` becomes ``UnknownUnit``. Connectors are not checked against
+``@Predicates``: the sheet only gives some of them a default ``@type``, and
+one that is not listed converts like a listed one without a type.
+
+Only the ``@Schema``, ``@Units`` and ``@Classes`` sheets are read.
+"""
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+from . import auxiliary as aux
+from .excel_tools import ExcelSource, ReadLimits, check_archive, workbook_buffer
+from .json_convert import (
+    REQUIRED_FIELDS,
+    REQUIRED_ID_FIELDS,
+    SCHEMA_VERSION_FIELDS,
+    SHEET_NAMES,
+    VALUE_COLUMN,
+    ExcelContainer,
+    read_sheet,
+)
+
+ISSUE_KINDS = (
+    "missing_field",
+    "missing_ontology_link",
+    "missing_schema_version",
+    "missing_unique_id",
+    "missing_unit",
+    "unknown_command",
+    "unknown_unit",
+)
+
+# The sheets the checks need, keyed like `json_convert.SHEET_NAMES`.
+_SHEETS = ("schema", "unit_map", "unique_id")
+
+# The header is row 1 of the sheet, so the first data row (index 0) is Excel row 2.
+_FIRST_DATA_ROW = 2
+
+_PATH_COMMANDS = ("type", "rev")
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """
+    One problem found in the ``@Schema`` sheet.
+
+    Attributes:
+        row (int | None): The Excel row number of the problem, None if a required row is missing altogether.
+        metadata (str | None): The ``Metadata`` label of the row.
+        kind (str): One of `ISSUE_KINDS`.
+        severity (str): "error" if the conversion fails on it, "warning" if it converts with lost information.
+        message (str): A description for the user.
+    """
+
+    row: int | None
+    metadata: str | None
+    kind: str
+    severity: str
+    message: str
+
+    def __str__(self) -> str:
+        where = "Schema sheet" if self.row is None else f"Row {self.row}"
+        if self.metadata:
+            where += f" ({self.metadata})"
+        return f"{where}: {self.message}"
+
+
+def _is_filled(value) -> bool:
+    return not (value is None or pd.isna(value))
+
+
+def _read_sheets(excel_file: ExcelSource, excel_engine: str, limits: ReadLimits | None) -> dict:
+    """Read the sheets of `_SHEETS` from one buffer, within ``limits`` like `json_convert.ExcelContainer`."""
+    with workbook_buffer(excel_file) as buffer:
+        limits = limits.start() if limits is not None else None
+        if limits is not None:
+            check_archive(buffer, limits)
+        return {key: read_sheet(buffer, SHEET_NAMES[key], excel_engine, limits) for key in _SHEETS}
+
+
+def validate_workbook(
+    excel_file: ExcelSource | ExcelContainer,
+    excel_engine: str = "native",
+    value_column: str = VALUE_COLUMN,
+    limits: ReadLimits | None = None,
+) -> list[ValidationIssue]:
+    """
+    Collects every problem of a filled workbook that `json_convert.convert_excel_to_jsonld` would run into.
+
+    Only rows with a value are checked, like in the conversion. Reading the workbook is most of the cost, so only
+    the sheets the checks need are read, with the fast "native" reader by default; pass an already loaded
+    `ExcelContainer` to validate and convert from one read.
+
+    Args:
+        excel_file (ExcelSource | ExcelContainer): The filled workbook: a path, a binary file-like object, the
+            workbook bytes or its loaded sheets.
+        excel_engine (str): The reader used for the sheets, one of `excel_tools.EXCEL_ENGINES`. Default is "native".
+        value_column (str): The schema column holding the values. Default is "Value".
+        limits (ReadLimits | None): Bounds on the cost of reading an untrusted workbook, see
+            `json_convert.ExcelContainer.limits`. Default is None (unbounded).
+
+    Returns:
+        list[ValidationIssue]: The problems in sheet order, those of missing required rows first; empty if the
+            workbook is valid.
+
+    Raises:
+        ValueError: If ``value_column`` is not a column of the schema sheet.
+        WorkbookLimitError: If reading the workbook exceeds ``limits``.
+    """
+    sheets = excel_file.data if isinstance(excel_file, ExcelContainer) else _read_sheets(excel_file, excel_engine, limits)
+    schema = sheets["schema"]
+    if value_column not in schema.columns:
+        raise ValueError(f"The schema sheet has no value column '{value_column}'")
+    units = set(sheets["unit_map"]["Item"])
+    unique_ids: dict = {}
+    for item, unique_id in zip(sheets["unique_id"]["Item"], sheets["unique_id"]["ID"]):
+        unique_ids.setdefault(item, unique_id)
+
+    issues: list[ValidationIssue] = []
+    first_rows: dict[str, tuple[int, object]] = {}
+    schema_rows = zip(schema["Metadata"], schema[value_column], schema["Unit"], schema["Ontology link"])
+    for index, (metadata, value, unit, ontology_link) in enumerate(schema_rows):
+        row = index + _FIRST_DATA_ROW
+        label = metadata if isinstance(metadata, str) else None
+        if label is not None:
+            # the conversion reads the header fields from the first row with exactly this label
+            first_rows.setdefault(label, (row, value))
+        if not _is_filled(value) or ontology_link in ("NotOntologize", "Comment"):
+            continue
+
+        def add(kind: str, severity: str, message: str) -> None:
+            issues.append(ValidationIssue(row, label, kind, severity, message))
+
+        if not isinstance(ontology_link, str):
+            add("missing_ontology_link", "error", f"The value '{value}' has no ontology link; it is filled in the wrong row")
+            continue
+
+        if not _is_filled(unit):
+            add("missing_unit", "error", f"The value '{value}' has no unit; it is filled in the wrong row")
+        elif unit != "No Unit" and unit not in units:
+            add("unknown_unit", "warning", f"The unit '{unit}' is not listed in the @Units sheet")
+
+        for segment in ontology_link.split("-"):
+            command = segment.split("|", 1)[0] if "|" in segment else None
+            if command is not None and command not in _PATH_COMMANDS:
+                add("unknown_command", "error", f"Unknown command '{command}|' in the ontology link '{ontology_link}'")
+
+    header_issues: list[ValidationIssue] = []
+    for field in REQUIRED_FIELDS:
+        row, value = first_rows.get(field, (None, None))
+        if not _is_filled(value):
+            header_issues.append(
+                ValidationIssue(row, field, "missing_field", "error", f"The required field '{field}' is empty")
+            )
+        elif field in REQUIRED_ID_FIELDS and aux._lookup_unique_id(unique_ids, value) is None:
+            header_issues.append(ValidationIssue(
+                row, field, "missing_unique_id", "error", f"'{value}' has no unique ID in the @Classes sheet"
+            ))
+    versions = [first_rows[field] for field in SCHEMA_VERSION_FIELDS if field in first_rows]
+    if not any(_is_filled(value) for _, value in versions):
+        row = versions[0][0] if versions else None
+        header_issues.append(ValidationIssue(
+            row, SCHEMA_VERSION_FIELDS[0], "missing_schema_version", "error", "The schema version is empty"
+        ))
+    return header_issues + issues
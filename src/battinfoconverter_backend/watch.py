@@ -0,0 +1,361 @@
+"""
+watch.py
+Convert the workbooks dropped into a folder as they arrive.
+
+`FolderWatcher` polls a folder tree for ``.xlsx``/``.xlsm`` files and
+converts the new and changed ones in a bounded worker pool, writing the
+JSON-LD next to each workbook or into a mirrored output tree. Only a few
+jobs per worker are in flight at a time and each job reads its workbook
+itself, so a large drop of files is not loaded into memory at once. It
+keeps an index of ``path -> (size, mtime, SHA-256)`` in a JSON file, saved
+as each job completes, so a restart (even after a crash) only converts what
+changed or was not finished while it was down, and a file that was touched
+but not edited is not converted again. A file is picked up only once its
+size and modification time have stayed the same for ``debounce`` seconds,
+so workbooks still being copied are left alone.
+
+With ``context_base`` set, the inline ``@context`` is written once into the
+output root as a content-addressed file (see `context_export`) and every
+JSON-LD references it by IRI.
+
+Run it from the command line with
+``python -m battinfoconverter_backend.watch FOLDER [--output DIR] [--cache FILE]``.
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+
+import simplejson as json
+
+from .cache import ConversionCache, workbook_digest
+from .context_export import externalise_context, write_context
+from .json_convert import PARALLEL_MODES, VALUE_COLUMN, convert_excel_to_jsonld
+from .output_formats import ENCODING_EXTENSIONS, OUTPUT_ENCODINGS, write_jsonld
+
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm")
+
+# Name of the index file kept in the watched folder unless another path is given.
+INDEX_FILE_NAME = ".battinfo_watch_index.json"
+
+INDEX_VERSION = 1
+
+# Conversions submitted per worker before the watcher waits for one to finish.
+JOBS_PER_WORKER = 2
+
+_HASH_CHUNK = 1 << 20
+
+
+def _file_digest(path: Path) -> str:
+    """The `cache.workbook_digest` of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with path.open("rb") as workbook:
+        while chunk := workbook.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _convert_file(path: str, excel_engine: str) -> tuple[str, dict]:
+    """
+    Pool task: read and convert one workbook (top level, so processes can run it).
+
+    Returns the digest of the bytes converted, which differs from the one the watcher saw if the file was replaced
+    in between.
+    """
+    content = Path(path).read_bytes()
+    return workbook_digest(content), convert_excel_to_jsonld(content, debug_mode=False, excel_engine=excel_engine)
+
+
+class FolderWatcher:
+    """
+    Polls a folder for new or changed workbooks and converts them.
+
+    Attributes:
+        folder (Path): The watched folder; subfolders are watched too.
+        output_dir (Path | None): The root of the output tree, mirroring the folder layout. None writes every
+            JSON-LD next to its workbook.
+        index_path (Path): The JSON file the index is persisted in. Default is a hidden file in `folder`.
+        encoding (str): The output encoding, one of `output_formats.OUTPUT_ENCODINGS`. Default is "json".
+        workers (int): The size of the worker pool. Default is 2.
+        pool (str): "process" or "thread", see `json_convert.PARALLEL_MODES`. Default is "process".
+        debounce (float): Seconds a file's size and modification time must stay unchanged before it is converted.
+        excel_engine (str): The reader used for the sheets, one of `excel_tools.EXCEL_ENGINES`.
+        cache (ConversionCache | None): Reuse the results of workbooks with the same content, e.g. copies.
+        verbose (bool): Print a line per converted or failed workbook.
+        context_base (str | None): Write the inline ``@context`` once into the output root and reference it from
+            every JSON-LD under this base IRI; "" references it by a path relative to each JSON-LD. Default is None
+            (inline contexts).
+    """
+
+    def __init__(
+        self,
+        folder: str | Path,
+        output_dir: str | Path | None = None,
+        index_path: str | Path | None = None,
+        encoding: str = "json",
+        workers: int = 2,
+        pool: str = "process",
+        debounce: float = 5.0,
+        excel_engine: str = "openpyxl",
+        cache: ConversionCache | None = None,
+        verbose: bool = False,
+        context_base: str | None = None,
+    ) -> None:
+        if encoding not in OUTPUT_ENCODINGS:
+            raise ValueError(f"Unknown output encoding '{encoding}', expected one of {OUTPUT_ENCODINGS}")
+        if pool not in PARALLEL_MODES:
+            raise ValueError(f"Unknown pool '{pool}', expected one of {PARALLEL_MODES}")
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        self.folder = Path(folder)
+        if not self.folder.is_dir():
+            raise FileNotFoundError(f"The watched folder '{self.folder}' does not exist")
+        self.output_dir = Path(output_dir) if output_dir is not None else None
+        self.index_path = Path(index_path) if index_path is not None else self.folder / INDEX_FILE_NAME
+        self.encoding = encoding
+        self.workers = workers
+        self.pool = pool
+        self.debounce = debounce
+        self.excel_engine = excel_engine
+        self.cache = cache
+        self.verbose = verbose
+        self.context_base = context_base
+        self.index: dict[str, dict] = self._load_index()
+        self._index_changed = False
+        # files seen changing: relative path -> (size, mtime, first time this size and mtime were seen)
+        self._pending: dict[str, tuple[int, float, float]] = {}
+
+    # ---------------------------------------------------------------- #
+    # index                                                            #
+    # ---------------------------------------------------------------- #
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            with self.index_path.open(encoding="utf-8") as index_file:
+                stored = json.load(index_file)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            # a damaged index only costs a reconversion
+            return {}
+        if stored.get("version") != INDEX_VERSION:
+            return {}
+        return stored.get("files", {})
+
+    def _save_index(self) -> None:
+        """Write the index atomically, so a crash never leaves half of it."""
+        if not self._index_changed:
+            return
+        partial = self.index_path.with_name(self.index_path.name + ".tmp")
+        with partial.open("w", encoding="utf-8") as index_file:
+            json.dump({"version": INDEX_VERSION, "files": self.index}, index_file, indent=1, sort_keys=True)
+        os.replace(partial, self.index_path)
+        self._index_changed = False
+
+    # ---------------------------------------------------------------- #
+    # scanning                                                         #
+    # ---------------------------------------------------------------- #
+    def output_path(self, workbook: Path) -> Path:
+        """The JSON-LD file written for ``workbook``."""
+        name = workbook.stem + ENCODING_EXTENSIONS[self.encoding]
+        if self.output_dir is None:
+            return workbook.with_name(name)
+        return self.output_dir / workbook.relative_to(self.folder).with_name(name)
+
+    def _workbooks(self) -> dict[str, os.stat_result]:
+        found = {}
+        for path in self.folder.rglob("*"):
+            # "~$name.xlsx" are Excel's lock files of open workbooks
+            if path.suffix.lower() not in WORKBOOK_SUFFIXES or path.name.startswith("~$"):
+                continue
+            if self.output_dir is not None and self.output_dir in path.parents:
+                continue
+            try:
+                found[path.relative_to(self.folder).as_posix()] = path.stat()
+            except FileNotFoundError:
+                continue  # removed since listing
+        return found
+
+    def scan(self) -> list[str]:
+        """
+        Lists the workbooks that are new or changed and have settled.
+
+        Also forgets the index entries of removed workbooks.
+
+        Returns:
+            list[str]: The paths relative to `folder`, sorted.
+        """
+        now = time.time()
+        found = self._workbooks()
+        for removed in set(self.index) - set(found):
+            del self.index[removed]
+            self._index_changed = True
+        for gone in set(self._pending) - set(found):
+            del self._pending[gone]
+
+        ready = []
+        for relative, stat in sorted(found.items()):
+            entry = self.index.get(relative)
+            if entry is not None and (entry["size"], entry["mtime"]) == (stat.st_size, stat.st_mtime):
+                self._pending.pop(relative, None)
+                continue
+            size, mtime, since = self._pending.get(relative, (None, None, now))
+            if (size, mtime) != (stat.st_size, stat.st_mtime):
+                since = now
+                self._pending[relative] = (stat.st_size, stat.st_mtime, since)
+            if now - since >= self.debounce:
+                ready.append(relative)
+        return ready
+
+    # ---------------------------------------------------------------- #
+    # converting                                                       #
+    # ---------------------------------------------------------------- #
+    def _record(self, relative: str, stat: os.stat_result, digest: str, error: str | None) -> None:
+        self.index[relative] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest, "error": error}
+        self._pending.pop(relative, None)
+        self._index_changed = True
+
+    def run_once(self) -> dict[str, str]:
+        """
+        Scans the folder once and converts every new or changed workbook that has settled.
+
+        Returns:
+            dict[str, str]: The status of each handled workbook by path relative to `folder`: "converted", "cached"
+                (result taken from `cache`), "unchanged" (touched but the same content) or "failed: <message>".
+        """
+        statuses: dict[str, str] = {}
+        # running conversion -> (relative path, stat and digest of the file when it was submitted)
+        jobs: dict[Future, tuple[str, os.stat_result, str]] = {}
+        executor_cls = ProcessPoolExecutor if self.pool == "process" else ThreadPoolExecutor
+        ready = self.scan()
+        if not ready:
+            self._save_index()
+            return statuses
+
+        with executor_cls(max_workers=self.workers) as executor:
+            for relative in ready:
+                path = self.folder / relative
+                try:
+                    stat = path.stat()
+                    digest = _file_digest(path)
+                except FileNotFoundError:
+                    continue
+                previous = self.index.get(relative)
+                if previous is not None and previous["sha256"] == digest and (
+                    previous["error"] is not None or self.output_path(path).exists()
+                ):
+                    self._record(relative, stat, digest, previous["error"])
+                    statuses[relative] = "unchanged"
+                    continue
+                cached = self.cache.get(digest, VALUE_COLUMN) if self.cache is not None else None
+                if cached is not None:
+                    self._write(path, cached)
+                    self._record(relative, stat, digest, None)
+                    statuses[relative] = "cached"
+                    self._save_index()
+                    continue
+                if len(jobs) >= self.workers * JOBS_PER_WORKER:
+                    done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        statuses.update(self._finish(future, *jobs.pop(future)))
+                jobs[executor.submit(_convert_file, str(path), self.excel_engine)] = (relative, stat, digest)
+
+            for future in as_completed(list(jobs)):
+                statuses.update(self._finish(future, *jobs.pop(future)))
+
+        self._save_index()
+        if self.verbose:
+            for relative, status in statuses.items():
+                print(f"{relative}: {status}")
+        return statuses
+
+    def _finish(self, future: Future, relative: str, stat: os.stat_result, digest: str) -> dict[str, str]:
+        """Write the result of a completed job, record it and save the index; returns its status."""
+        try:
+            digest, jsonld = future.result()
+        except Exception as exc:  # any failure is reported per file, the watcher keeps running
+            self._record(relative, stat, digest, str(exc))
+            self._save_index()
+            return {relative: f"failed: {exc}"}
+        if self.cache is not None:
+            self.cache.put(digest, VALUE_COLUMN, jsonld)
+        self._write(self.folder / relative, jsonld)
+        self._record(relative, stat, digest, None)
+        self._save_index()
+        return {relative: "converted"}
+
+    def _write(self, workbook: Path, jsonld: dict) -> None:
+        target = self.output_path(workbook)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if self.context_base is not None:
+            root = self.output_dir if self.output_dir is not None else self.folder
+            base = self.context_base
+            if not base:
+                base = Path(os.path.relpath(root, target.parent)).as_posix() + "/"
+                base = "" if base == "./" else base
+            jsonld, name, context_document = externalise_context(jsonld, base)
+            write_context(context_document, root, name)
+        write_jsonld(jsonld, target, self.encoding)
+
+    def run(self, interval: float = 10.0, stop: threading.Event | None = None) -> None:
+        """
+        Polls the folder until ``stop`` is set (or forever).
+
+        Args:
+            interval (float): Seconds between two scans. Default is 10.
+            stop (threading.Event | None): Set it to end the loop after the current scan. Default is None.
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            self.run_once()
+            stop.wait(interval)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command-line entry point, see ``--help``."""
+    parser = argparse.ArgumentParser(description="Convert BattINFO workbooks dropped into a folder to JSON-LD.")
+    parser.add_argument("folder", type=Path, help="the folder to watch, subfolders included")
+    parser.add_argument("--output", type=Path, help="write the JSON-LD into this tree instead of next to the workbooks")
+    parser.add_argument("--index", type=Path, help=f"the index file (default: FOLDER/{INDEX_FILE_NAME})")
+    parser.add_argument("--cache", type=Path, help="a conversion cache file shared with other runs")
+    parser.add_argument("--encoding", choices=OUTPUT_ENCODINGS, default="json")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between two scans")
+    parser.add_argument("--debounce", type=float, default=5.0, help="seconds a file must stay unchanged")
+    parser.add_argument("--once", action="store_true", help="scan once and exit")
+    parser.add_argument(
+        "--context-base",
+        metavar="IRI",
+        help="write the @context once into the output root and reference it under this base IRI ('' for relative)",
+    )
+    args = parser.parse_args(argv)
+
+    cache = ConversionCache(args.cache) if args.cache is not None else None
+    watcher = FolderWatcher(
+        args.folder,
+        output_dir=args.output,
+        index_path=args.index,
+        encoding=args.encoding,
+        workers=args.workers,
+        debounce=0.0 if args.once else args.debounce,
+        cache=cache,
+        verbose=True,
+        context_base=args.context_base,
+    )
+    try:
+        if args.once:
+            watcher.run_once()
+        else:
+            watcher.run(interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Test module for the JSON-LD building helpers."""
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from battinfoconverter_backend.auxiliary import JsonLdNode, add_to_structure, structure_builder
+from battinfoconverter_backend.json_convert import ExcelContainer, create_jsonld_header, create_jsonld_with_conditions
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_JSON_PATH = FIXTURE_DIR / "BattINFO_converter_BattINFO_converter_standard_JSON_version_1.1.15.json"
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+STANDARD_CATALYSIS_EXCEL_PATH = FIXTURE_DIR / "standard_catalysis_excel_schema.xlsx"
+
+
+def test_jsonld_node_round_trip_keeps_structure_and_key_order():
+    """Converting a document to nodes and back must not change it."""
+    with STANDARD_JSON_PATH.open(encoding="utf-8") as json_file:
+        expected = json.load(json_file)
+
+    materialised = JsonLdNode.from_dict(expected).to_dict()
+
+    assert materialised == expected
+    assert json.dumps(materialised) == json.dumps(expected)
+
+
+def test_jsonld_node_type_merging():
+    """A second type promotes ``@type`` to a list, a duplicate does not."""
+    node = JsonLdNode("Electrode")
+    node.props["hasCoating"] = JsonLdNode()
+    node.add_type("Electrode")
+    assert node.to_dict() == {"@type": "Electrode", "hasCoating": {}}
+
+    node.add_type("PositiveElectrode")
+    assert node.to_dict()["@type"] == ["Electrode", "PositiveElectrode"]
+    assert not node.is_bare
+    assert JsonLdNode("Binder").is_bare
+
+
+@pytest.mark.parametrize("excel_path", [STANDARD_EXCEL_PATH, STANDARD_CATALYSIS_EXCEL_PATH])
+def test_structure_builder_builds_a_plain_dict_one_row_at_a_time(excel_path: Path) -> None:
+    """Rows added call by call to the node of a plain dictionary, with comments in between, give the full document."""
+    container = ExcelContainer(excel_path)
+    expected = create_jsonld_with_conditions(container)
+
+    jsonld = create_jsonld_header(container)
+    comments, creator = jsonld["rdfs:comment"], jsonld["schema:creator"]
+    schema = container.data["schema"]
+    with structure_builder(jsonld, container) as root:
+        for metadata, value, unit, ontology_link in zip(
+            schema["Metadata"], schema["Value"], schema["Unit"], schema["Ontology link"]
+        ):
+            if pd.isna(value) or ontology_link == "NotOntologize":
+                continue
+            if ontology_link == "Comment":
+                comment = f"{metadata}: {value}" if unit == "No Unit" else f"{metadata}: {value} {unit}"
+                root.props["rdfs:comment"].append(comment)
+                continue
+            add_to_structure(root, ontology_link.split("-"), value, unit, container, metadata=metadata)
+
+    assert jsonld == expected
+    # written back in place: what the caller held is still part of the document
+    assert jsonld["rdfs:comment"] is comments and jsonld["schema:creator"] is creator
+    with pytest.raises(TypeError, match="structure_builder"):
+        add_to_structure(jsonld, ["hasElectrolyte"], 1, "No Unit", container)
@@ -0,0 +1,54 @@
+"""Test module for converting uploaded workbooks as a batch."""
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend.batch import BatchResult, convert_workbooks, output_file_name, write_zip
+from battinfoconverter_backend.json_convert import convert_excel_to_jsonld
+from battinfoconverter_backend.output_formats import decode_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def test_batch_reports_each_workbook() -> None:
+    """Every workbook gets a result; a broken one fails alone."""
+    content = STANDARD_EXCEL_PATH.read_bytes()
+    workbooks = [("cell_1.xlsx", content), ("broken.xlsx", b"not a workbook"), ("cell_2.xlsx", content)]
+
+    results = {result.name: result for result in convert_workbooks(workbooks, workers=2)}
+
+    assert set(results) == {"cell_1.xlsx", "broken.xlsx", "cell_2.xlsx"}
+    expected = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+    assert results["cell_1.xlsx"].jsonld == expected
+    assert results["cell_2.xlsx"].jsonld == expected
+    assert results["broken.xlsx"].jsonld is None and results["broken.xlsx"].error
+
+    with pytest.raises(ValueError):
+        list(convert_workbooks(workbooks, pool="fiber"))
+
+
+@pytest.mark.parametrize("encoding", ["json", "json-gzip"])
+def test_zip_holds_one_entry_per_converted_workbook(encoding: str) -> None:
+    """Failed results are left out and workbooks of the same name do not overwrite each other."""
+    document = {"@type": "CoinCell", "schema:productID": "cell"}
+    results = [
+        BatchResult("cell.xlsx", jsonld=document),
+        BatchResult("lab/cell.xlsx", jsonld={**document, "schema:productID": "other"}),
+        BatchResult("broken.xlsx", error="not a workbook"),
+    ]
+    buffer = io.BytesIO()
+
+    entries = write_zip(results, buffer, encoding)
+
+    assert entries == {
+        "cell.xlsx": output_file_name("cell.xlsx", encoding),
+        "lab/cell.xlsx": output_file_name("cell (2).xlsx", encoding),
+    }
+    with zipfile.ZipFile(buffer) as archive:
+        assert archive.namelist() == list(entries.values())
+        assert decode_jsonld(archive.read(entries["cell.xlsx"]), encoding) == document
+        assert decode_jsonld(archive.read(entries["lab/cell.xlsx"]), encoding)["schema:productID"] == "other"
@@ -0,0 +1,62 @@
+"""Test module for the precompiled template bundles."""
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from battinfoconverter_backend.bundles import build_bundle, load_bundle, write_bundle
+from battinfoconverter_backend.excel_tools import ReadLimits, WorkbookLimitError
+from battinfoconverter_backend.json_convert import SHEET_NAMES, ExcelContainer, convert_excel_to_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+REFERENCE_DIR = FIXTURE_DIR.parent / "Excel for reference"
+
+LOOKUP_SHEETS = {key: names for key, names in SHEET_NAMES.items() if key != "schema"}
+
+
+def test_bundle_round_trip(tmp_path: Path) -> None:
+    """A stored bundle gives the lookup sheets exactly as read, and only for workbooks with the same sheets."""
+    path = write_bundle(build_bundle(STANDARD_EXCEL_PATH, LOOKUP_SHEETS), tmp_path)
+    sheets = load_bundle(STANDARD_EXCEL_PATH.read_bytes(), LOOKUP_SHEETS, directory=tmp_path)
+
+    expected = ExcelContainer(STANDARD_EXCEL_PATH).data
+    assert sheets is not None and list(sheets) == list(LOOKUP_SHEETS)
+    for key, sheet in sheets.items():
+        assert list(sheet.columns) == list(expected[key].columns)
+        assert sheet.equals(expected[key])
+
+    # the shipped 1.1.15 template has other @Classes entries than the fixture, so it must not match
+    reference = REFERENCE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15_filled.xlsx"
+    assert load_bundle(reference, LOOKUP_SHEETS, directory=tmp_path) is None
+    assert path.parent == tmp_path
+
+
+def test_conversion_with_shipped_bundles() -> None:
+    """Converting with bundles gives the same JSON-LD, with or without a matching bundle."""
+    reference = REFERENCE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15_filled.xlsx"
+    container = ExcelContainer(reference, engine="native", use_bundles=True)
+    assert load_bundle(reference, LOOKUP_SHEETS) is not None
+    assert list(container.data) == list(SHEET_NAMES)
+
+    for workbook in (reference, STANDARD_EXCEL_PATH):
+        assert convert_excel_to_jsonld(workbook, debug_mode=False, use_bundles=True) == convert_excel_to_jsonld(
+            workbook, debug_mode=False
+        )
+
+
+def test_bundle_lookup_applies_read_limits(tmp_path: Path) -> None:
+    """Hashing the lookup sheets to find a bundle is bounded like reading them."""
+    wb = load_workbook(STANDARD_EXCEL_PATH)
+    wb["@Units"].cell(row=5000, column=2, value="padding")
+    oversized = tmp_path / "oversized.xlsx"
+    wb.save(oversized)
+    limits = ReadLimits(max_rows=1000).start()
+
+    with pytest.raises(WorkbookLimitError, match="Sheet '@Units': .*down to row 5000"):
+        load_bundle(oversized, LOOKUP_SHEETS, limits=limits)
+    with pytest.raises(WorkbookLimitError, match="Sheet '@Units'"):
+        ExcelContainer(oversized, use_bundles=True, limits=ReadLimits(max_rows=1000))
+    write_bundle(build_bundle(STANDARD_EXCEL_PATH, LOOKUP_SHEETS), tmp_path)
+    assert load_bundle(STANDARD_EXCEL_PATH, LOOKUP_SHEETS, directory=tmp_path, limits=limits) is not None
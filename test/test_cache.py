@@ -0,0 +1,54 @@
+"""Test module for the persistent conversion cache."""
+from pathlib import Path
+
+from battinfoconverter_backend.cache import ConversionCache, workbook_digest
+from battinfoconverter_backend.json_convert import convert_excel_columns_to_jsonld, convert_excel_to_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def test_cached_conversion_matches_conversion(tmp_path: Path) -> None:
+    """A cache hit gives the same document, also to the multi-cell conversion, without loading the workbook."""
+    expected = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+    with ConversionCache(tmp_path / "cache.sqlite") as cache:
+        assert convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, cache=cache) == expected
+        assert len(cache) == 1
+        # the bytes are the key, not the file name
+        assert convert_excel_to_jsonld(STANDARD_EXCEL_PATH.read_bytes(), debug_mode=False, cache=cache) == expected
+        assert len(cache) == 1
+
+        assert list(convert_excel_columns_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, cache=cache)) == [
+            ("Value", expected)
+        ]
+        # now the value columns are cached as well, and the workbook is not loaded again
+        assert dict(convert_excel_columns_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, cache=cache)) == {
+            "Value": expected
+        }
+
+    with ConversionCache(tmp_path / "cache.sqlite", version="0.0.0") as other_release:
+        assert other_release.get(workbook_digest(STANDARD_EXCEL_PATH.read_bytes()), "Value") is None
+
+
+def test_cache_integrity_and_eviction(tmp_path: Path) -> None:
+    """Damaged entries are dropped, and the least recently used entries go first."""
+    document = {"@type": "CoinCell", "schema:productID": "x" * 2000, "hasNumberValue": 6.6}
+    with ConversionCache(tmp_path / "cache.sqlite") as cache:
+        cache.put("a", "Value", document)
+        assert cache.get("a", "Value") == document
+        cache._connection.execute("UPDATE results SET payload = X'00'")
+        assert cache.get("a", "Value") is None
+        assert len(cache) == 0
+
+    with ConversionCache(tmp_path / "small.sqlite", max_bytes=1) as cache:
+        cache.put("a", "Value", document)
+        assert len(cache) == 0  # larger than the whole cache
+
+        cache.max_bytes = 10**6
+        for digest in "abc":
+            cache.put(digest, "Value", {**document, "@id": digest})
+        cache.max_bytes = cache.total_bytes
+        cache.get("a", "Value")  # now b is the least recently used
+        cache.put("d", "Value", {**document, "@id": "d"})
+        assert [digest for digest in "abcd" if cache.get(digest, "Value") is not None] == ["a", "c", "d"]
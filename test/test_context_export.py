@@ -0,0 +1,57 @@
+"""Test module for writing the @context as a separate document."""
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend.context_export import context_file_name, externalise_context, write_context
+from battinfoconverter_backend.rdf_export import iter_statements
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_JSON_PATH = FIXTURE_DIR / "BattINFO_converter_BattINFO_converter_standard_JSON_version_1.1.15.json"
+
+BATTERY_CONTEXT = "https://w3id.org/emmo/domain/battery/context"
+# Stand-in for the bundled battery context so the test does not depend on its term IRIs.
+TEST_CONTEXTS = {BATTERY_CONTEXT: {"@vocab": "https://example.org/battery#"}}
+
+BASE_IRI = "https://example.org/contexts/"
+
+
+def _load_reference() -> dict:
+    with STANDARD_JSON_PATH.open(encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def test_externalised_context_gives_the_same_statements(tmp_path: Path) -> None:
+    """The reference resolves to the same triples as the inline context, and the file is content-addressed."""
+    jsonld = _load_reference()
+    original = copy.deepcopy(jsonld)
+    document, name, context_document = externalise_context(jsonld, BASE_IRI)
+
+    assert jsonld == original
+    assert document["@context"] == [BATTERY_CONTEXT, BASE_IRI + name]
+    assert {key: value for key, value in document.items() if key != "@context"} == {
+        key: value for key, value in jsonld.items() if key != "@context"
+    }
+    assert context_document == {"@context": jsonld["@context"][1]}
+
+    contexts = {**TEST_CONTEXTS, BASE_IRI + name: context_document["@context"]}
+    assert list(iter_statements(document, contexts=contexts)) == list(iter_statements(jsonld, contexts=TEST_CONTEXTS))
+
+    path = write_context(context_document, tmp_path, name)
+    assert path == tmp_path / name
+    assert json.loads(path.read_text(encoding="utf-8")) == context_document
+
+
+def test_context_file_name_follows_the_content() -> None:
+    """Key order does not change the name, content does; documents without inline context are rejected."""
+    context = _load_reference()["@context"][1]
+    reordered = dict(reversed(list(context.items())))
+    assert context_file_name(reordered) == context_file_name(context)
+    assert context_file_name({**context, "ex": "https://example.org/"}) != context_file_name(context)
+    assert externalise_context({"@context": context})[0] == {"@context": context_file_name(context)}
+
+    with pytest.raises(ValueError, match="inline @context"):
+        externalise_context({"@context": BATTERY_CONTEXT})
@@ -0,0 +1,40 @@
+"""Test module for rendering workbook variants."""
+import json
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend.converter import Converter
+from battinfoconverter_backend.json_convert import convert_excel_to_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def _molarity(jsonld: dict) -> object:
+    solute = jsonld["hasElectrolyte"]["hasSolute"]["hasConstituent"][0]
+    return solute["hasMeasuredProperty"]["hasNumericalPart"]["hasNumberValue"]
+
+
+def test_render_without_overrides_matches_conversion() -> None:
+    """A render without overrides is the normal conversion of the workbook."""
+    converter = Converter.from_workbook(STANDARD_EXCEL_PATH)
+    expected = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+    assert json.dumps(converter.render(), default=str) == json.dumps(expected, default=str)
+
+
+def test_render_overrides_are_independent() -> None:
+    """Each variant only carries its own overrides."""
+    converter = Converter.from_workbook(STANDARD_EXCEL_PATH)
+    variants = [converter.render({"Electrolyte solute A molarity": molarity}) for molarity in (0.8, 1.2)]
+    assert [_molarity(variant) for variant in variants] == [0.8, 1.2]
+    assert _molarity(converter.render()) == 1
+
+    cleared = converter.render({"Electrolyte density": None})
+    assert all(prop["@type"] != "Density" for prop in cleared["hasElectrolyte"]["hasMeasuredProperty"])
+
+    with pytest.raises(ValueError, match="Electrolyte molarity"):
+        converter.render({"Electrolyte molarity": 1})
+    with pytest.raises(ValueError):
+        converter.render({"Cell ID": None})
@@ -0,0 +1,58 @@
+"""Test module for merging conversions into one dataset."""
+import copy
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend.converter import Converter
+from battinfoconverter_backend.dataset import merge_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def _inline(value, nodes: dict):
+    """Replace node references by the nodes again."""
+    if isinstance(value, list):
+        return [_inline(item, nodes) for item in value]
+    if isinstance(value, dict):
+        if set(value) == {"@id"} and value["@id"] in nodes:
+            return _inline(nodes[value["@id"]], nodes)
+        return {key: _inline(item, nodes) for key, item in value.items()}
+    return value
+
+
+def test_merge_jsonld_shares_context_and_identified_nodes() -> None:
+    """The dataset holds each identified node once and expands back to the original documents."""
+    converter = Converter.from_workbook(STANDARD_EXCEL_PATH)
+    documents = [converter.render({"Cell ID": f"Empa-bco-{number:06d}"}) for number in range(3)]
+    originals = copy.deepcopy(documents)
+
+    dataset = merge_jsonld(documents)
+    assert documents == originals
+    assert dataset["@context"] == documents[0]["@context"]
+    cells, nodes = dataset["@graph"][:3], dataset["@graph"][3:]
+    assert [cell["schema:productID"] for cell in cells] == ["Empa-bco-000000", "Empa-bco-000001", "Empa-bco-000002"]
+    assert len({node["@id"] for node in nodes}) == len(nodes) == 4
+    assert cells[0]["schema:creator"] == {"@id": "https://orcid.org/0000-0002-5003-1134"}
+
+    by_id = {node["@id"]: node for node in nodes}
+    assert [{"@context": dataset["@context"], **_inline(cell, by_id)} for cell in cells] == documents
+
+
+def test_merge_jsonld_conflicts() -> None:
+    """Different contexts are rejected, and a differently described @id stays inline."""
+    first = {"@context": ["ctx"], "@type": "CoinCell", "maker": {"@id": "x:lab", "name": "Lab"}}
+    second = {"@context": ["ctx"], "@type": "CoinCell", "maker": {"@id": "x:lab", "name": "Lab AG"}}
+    dataset = merge_jsonld([first, second])
+    assert dataset["@graph"] == [
+        {"@type": "CoinCell", "maker": {"@id": "x:lab"}},
+        {"@type": "CoinCell", "maker": {"@id": "x:lab", "name": "Lab AG"}},
+        {"@id": "x:lab", "name": "Lab"},
+    ]
+
+    with pytest.raises(ValueError, match="different @context"):
+        merge_jsonld([first, {**second, "@context": ["other"]}])
+    with pytest.raises(ValueError):
+        merge_jsonld([])
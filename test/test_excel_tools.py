@@ -0,0 +1,198 @@
+"""Test module for the Excel reading helpers."""
+import io
+import time
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from battinfoconverter_backend import excel_tools
+from battinfoconverter_backend.excel_tools import read_excel_preserve_decimals
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+REFERENCE_DIR = FIXTURE_DIR.parent / "Excel for reference"
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def _typed(rows: list[list]) -> list[list[tuple]]:
+    """Pair every value with its type so ints, floats and strings are compared strictly."""
+    return [[(type(value), value) for value in row] for row in rows]
+
+
+def test_native_engine_matches_openpyxl_for_reference_workbooks() -> None:
+    """The native reader must give exactly the rows openpyxl gives, for every sheet we ship."""
+    workbooks = sorted(REFERENCE_DIR.glob("*.xlsx")) + sorted(FIXTURE_DIR.glob("*.xlsx"))
+    assert workbooks
+
+    for workbook_path in workbooks:
+        wb = load_workbook(workbook_path, data_only=True)
+        for ws in wb.worksheets:
+            last_row, last_column = excel_tools._value_extent(ws)
+            rows = ws.iter_rows(max_row=last_row, max_col=last_column)
+            expected = [[excel_tools._clean_cell(c) for c in row] for row in rows]
+            native = excel_tools._read_rows_native(workbook_path, ws.title)
+            assert native is not None, f"{workbook_path.name}:{ws.title} fell back to openpyxl"
+            assert _typed(native) == _typed(expected), f"{workbook_path.name}:{ws.title}"
+
+
+def test_native_engine_dataframe_and_missing_sheet() -> None:
+    """The DataFrame shape matches and a missing sheet raises ``KeyError`` like openpyxl."""
+    with STANDARD_EXCEL_PATH.open("rb") as f:
+        native = read_excel_preserve_decimals(f, sheet_name="@Schema", engine="native")
+        reference = read_excel_preserve_decimals(f, sheet_name="@Schema")
+    assert native.shape == reference.shape
+    assert list(native.columns) == list(reference.columns)
+    assert native.equals(reference)
+
+    with pytest.raises(KeyError):
+        read_excel_preserve_decimals(STANDARD_EXCEL_PATH, sheet_name="Schema", engine="native")
+    with pytest.raises(ValueError):
+        read_excel_preserve_decimals(STANDARD_EXCEL_PATH, engine="xlrd")
+
+
+def test_workbook_buffer_sources() -> None:
+    """Every kind of source exposes the same bytes, and file handles are left usable."""
+    expected = STANDARD_EXCEL_PATH.read_bytes()
+    with excel_tools.workbook_buffer(STANDARD_EXCEL_PATH) as view:
+        assert view == expected
+    with excel_tools.workbook_buffer(memoryview(expected)) as view:
+        assert view == expected
+
+    with STANDARD_EXCEL_PATH.open("rb") as f:
+        f.read()  # an already consumed handle
+        with excel_tools.workbook_buffer(f) as view:
+            assert view == expected
+        assert read_excel_preserve_decimals(f, sheet_name="@Schema").equals(
+            read_excel_preserve_decimals(expected, sheet_name="@Schema")
+        )
+
+    reader = excel_tools._BufferReader(expected)
+    assert reader.seek(-4, io.SEEK_END) == len(expected) - 4
+    assert reader.read() == expected[-4:]
+    assert reader.read(10) == b""
+
+
+def test_nrows_keeps_the_first_rows_unchanged() -> None:
+    """Reading only the first rows gives the same rows, columns included, as cutting a full read."""
+    for engine in ("native", "openpyxl"):
+        full = read_excel_preserve_decimals(STANDARD_EXCEL_PATH, sheet_name="@Schema", engine=engine)
+        for nrows in (0, 12, len(full), len(full) + 5):
+            head = read_excel_preserve_decimals(STANDARD_EXCEL_PATH, sheet_name="@Schema", engine=engine, nrows=nrows)
+            assert list(head.columns) == list(full.columns)
+            assert head.equals(full.iloc[:nrows])
+
+    assert excel_tools.read_sheet_names(STANDARD_EXCEL_PATH.read_bytes()) == [
+        "@Schema", "@Context", "@Predicates", "@Classes", "@Units"
+    ]
+
+
+def test_formatted_empty_cells_do_not_extend_the_sheet(tmp_path: Path) -> None:
+    """Rows and columns that are only formatted are trimmed; the rows with values come out as before."""
+    from openpyxl.styles import Font
+
+    wb = load_workbook(STANDARD_EXCEL_PATH)
+    ws = wb["@Units"]
+    n_rows = ws.max_row
+    for row in range(1, 3001):
+        ws.cell(row=row, column=40).font = Font(bold=True)
+    ws.cell(row=n_rows + 2, column=1).font = Font(italic=True)
+    formatted = tmp_path / "formatted.xlsx"
+    wb.save(formatted)
+    # a value after a gap of empty rows is still read
+    ws.cell(row=2500, column=2, value="late")
+    late_path = tmp_path / "late.xlsx"
+    wb.save(late_path)
+
+    for engine in ("native", "openpyxl"):
+        expected = read_excel_preserve_decimals(STANDARD_EXCEL_PATH, sheet_name="@Units", engine=engine)
+        df = read_excel_preserve_decimals(formatted, sheet_name="@Units", engine=engine)
+        assert list(df.columns) == ["Item", "Key"]
+        assert df.equals(expected)
+
+        late = read_excel_preserve_decimals(late_path, sheet_name="@Units", engine=engine)
+        assert len(late) == 2499 and late.iloc[-1].tolist() == [None, "late"]
+        assert late.iloc[: len(df)].equals(df)
+
+
+def test_sheets_are_read_from_a1(tmp_path: Path) -> None:
+    """Leading empty rows and columns are kept, as in pandas, so a table starting at B2 has unnamed headers."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    for row in ws["B2:C3"]:
+        for cell in row:
+            cell.value = cell.coordinate
+    offset = tmp_path / "offset.xlsx"
+    wb.save(offset)
+
+    for engine in ("native", "openpyxl"):
+        df = read_excel_preserve_decimals(offset, engine=engine)
+        assert list(df.columns) == ["Unnamed: 0", "Unnamed: 1", "Unnamed: 2"]
+        assert df.values.tolist() == [[None, "B2", "C2"], [None, "B3", "C3"]]
+
+
+def test_read_limits_stop_oversized_workbooks_early() -> None:
+    """Each bound raises a WorkbookLimitError naming it, on both engines; the defaults leave the templates alone."""
+    from battinfoconverter_backend.excel_tools import ReadLimits, WorkbookLimitError
+
+    content = STANDARD_EXCEL_PATH.read_bytes()
+    breaches = {
+        "expands to": ReadLimits(max_uncompressed_bytes=100_000),
+        "down to row": ReadLimits(max_rows=99),
+        "cells": ReadLimits(max_cells=500),
+        "longer than": ReadLimits(max_seconds=1.0, deadline=time.monotonic() - 1),
+    }
+    for engine in ("native", "openpyxl"):
+        for message, limits in breaches.items():
+            with pytest.raises(WorkbookLimitError, match=message):
+                read_excel_preserve_decimals(content, sheet_name="@Schema", engine=engine, limits=limits)
+
+        bounded = read_excel_preserve_decimals(content, sheet_name="@Schema", engine=engine, limits=ReadLimits())
+        assert bounded.equals(read_excel_preserve_decimals(content, sheet_name="@Schema", engine=engine))
+        # only the rows read count against the row bound
+        head = read_excel_preserve_decimals(
+            content, sheet_name="@Schema", engine=engine, nrows=20, limits=ReadLimits(max_rows=30)
+        )
+        assert len(head) == 20
+
+
+def test_read_limits_stop_openpyxl_before_loading_the_workbook(tmp_path: Path, monkeypatch) -> None:
+    """The openpyxl engine streams an oversized sheet and rejects it without loading the whole workbook."""
+    from openpyxl import Workbook
+
+    from battinfoconverter_backend.excel_tools import ReadLimits, WorkbookLimitError
+
+    wb = Workbook()
+    wb.active["A1"], wb.active["A500"] = "Item", "late"
+    oversized = tmp_path / "oversized.xlsx"
+    wb.save(oversized)
+    loads = []
+
+    def counting_load_workbook(*args, **kwargs):
+        loads.append(kwargs.get("read_only", False))
+        return load_workbook(*args, **kwargs)
+
+    monkeypatch.setattr(excel_tools, "load_workbook", counting_load_workbook)
+    with pytest.raises(WorkbookLimitError, match="down to row 500"):
+        read_excel_preserve_decimals(oversized, engine="openpyxl", limits=ReadLimits(max_rows=100))
+    assert loads == [True]
+
+
+def test_read_limits_apply_to_the_whole_conversion() -> None:
+    """The conversion stops on a breach with an error that is still a ValueError."""
+    from battinfoconverter_backend.excel_tools import ReadLimits, WorkbookLimitError
+    from battinfoconverter_backend.json_convert import convert_excel_to_jsonld
+
+    limits = ReadLimits(max_rows=50)
+    for parallel in (None, "thread"):
+        with pytest.raises(WorkbookLimitError, match="Sheet '@Schema'"):
+            convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, parallel_sheets=parallel, limits=limits)
+    with pytest.raises(ValueError, match="expands to"):
+        convert_excel_to_jsonld(
+            STANDARD_EXCEL_PATH, debug_mode=False, use_bundles=True, limits=ReadLimits(max_uncompressed_bytes=1000)
+        )
+    assert convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, limits=ReadLimits()) == convert_excel_to_jsonld(
+        STANDARD_EXCEL_PATH, debug_mode=False
+    )
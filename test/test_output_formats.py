@@ -0,0 +1,59 @@
+"""Test module for the JSON-LD output encodings."""
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+import simplejson as json
+
+from battinfoconverter_backend import output_formats
+from battinfoconverter_backend.output_formats import (
+    OUTPUT_ENCODINGS,
+    decode_jsonld,
+    encode_jsonld,
+    read_jsonld,
+    write_jsonld,
+)
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_JSON_PATH = FIXTURE_DIR / "BattINFO_converter_BattINFO_converter_standard_JSON_version_1.1.15.json"
+
+OPTIONAL_PACKAGES = {"json-zstd": "zstandard", "cbor": "cbor2", "msgpack": "msgpack"}
+
+
+def _load_reference() -> dict:
+    with STANDARD_JSON_PATH.open(encoding="utf-8") as json_file:
+        jsonld = json.load(json_file, use_decimal=True)
+    jsonld["hasTestValue"] = {"hasNumericalPart": Decimal("2.50"), "note": "µm, ±"}
+    return jsonld
+
+
+@pytest.mark.parametrize("encoding", OUTPUT_ENCODINGS)
+def test_encodings_round_trip(encoding: str, tmp_path: Path) -> None:
+    """Every encoding reads back to the same document, keeping Decimal digits."""
+    if encoding in OPTIONAL_PACKAGES:
+        pytest.importorskip(OPTIONAL_PACKAGES[encoding])
+    jsonld = _load_reference()
+
+    decoded = decode_jsonld(encode_jsonld(jsonld, encoding), encoding)
+    assert decoded == jsonld
+    assert str(decoded["hasTestValue"]["hasNumericalPart"]) == "2.50"
+
+    path = write_jsonld(jsonld, tmp_path / f"out{output_formats.ENCODING_EXTENSIONS[encoding]}")
+    assert output_formats.encoding_from_path(path) == encoding
+    assert read_jsonld(path) == jsonld
+
+
+def test_compact_encodings_are_smaller_and_stable() -> None:
+    """The compact encodings shrink the pretty output and are deterministic."""
+    jsonld = _load_reference()
+    pretty = encode_jsonld(jsonld)
+    assert pretty.decode("utf-8") == json.dumps(jsonld, indent=4, use_decimal=True)
+    assert len(encode_jsonld(jsonld, "json-min")) < len(pretty)
+    assert len(encode_jsonld(jsonld, "json-gzip")) < len(encode_jsonld(jsonld, "json-min"))
+    assert encode_jsonld(jsonld, "json-gzip") == encode_jsonld(jsonld, "json-gzip")
+
+    with pytest.raises(ValueError):
+        encode_jsonld(jsonld, "yaml")
+    with pytest.raises(ValueError):
+        output_formats.encoding_from_path("out.txt")
@@ -0,0 +1,79 @@
+"""Test module for the N-Triples / N-Quads export."""
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend import rdf_export
+from battinfoconverter_backend.rdf_export import download_contexts, iter_statements, write_ntriples
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_JSON_PATH = FIXTURE_DIR / "BattINFO_converter_BattINFO_converter_standard_JSON_version_1.1.15.json"
+
+BATTERY_CONTEXT = "https://w3id.org/emmo/domain/battery/context"
+# Stand-in for the bundled battery context so the test does not depend on its term IRIs.
+TEST_CONTEXTS = {
+    BATTERY_CONTEXT: {
+        "@vocab": "https://example.org/battery#",
+        "hasMeasurementUnit": {"@id": "https://example.org/battery#hasMeasurementUnit", "@type": "@id"},
+    }
+}
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+
+
+def _load_reference() -> dict:
+    with STANDARD_JSON_PATH.open(encoding="utf-8") as json_file:
+        return json.load(json_file)
+
+
+def test_ntriples_are_stable_and_resolved_with_the_context() -> None:
+    """Blank node labels follow document order, and terms, prefixes and numbers are resolved."""
+    jsonld = _load_reference()
+    lines = list(iter_statements(jsonld, contexts=TEST_CONTEXTS))
+
+    assert lines == list(iter_statements(_load_reference(), contexts=TEST_CONTEXTS))
+    assert len(lines) == len(set(lines))
+    assert lines[0] == f"_:b0 {RDF_TYPE} <https://example.org/battery#CoinCell> .\n"
+    # "schema" does not end with a separator, so JSON-LD 1.1 keeps schema:version as an absolute IRI
+    assert '_:b0 <schema:version> "1.1.15" .\n' in lines
+    assert '_:b4 <https://example.org/battery#hasNumberValue> "15"^^<http://www.w3.org/2001/XMLSchema#integer> .\n' in lines
+    assert any(line.endswith('"6.6E0"^^<http://www.w3.org/2001/XMLSchema#double> .\n') for line in lines)
+    assert "_:b3 <https://example.org/battery#hasMeasurementUnit> <https://w3id.org/emmo#MicroMetre> .\n" in lines
+
+
+def test_nquads_streaming_and_undefined_terms(tmp_path: Path) -> None:
+    """A graph name gives N-Quads; terms missing from the context are reported."""
+    jsonld = _load_reference()
+    stream = io.StringIO()
+    count = write_ntriples(jsonld, stream, graph="https://example.org/cells/1", contexts=TEST_CONTEXTS)
+    lines = stream.getvalue().splitlines()
+    assert count == len(lines) == len(list(iter_statements(jsonld, contexts=TEST_CONTEXTS)))
+    assert all(line.endswith(" <https://example.org/cells/1> .") for line in lines)
+
+    path = tmp_path / "cell.nt"
+    assert write_ntriples(jsonld, path, contexts=TEST_CONTEXTS) == count
+    assert path.read_text(encoding="utf-8").count("\n") == count
+
+    with pytest.raises(ValueError, match="CoinCell"):
+        list(iter_statements(jsonld, contexts={BATTERY_CONTEXT: {}}))
+
+
+def test_contexts_are_committed_with_their_source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The refresh tool writes the copy and its record into the given folder; a copy changed since is rejected."""
+    remote = tmp_path / "remote.jsonld"
+    remote.write_text(json.dumps({"@context": TEST_CONTEXTS[BATTERY_CONTEXT]}), encoding="utf-8")
+    monkeypatch.setattr(rdf_export, "BUNDLED_CONTEXTS", {remote.as_uri(): "battery_context.json"})
+    target = tmp_path / "contexts"
+
+    assert download_contexts(target) == [target / "battery_context.json"]
+    assert download_contexts(target) == []
+    sources = json.loads((target / "sources.json").read_text(encoding="utf-8"))
+    assert sources["battery_context.json"]["url"] == remote.as_uri()
+    monkeypatch.setattr(rdf_export, "CONTEXT_DIR", target)
+    assert rdf_export.load_bundled_context(remote.as_uri()) == TEST_CONTEXTS[BATTERY_CONTEXT]
+
+    (target / "battery_context.json").write_text(json.dumps({"@context": {}}), encoding="utf-8")
+    with pytest.raises(ValueError, match="does not match its record"):
+        rdf_export.load_bundled_context(remote.as_uri())
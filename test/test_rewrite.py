@@ -0,0 +1,82 @@
+"""Test module for the declarative path rewrites of converted documents."""
+import copy
+
+import pytest
+
+from battinfoconverter_backend.json_template import (
+    RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE,
+    RATED_CAPACITY_POSITIVE_ELECTRODE_RULE,
+    SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE,
+)
+from battinfoconverter_backend.rewrite import DEFAULT_RULES, RewriteRules, apply_rewrite_rules, compile_path
+
+
+def _plain_structure(rule: dict, values: list[float]) -> dict:
+    """A document with the structure the template builds, holding ``values`` at the source paths of ``rule``."""
+    hasOutput: dict = {}
+    for source, value in zip(rule["moves"], values):
+        steps = compile_path(source)
+        target = hasOutput
+        for step, next_step in zip(steps, steps[1:]):
+            if isinstance(step, int):
+                while len(target) <= step:
+                    target.append({} if isinstance(next_step, str) else [])
+                target = target[step]
+            else:
+                target = target.setdefault(step, {} if isinstance(next_step, str) else [])
+        target[steps[-1]] = value
+    return {"hasMeasuredProperty": [{"@reverse": {"hasOutput": hasOutput}}]}
+
+
+def test_rules_apply_per_electrode_only_when_complete() -> None:
+    """A complete electrode gets the recommended structure; one missing a value keeps its plain structure."""
+    positive = _plain_structure(RATED_CAPACITY_POSITIVE_ELECTRODE_RULE, [1, 2, 3, 4, 5, 6])
+    negative = _plain_structure(RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE, [1, 2, 3, 4, 5])
+    document = {"@type": "CoinCell", "hasPositiveElectrode": positive, "hasNegativeElectrode": negative}
+    untouched_negative = copy.deepcopy(negative)
+
+    assert apply_rewrite_rules(document) is document
+
+    rewritten = document["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]
+    task = rewritten["hasMeasurementParameter"]["hasTask"]
+    steps = [task, task["hasNext"], task["hasNext"]["hasNext"]]
+    values = [item["hasNumericalPart"]["hasNumberValue"] for step in steps for item in step["hasInput"]]
+    assert values == [1, 2, 3, 4, 5, 6]
+    assert rewritten["hasTestObject"] == SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE["hasTestObject"]
+    assert rewritten is not SNIPPTED_RATED_CAPACITY_POSITIVE_ELECTRODE
+    assert document["hasNegativeElectrode"] == untouched_negative
+
+    # as in the original formatting, the negative electrode is only rewritten together with the positive one
+    document = {
+        "hasPositiveElectrode": _plain_structure(RATED_CAPACITY_POSITIVE_ELECTRODE_RULE, [1, 2, 3, 4, 5]),
+        "hasNegativeElectrode": _plain_structure(RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE, [1, 2, 3, 4, 5, 6]),
+    }
+    untouched = copy.deepcopy(document)
+    assert DEFAULT_RULES.apply(document) == []
+    assert document == untouched
+    # unless the positive one applies to the full document of a partial one
+    negative_only = {"hasNegativeElectrode": untouched["hasNegativeElectrode"]}
+    assert DEFAULT_RULES.apply(negative_only, [RATED_CAPACITY_POSITIVE_ELECTRODE_RULE["name"]]) == [
+        RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE["name"]
+    ]
+
+    # documents without the anchors are left alone
+    assert apply_rewrite_rules({"@type": "CoinCell"}) == {"@type": "CoinCell"}
+
+
+def test_rules_are_checked_when_compiled() -> None:
+    """Paths are split into keys and positions; broken rules fail before any document is seen."""
+    assert compile_path("hasMeasuredProperty[0].@reverse.hasInput[1][2]") == (
+        "hasMeasuredProperty", 0, "@reverse", "hasInput", 1, 2
+    )
+    with pytest.raises(ValueError, match="Malformed"):
+        compile_path("hasInput..hasNumberValue")
+
+    rule = copy.deepcopy(RATED_CAPACITY_POSITIVE_ELECTRODE_RULE)
+    rule["moves"] = {"hasInput.x": "hasMeasurementParameter.hasTask.hasInput[7].hasNumericalPart.hasNumberValue"}
+    with pytest.raises(ValueError, match="not in its template"):
+        RewriteRules([rule])
+    with pytest.raises(ValueError, match="share the anchor"):
+        RewriteRules([RATED_CAPACITY_POSITIVE_ELECTRODE_RULE, RATED_CAPACITY_POSITIVE_ELECTRODE_RULE])
+    with pytest.raises(ValueError, match="not declared before it"):
+        RewriteRules([RATED_CAPACITY_NEGATIVE_ELECTRODE_RULE, RATED_CAPACITY_POSITIVE_ELECTRODE_RULE])
@@ -0,0 +1,54 @@
+"""Test module for the value-only conversion of known templates."""
+import copy
+from pathlib import Path
+
+from battinfoconverter_backend.json_convert import ExcelContainer, create_jsonld_with_conditions
+from battinfoconverter_backend.skeletons import SkeletonCache
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def _variant(data_container: ExcelContainer, values: dict[str, object]) -> ExcelContainer:
+    """A copy of the container with some values replaced, by Metadata label."""
+    schema = data_container.data["schema"]
+    column = schema["Value"].to_numpy(dtype=object, copy=True)
+    for label, value in values.items():
+        column[schema.index[schema["Metadata"] == label][0]] = value
+    variant = copy.copy(data_container)
+    variant.data = {**data_container.data, "schema": schema.assign(Value=column)}
+    return variant
+
+
+def test_value_changes_reuse_the_skeleton() -> None:
+    """Measured values, comments and string literals are filled into one skeleton, giving the full builder's result."""
+    container = ExcelContainer(STANDARD_EXCEL_PATH, engine="native")
+    skeletons = SkeletonCache()
+    assert skeletons.create_jsonld(container) == create_jsonld_with_conditions(container)
+
+    for number in range(3):
+        variant = _variant(container, {
+            "Cell ID": f"Empa-bco-{number:06d}",
+            "Electrolyte solute A molarity": 1 + number / 10,
+            "Project": f"Project {number}",
+            "Positive electrode coating active material chemical composition": f"LiNi0.{number}O2",
+        })
+        assert skeletons.create_jsonld(variant) == create_jsonld_with_conditions(variant)
+    assert (skeletons.hits, skeletons.misses, len(skeletons)) == (3, 1, 1)
+
+
+def test_shape_changes_get_their_own_skeleton() -> None:
+    """A new material or an emptied row builds another skeleton, and the result still matches the full builder."""
+    container = ExcelContainer(STANDARD_EXCEL_PATH, engine="native")
+    skeletons = SkeletonCache(max_entries=2)
+    variants = [
+        container,
+        _variant(container, {"Electrolyte solvent A": "PropyleneCarbonate"}),
+        _variant(container, {"Electrolyte density": None}),
+    ]
+    for variant in variants:
+        assert skeletons.create_jsonld(variant) == create_jsonld_with_conditions(variant)
+    assert (skeletons.hits, skeletons.misses, len(skeletons)) == (0, 3, 2)
+    assert skeletons.create_jsonld(variants[2], build_strategy="trie") == create_jsonld_with_conditions(variants[2])
+    assert skeletons.hits == 1
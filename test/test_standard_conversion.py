@@ -5,7 +5,14 @@ import json
 from decimal import Decimal
 from pathlib import Path
 
-from battinfoconverter_backend.json_convert import convert_excel_to_jsonld
+import pytest
+
+from battinfoconverter_backend import json_convert
+from battinfoconverter_backend.json_convert import (
+    ExcelContainer,
+    convert_excel_columns_to_jsonld,
+    convert_excel_to_jsonld,
+)
 
 FIXTURE_DIR = Path(__file__).resolve().parent
 
@@ -94,5 +101,114 @@ def test_conversion_different_inputs() -> None:
     # Bytes IO object
     res4 = convert_excel_to_jsonld(excel_bytesio, debug_mode=False)
 
+    # Raw bytes and a memoryview over them
+    excel_bytes = STANDARD_EXCEL_PATH.read_bytes()
+    res5 = convert_excel_to_jsonld(excel_bytes, debug_mode=False)
+    res6 = convert_excel_to_jsonld(memoryview(excel_bytes), debug_mode=False)
+
     # Should not affect the results
-    assert res1 == res2 == res3 == res4
+    assert res1 == res2 == res3 == res4 == res5 == res6
+
+    # The BytesIO buffer is released again and can still be written to
+    excel_bytesio.write(b"")
+
+def test_trie_build_strategy_matches_sequential() -> None:
+    """The prefix-trie build must give exactly the same JSON-LD as the row-by-row build."""
+    for excel_path in (STANDARD_EXCEL_PATH, STANDARD_CATALYSIS_EXCEL_PATH):
+        sequential = convert_excel_to_jsonld(excel_path, debug_mode=False)
+        trie = convert_excel_to_jsonld(excel_path, debug_mode=False, build_strategy="trie")
+        assert json.dumps(trie, default=str) == json.dumps(sequential, default=str)
+
+
+@pytest.mark.parametrize("parallel", ["thread", "process"])
+def test_parallel_sheet_parsing_matches_sequential(parallel: str) -> None:
+    """Parsing the sheets in a shared pool from one in-memory copy must not change the sheets."""
+    sequential = ExcelContainer(STANDARD_EXCEL_PATH)
+    with STANDARD_EXCEL_PATH.open("rb") as f:
+        pooled = ExcelContainer(f, parallel=parallel)
+    assert sequential.data.keys() == pooled.data.keys()
+    for key, sheet in sequential.data.items():
+        assert sheet.equals(pooled.data[key]), key
+
+    pool = json_convert._SHEET_POOLS[parallel]
+    ExcelContainer(STANDARD_EXCEL_PATH, parallel=parallel)
+    assert json_convert._SHEET_POOLS[parallel] is pool
+
+    with pytest.raises(ValueError):
+        ExcelContainer(STANDARD_EXCEL_PATH, parallel="gpu")
+
+
+def test_multi_cell_workbook_yields_one_jsonld_per_value_column(tmp_path: Path) -> None:
+    """Every value column is converted against the shared template columns."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(STANDARD_EXCEL_PATH)
+    ws = wb["@Schema"]
+    header = [cell.value for cell in ws[1]]
+    value_col, metadata_col = header.index("Value") + 1, header.index("Metadata") + 1
+    extra_col = ws.max_column + 1
+    for row in range(1, ws.max_row + 1):
+        ws.cell(row=row, column=extra_col, value=ws.cell(row=row, column=value_col).value)
+        if ws.cell(row=row, column=metadata_col).value == "Cell ID":
+            ws.cell(row=row, column=extra_col, value="Empa-bco-000008")
+    multi_path = tmp_path / "multi_cell.xlsx"
+    wb.save(multi_path)
+
+    results = list(convert_excel_columns_to_jsonld(multi_path, debug_mode=False))
+    assert [column for column, _ in results] == ["Value", "Value.1"]
+    (_, first), (_, second) = results
+    # openpyxl drops cached formula results on save, so compare with the saved workbook itself
+    assert first == convert_excel_to_jsonld(multi_path, debug_mode=False)
+    assert second["schema:productID"] == "Empa-bco-000008"
+    assert {**second, "schema:productID": first["schema:productID"]} == first
+
+    # the documents must not share nested objects
+    assert "hasMeasurementParameter" in first["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]
+    first["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["@type"] = "Changed"
+    assert second["hasPositiveElectrode"]["hasMeasuredProperty"][0]["@reverse"]["hasOutput"]["@type"] != "Changed"
+
+    with pytest.raises(ValueError):
+        list(convert_excel_columns_to_jsonld(multi_path, value_columns=["Value.7"], debug_mode=False))
+
+
+@pytest.mark.parametrize("build_strategy", ["sequential", "trie"])
+def test_partial_conversion_matches_the_full_branches(build_strategy: str) -> None:
+    """Only the selected branches are built, each equal to its part of the full document."""
+    full = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+    partial = convert_excel_to_jsonld(
+        STANDARD_EXCEL_PATH, debug_mode=False, build_strategy=build_strategy,
+        ontology_prefixes=["hasElectrolyte", "hasPositiveElectrode"],
+    )
+
+    header = {key for key in full if not key.startswith("has")}
+    assert set(partial) == header | {"hasElectrolyte", "hasPositiveElectrode"}
+    assert partial["hasElectrolyte"] == full["hasElectrolyte"]
+    # the rated capacity rewrite applies to the branch as in the full document
+    assert partial["hasPositiveElectrode"] == full["hasPositiveElectrode"]
+    assert {key: partial[key] for key in header - {"rdfs:comment"}} == {key: full[key] for key in header - {"rdfs:comment"}}
+    assert partial["rdfs:comment"] == full["rdfs:comment"][:2]
+
+    # prefixes are matched segment by segment
+    coating = convert_excel_to_jsonld(
+        STANDARD_EXCEL_PATH, debug_mode=False, ontology_prefixes=["hasNegativeElectrode-hasCoating"]
+    )
+    assert set(coating["hasNegativeElectrode"]) - {"@type"} == {"hasCoating"}
+    assert coating["hasNegativeElectrode"]["hasCoating"] == full["hasNegativeElectrode"]["hasCoating"]
+    assert set(convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, ontology_prefixes=["hasElectro"])) == header
+
+    # the negative electrode is rewritten as in the full document, which depends on the positive one
+    for prefixes in (["hasNegativeElectrode"], ["hasPositiveElectrode-hasCoating", "hasNegativeElectrode"]):
+        negative = convert_excel_to_jsonld(
+            STANDARD_EXCEL_PATH, debug_mode=False, build_strategy=build_strategy, ontology_prefixes=prefixes
+        )
+        assert negative["hasNegativeElectrode"] == full["hasNegativeElectrode"]
+
+    # a multi connector selects all of its suffixed rows (hasComponentB, hasComponentC, ...)
+    catalysis = convert_excel_to_jsonld(STANDARD_CATALYSIS_EXCEL_PATH, debug_mode=False)
+    components = convert_excel_to_jsonld(
+        STANDARD_CATALYSIS_EXCEL_PATH, debug_mode=False, ontology_prefixes=["hasComponent"]
+    )
+    assert components["hasComponent"] == catalysis["hasComponent"]
+
+    with pytest.raises(ValueError):
+        convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False, ontology_prefixes=["hasCase-"])
@@ -0,0 +1,50 @@
+"""Test module for the bulk conversion of tables of cells."""
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from battinfoconverter_backend.json_convert import ExcelContainer, convert_excel_to_jsonld
+from battinfoconverter_backend.table_convert import convert_table_to_jsonld, metadata_keys
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def _table_from_template(n_cells: int) -> pd.DataFrame:
+    """One row per cell, filled with the template's own values and a distinct cell ID."""
+    schema = ExcelContainer(STANDARD_EXCEL_PATH).data["schema"]
+    row = {key: value for key, value in zip(metadata_keys(schema), schema["Value"]) if isinstance(key, str) and pd.notna(value)}
+    table = pd.DataFrame([row] * n_cells)
+    table["Cell ID"] = [f"Empa-bco-{i:06d}" for i in range(n_cells)]
+    return table
+
+
+def test_table_rows_match_the_workbook_conversion(tmp_path: Path) -> None:
+    """Each table row gives the JSON-LD of the workbook filled with the same values, also via CSV."""
+    expected = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+    table = _table_from_template(3)
+    csv_path = tmp_path / "cells.csv"
+    table.to_csv(csv_path, index=False)
+
+    for source in (table, csv_path):
+        results = list(convert_table_to_jsonld(STANDARD_EXCEL_PATH, source, debug_mode=False))
+        assert [index for index, _ in results] == [0, 1, 2]
+        for i, (_, jsonld) in enumerate(results):
+            assert jsonld["schema:productID"] == f"Empa-bco-{i:06d}"
+            jsonld["schema:productID"] = expected["schema:productID"]
+            assert json.dumps(jsonld, default=str) == json.dumps(expected, default=str)
+
+
+def test_table_problems_are_reported_together() -> None:
+    """Missing required fields of all cells are listed before any document is built."""
+    table = _table_from_template(3)
+    table.loc[1, "Cell ID"] = None
+    table.loc[2, "Cell type"] = ""
+    with pytest.raises(ValueError, match=r"'Cell type' for cells \[2\].*'Cell ID' for cells \[1\]"):
+        next(convert_table_to_jsonld(STANDARD_EXCEL_PATH, table, debug_mode=False))
+
+    with pytest.raises(ValueError, match="Not a label"):
+        next(convert_table_to_jsonld(STANDARD_EXCEL_PATH, table.assign(**{"Not a label": 1}), debug_mode=False))
@@ -0,0 +1,64 @@
+"""Test module for compiling templates into straight-line builders."""
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from battinfoconverter_backend.json_convert import (
+    ExcelContainer,
+    convert_excel_to_jsonld,
+    create_jsonld_with_conditions,
+)
+from battinfoconverter_backend.template_compiler import (
+    CompiledTemplate,
+    compile_template,
+    load_compiled_template,
+    write_compiled_template,
+)
+from test_standard_conversion import _normalize_jsonld
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+STANDARD_JSON_PATH = FIXTURE_DIR / "BattINFO_converter_BattINFO_converter_standard_JSON_version_1.1.15.json"
+
+STANDARD_CATALYSIS_EXCEL_PATH = FIXTURE_DIR / "standard_catalysis_excel_schema.xlsx"
+STANDARD_CATALYSIS_JSON_PATH = FIXTURE_DIR / "standard_catalysis_json_schema.json"
+
+
+@pytest.mark.parametrize(
+    ("excel_path", "json_path"),
+    [(STANDARD_EXCEL_PATH, STANDARD_JSON_PATH), (STANDARD_CATALYSIS_EXCEL_PATH, STANDARD_CATALYSIS_JSON_PATH)],
+)
+def test_compiled_template_matches_reference_jsonld(tmp_path: Path, excel_path: Path, json_path: Path) -> None:
+    """The generated module builds the reference document, and the same one as the full builder."""
+    compiled = load_compiled_template(write_compiled_template(excel_path, tmp_path / "compiled.py"))
+
+    converted = convert_excel_to_jsonld(excel_path, debug_mode=False, skeletons=compiled)
+
+    assert (compiled.hits, compiled.misses) == (1, 0)
+    assert converted == convert_excel_to_jsonld(excel_path, debug_mode=False)
+    with json_path.open(encoding="utf-8") as json_file:
+        assert _normalize_jsonld(converted) == _normalize_jsonld(json.load(json_file))
+
+
+def test_other_cells_use_the_full_builder(tmp_path: Path) -> None:
+    """New values are built by the module; a cell of another shape, or a stale module, is not."""
+    source = compile_template(STANDARD_EXCEL_PATH)
+    assert "values[" in source and "json_convert" not in source
+    compiled = load_compiled_template(write_compiled_template(STANDARD_EXCEL_PATH, tmp_path / "compiled.py"))
+
+    container = ExcelContainer(STANDARD_EXCEL_PATH)
+    schema = container.data["schema"]
+    for label, value in (("Positive electrode current collector thickness", 21), ("Separator material", "Glass")):
+        column = schema["Value"].to_numpy(dtype=object, copy=True)
+        column[schema.index[schema["Metadata"] == label][0]] = value
+        variant = copy.copy(container)
+        variant.data = {**container.data, "schema": schema.assign(Value=column)}
+        assert compiled.create_jsonld(variant) == create_jsonld_with_conditions(variant)
+    assert (compiled.hits, compiled.misses) == (1, 1)
+
+    compiled.module.APP_VERSION = "0.0.0"
+    with pytest.raises(ValueError, match="rebuild it"):
+        CompiledTemplate(compiled.module)
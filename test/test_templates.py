@@ -0,0 +1,52 @@
+"""Test module for identifying templates without a full load."""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from battinfoconverter_backend.json_convert import ExcelContainer, get_information_value
+from battinfoconverter_backend.templates import peek_template
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+REFERENCE_DIR = FIXTURE_DIR.parent / "Excel for reference"
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+CATALYSIS_EXCEL_PATH = FIXTURE_DIR / "standard_catalysis_excel_schema.xlsx"
+
+
+def test_peek_template_standard_workbooks() -> None:
+    """The peek identifies the battery and the catalysis template."""
+    battery = peek_template(STANDARD_EXCEL_PATH)
+    assert (battery.sheet_convention, battery.schema_name, battery.schema_version, battery.domain) == (
+        "current", "CoinCellSchema", "1.1.15", "battery"
+    )
+    catalysis = peek_template(CATALYSIS_EXCEL_PATH.read_bytes())
+    assert (catalysis.schema_name, catalysis.schema_version, catalysis.domain) == (
+        "ElectrolysisCellSchema", "0.1", "catalysis"
+    )
+    assert battery.fingerprint != catalysis.fingerprint
+
+
+def test_peek_template_matches_full_load() -> None:
+    """The version agrees with the full load, and empty and filled copies of a template share the fingerprint."""
+    for workbook_path in sorted(REFERENCE_DIR.glob("*.xlsx")):
+        try:
+            info = peek_template(workbook_path)
+        except KeyError:
+            continue  # templates from before the schema sheet, which the converter does not read either
+        schema = ExcelContainer(workbook_path, engine="native").data["schema"]
+        version = get_information_value(schema, "Schema version")
+        if version is None or pd.isna(version):
+            version = get_information_value(schema, "BattINFO CoinCellSchema version")
+        assert info.schema_version == str(version), workbook_path.name
+        assert info.domain == "battery"
+
+    for version in ("1.1.9", "1.1.14", "1.1.15"):
+        empty, filled = (
+            peek_template(REFERENCE_DIR / f"BattINFO_converter_standard_Excel_version_{version}_{state}.xlsx")
+            for state in ("empty", "filled")
+        )
+        assert empty == filled
+
+    with pytest.raises(KeyError):
+        peek_template(REFERENCE_DIR / "CoinCellBattery_Schemas_version_010.xlsx")
@@ -0,0 +1,60 @@
+"""Test module for the validation pre-pass."""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from battinfoconverter_backend.json_convert import ExcelContainer, create_jsonld_with_conditions
+from battinfoconverter_backend.validation import validate_workbook
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+CATALYSIS_EXCEL_PATH = FIXTURE_DIR / "standard_catalysis_excel_schema.xlsx"
+
+
+@pytest.mark.parametrize("excel_path", [STANDARD_EXCEL_PATH, CATALYSIS_EXCEL_PATH])
+def test_reference_workbooks_have_no_issues(excel_path: Path) -> None:
+    """The reference workbooks convert without losing anything, so validation reports nothing for them."""
+    assert validate_workbook(excel_path) == []
+    assert validate_workbook(ExcelContainer(excel_path)) == []
+
+
+def test_validation_collects_every_issue() -> None:
+    """All problems are reported at once, with the Excel row they are in."""
+    data_container = ExcelContainer(STANDARD_EXCEL_PATH, engine="native")
+    schema = data_container.data["schema"]
+    row_of = {label: index for index, label in reversed(list(enumerate(schema["Metadata"])))}
+    schema.loc[row_of["Cell ID"], "Value"] = np.nan
+    schema.loc[row_of["Institution/company"], "Value"] = "Unknown Lab"
+    schema.loc[row_of["Electrolyte density"], "Unit"] = np.nan
+    schema.loc[row_of["Electrolyte solute A molarity"], "Unit"] = "furlong"
+    schema.loc[row_of["Electrolyte solute A"], "Ontology link"] = "hasElectrolyte-fwd|hasSolute"
+
+    issues = validate_workbook(data_container)
+    found = {(issue.kind, issue.row) for issue in issues}
+    assert found == {
+        ("missing_field", row_of["Cell ID"] + 2),
+        ("missing_unique_id", row_of["Institution/company"] + 2),
+        ("missing_unit", row_of["Electrolyte density"] + 2),
+        ("unknown_unit", row_of["Electrolyte solute A molarity"] + 2),
+        ("unknown_command", row_of["Electrolyte solute A"] + 2),
+    }
+    assert str(issues[0]).startswith(f"Row {row_of['Cell ID'] + 2} (Cell ID): ")
+
+    # the conversion itself only reports the first of them
+    with pytest.raises(ValueError, match="Cell ID"):
+        create_jsonld_with_conditions(data_container)
+
+
+def test_value_in_a_section_header_row_is_an_error() -> None:
+    """A value typed into a row without an ontology link is reported, and the conversion names that row."""
+    data_container = ExcelContainer(STANDARD_EXCEL_PATH, engine="native")
+    schema = data_container.data["schema"]
+    row = schema.index[schema["Metadata"] == "Electrolyte"][0]
+    schema.loc[row, "Value"] = "LP30"
+
+    issues = validate_workbook(data_container)
+    assert [(issue.kind, issue.severity, issue.row) for issue in issues] == [("missing_ontology_link", "error", row + 2)]
+    with pytest.raises(ValueError, match=f"Row {row + 2} \\(Electrolyte\\): .* no ontology link"):
+        create_jsonld_with_conditions(data_container)
@@ -0,0 +1,81 @@
+"""Test module for the watch-folder mode."""
+import os
+import shutil
+from pathlib import Path
+
+import simplejson as json
+
+from battinfoconverter_backend.cache import ConversionCache
+from battinfoconverter_backend import watch
+from battinfoconverter_backend.json_convert import convert_excel_to_jsonld
+from battinfoconverter_backend.watch import FolderWatcher, main
+
+FIXTURE_DIR = Path(__file__).resolve().parent
+
+STANDARD_EXCEL_PATH = FIXTURE_DIR / "BattINFO_converter_standard_Excel_version_1.1.15.xlsx"
+
+
+def test_watcher_converts_only_new_and_changed_workbooks(tmp_path: Path) -> None:
+    """Workbooks are converted once; touched, restarted and copied ones are not converted again."""
+    inbox, output = tmp_path / "inbox", tmp_path / "jsonld"
+    (inbox / "lab").mkdir(parents=True)
+    shutil.copy(STANDARD_EXCEL_PATH, inbox / "lab" / "cell.xlsx")
+    (inbox / "broken.xlsx").write_bytes(b"not a workbook")
+    (inbox / "~$cell.xlsx").write_bytes(b"Excel lock file")
+    expected = convert_excel_to_jsonld(STANDARD_EXCEL_PATH, debug_mode=False)
+
+    with ConversionCache(tmp_path / "cache.sqlite") as cache:
+        watcher = FolderWatcher(inbox, output_dir=output, pool="thread", debounce=0, cache=cache)
+        statuses = watcher.run_once()
+        assert statuses["lab/cell.xlsx"] == "converted"
+        assert statuses["broken.xlsx"].startswith("failed: ")
+        assert len(statuses) == 2
+        with (output / "lab" / "cell.json").open(encoding="utf-8") as result:
+            assert json.load(result) == expected
+
+        assert watcher.run_once() == {}
+        os.utime(inbox / "lab" / "cell.xlsx")
+        assert watcher.run_once() == {"lab/cell.xlsx": "unchanged"}
+
+        # a restart reads the index instead of converting everything again
+        restarted = FolderWatcher(inbox, output_dir=output, pool="thread", debounce=0, cache=cache)
+        assert restarted.run_once() == {}
+
+        shutil.copy(STANDARD_EXCEL_PATH, inbox / "copy.xlsx")
+        assert restarted.run_once() == {"copy.xlsx": "cached"}
+        assert (output / "copy.json").exists()
+
+        (inbox / "broken.xlsx").unlink()
+        restarted.run_once()
+        assert sorted(restarted.index) == ["copy.xlsx", "lab/cell.xlsx"]
+
+
+def test_watcher_debounce_and_command_line(tmp_path: Path) -> None:
+    """Files are left alone until they settle; the command line converts next to the workbooks."""
+    shutil.copy(STANDARD_EXCEL_PATH, tmp_path / "cell.xlsx")
+    watcher = FolderWatcher(tmp_path, pool="thread", debounce=3600)
+    assert watcher.scan() == []
+    assert watcher.run_once() == {}
+    assert not (tmp_path / "cell.json").exists()
+
+    main([str(tmp_path), "--once", "--workers", "1", "--encoding", "json-gzip"])
+    assert (tmp_path / "cell.json.gz").exists()
+
+
+def test_watcher_bounds_jobs_and_saves_the_index_per_job(tmp_path: Path, monkeypatch) -> None:
+    """Jobs are submitted a few at a time and each finished one is in the index before the next is submitted."""
+    for number in range(5):
+        shutil.copy(STANDARD_EXCEL_PATH, tmp_path / f"cell_{number}.xlsx")
+    watcher = FolderWatcher(tmp_path, pool="thread", workers=1, debounce=0)
+    indexed_at_start = []
+    convert_file_in_task = watch._convert_file
+
+    def convert_file(path: str, excel_engine: str) -> tuple[str, dict]:
+        saved = json.loads(watcher.index_path.read_text())["files"] if watcher.index_path.exists() else {}
+        indexed_at_start.append(len(saved))
+        return convert_file_in_task(path, excel_engine)
+
+    monkeypatch.setattr(watch, "_convert_file", convert_file)
+
+    assert set(watcher.run_once().values()) == {"converted"}
+    assert all(indexed >= number - watch.JOBS_PER_WORKER + 1 for number, indexed in enumerate(indexed_at_start))